@@ -0,0 +1,214 @@
+# ---
+# Headless batch export of many .blend files.
+#
+# Runs the same pipeline as the "Export" button of the HGE Tools panel (mark objects, prepare materials,
+# export .FBX, run the AssetsProcessor) for every given .blend file, without any UI context:
+#
+#   blender -b -P BlenderBatchExport.py -- [--meshes-only | --anims-only] [--incremental] [--summary result.json]
+#                                          [--split off|entity|lod] [--processor-workers N] [--dedup-materials]
+#                                          [--atlas [--atlas-max-map-size N]] [--no-texture-check]
+#                                          [--convert-textures] [--anim-takes]
+#                                          [--reduce-anims [--anim-tolerances LOC ROT SCALE]] [--check-root-motion]
+#                                          <file.blend | glob> ...
+#
+# With --incremental only the entities changed since the last export are exported and files without changes are
+# skipped. A per-file result summary is printed at the end and optionally written as JSON. Blender exits with code 1 if any
+# of the files failed to export.
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+import time
+import traceback
+import bpy
+
+# settings used when the HG Blender Exporter addon is not enabled in this Blender instance
+DEFAULT_SETTINGS = {
+    "version": (2, 10),
+    "game": "Zulu",
+    "appid": "Jagged Alliance 3",
+    "mtl_prop_0_visible": "True",
+    "mtl_prop_0_name": "Unit",
+    "enable_colliders": "True",
+}
+
+
+#---
+#--- Returns the BlenderExport module, importing and registering it from this file's directory when the addon didn't.
+#---
+def load_exporter(appid=None, game=None):
+    if hasattr(bpy.types.Object, "hge_obj_settings") and "BlenderExport" in sys.modules:
+        BlenderExport = sys.modules["BlenderExport"]
+    else:
+        sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+        import BlenderExport
+        for k, v in DEFAULT_SETTINGS.items():
+            BlenderExport.SETTINGS[k] = v
+        BlenderExport.register()
+    if appid:
+        BlenderExport.SETTINGS["appid"] = appid
+    if game:
+        BlenderExport.SETTINGS["game"] = game
+    return BlenderExport
+
+
+#---
+#--- Expands the command line file arguments (files or glob patterns) into a sorted list of unique .blend paths.
+#---
+def expand_blend_files(patterns):
+    filepaths = []
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        for filepath in sorted(matches):
+            filepath = os.path.normpath(os.path.abspath(filepath))
+            if filepath not in filepaths:
+                filepaths.append(filepath)
+    return filepaths
+
+
+#---
+#--- Opens a .blend file and runs the export pipeline on it.
+#---
+#--- @return table The result of the export: file, status ("ok", "skipped" or "failed"), fbx (list of exported files),
+#--- error and duration in seconds.
+#---
+def export_blend_file(BlenderExport, filepath, export_meshes=True, export_anims=True, incremental=False,
+        split_mode="OFF", processor_workers=None, dedup_materials=False, atlas_maps=False, atlas_max_map_size=512,
+        check_textures=True, convert_textures=False, anim_takes=False, reduce_anims=False,
+        anim_tolerances=(0.001, math.radians(0.1), 0.001), check_root_motion=False):
+    result = {
+        "file": filepath,
+        "status": "failed",
+        "fbx": None,
+        "error": None,
+        "duration": 0.0,
+    }
+    start_time = time.time()
+    print(f"[HG] Batch export of '{filepath}'")
+    try:
+        if not os.path.isfile(filepath):
+            raise BlenderExport.ExportError("File not found")
+        bpy.ops.wm.open_mainfile(filepath=filepath)
+        context = bpy.context
+        if context.object and context.object.mode != "OBJECT":
+            bpy.ops.object.mode_set(mode="OBJECT")
+        pipeline = BlenderExport.ExportPipeline(
+            export_meshes=export_meshes,
+            export_anims=export_anims,
+            incremental=incremental,
+            split_mode=split_mode,
+            processor_workers=processor_workers,
+            dedup_materials=dedup_materials,
+            atlas_maps=atlas_maps,
+            atlas_max_map_size=atlas_max_map_size,
+            check_textures=check_textures,
+            convert_textures=convert_textures,
+            anim_takes=anim_takes,
+            reduce_anims=reduce_anims,
+            anim_tolerances=anim_tolerances,
+            check_root_motion=check_root_motion)
+        dirty_parts = pipeline.mark_scene_defaults(context)
+        if incremental and not dirty_parts:
+            print(f"[HG] Nothing changed since the last export of '{filepath}'")
+            result["status"] = "skipped"
+        else:
+            result["fbx"] = pipeline.run(context)
+            if pipeline.texture_report:
+                print(f"[HG] {pipeline.texture_report}")
+            if pipeline.anim_report:
+                print(f"[HG] {pipeline.anim_report}")
+            if pipeline.dedup_report:
+                print(f"[HG] {pipeline.dedup_report}")
+            if pipeline.atlas_report:
+                print(f"[HG] {pipeline.atlas_report}")
+            result["status"] = "ok"
+    except BlenderExport.ExportError as e:
+        result["error"] = str(e)
+    except Exception as e:
+        traceback.print_exc()
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["duration"] = round(time.time() - start_time, 3)
+    return result
+
+
+def print_summary(results):
+    print("[HG] Batch export summary:")
+    for result in results:
+        if result["status"] == "ok":
+            print(f"[HG]   OK      {result['file']} -> {', '.join(result['fbx'])} ({result['duration']}s)")
+        elif result["status"] == "skipped":
+            print(f"[HG]   SKIPPED {result['file']} ({result['duration']}s)")
+        else:
+            print(f"[HG]   FAILED  {result['file']}: {result['error']} ({result['duration']}s)")
+    skipped = sum(1 for result in results if result["status"] == "skipped")
+    failed = sum(1 for result in results if result["status"] == "failed")
+    print(f"[HG] {len(results) - failed - skipped} exported, {skipped} skipped, {failed} failed")
+
+
+def parse_args(argv):
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(
+        prog="blender -b -P BlenderBatchExport.py --",
+        description="Exports .blend files through the HGE export pipeline without UI")
+    parser.add_argument("files", nargs="+", help=".blend files or glob patterns (e.g. 'Entities/**/*.blend')")
+    kind = parser.add_mutually_exclusive_group()
+    kind.add_argument("--meshes-only", action="store_true", help="don't export animations")
+    kind.add_argument("--anims-only", action="store_true", help="don't export meshes")
+    parser.add_argument("--incremental", action="store_true", help="export only entities changed since the last export")
+    parser.add_argument("--split", choices=["off", "entity", "lod"], default="off", help="export one .FBX per entity or LOD")
+    parser.add_argument("--processor-workers", type=int, help="parallel AssetsProcessor instances for split exports")
+    parser.add_argument("--dedup-materials", action="store_true", help="merge materials with identical settings and maps")
+    parser.add_argument("--atlas", action="store_true", help="pack small maps of compatible materials into texture atlases")
+    parser.add_argument("--atlas-max-map-size", type=int, default=512, help="largest map packed into an atlas")
+    parser.add_argument("--no-texture-check", action="store_true", help="don't check the maps before the export")
+    parser.add_argument("--convert-textures", action="store_true", help="export unsuitable maps as 8-bit PNG copies")
+    parser.add_argument("--anim-takes", action="store_true", help="bake each animation into its own take")
+    parser.add_argument("--reduce-anims", action="store_true", help="remove animation keys within the tolerances")
+    parser.add_argument("--anim-tolerances", type=float, nargs=3, default=(0.001, 0.1, 0.001),
+        metavar=("LOC", "ROT", "SCALE"), help="largest location, rotation (degrees) and scale errors of reduced animations")
+    parser.add_argument("--check-root-motion", action="store_true", help="analyze the root motion of the animations")
+    parser.add_argument("--summary", help="write the per-file results to this JSON file")
+    parser.add_argument("--appid", help="overrides the application id used for the output directories")
+    parser.add_argument("--game", help="overrides the game name")
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_args(argv)
+    BlenderExport = load_exporter(args.appid, args.game)
+    filepaths = expand_blend_files(args.files)
+    if not filepaths:
+        print("[HG] No .blend files to export")
+        return 1
+
+    results = []
+    for filepath in filepaths:
+        results.append(export_blend_file(
+            BlenderExport,
+            filepath,
+            export_meshes=not args.anims_only,
+            export_anims=not args.meshes_only,
+            incremental=args.incremental,
+            split_mode=args.split.upper(),
+            processor_workers=args.processor_workers,
+            dedup_materials=args.dedup_materials,
+            atlas_maps=args.atlas,
+            atlas_max_map_size=args.atlas_max_map_size,
+            check_textures=not args.no_texture_check,
+            convert_textures=args.convert_textures,
+            anim_takes=args.anim_takes,
+            reduce_anims=args.reduce_anims,
+            anim_tolerances=(args.anim_tolerances[0], math.radians(args.anim_tolerances[1]), args.anim_tolerances[2]),
+            check_root_motion=args.check_root_motion))
+
+    print_summary(results)
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0 if all(result["status"] != "failed" for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,260 @@
+# ---
+# Parallel batch export of many .blend files.
+#
+# Fans the .blend files out to several background Blender processes, each running BlenderBatchExport.py on one file:
+#
+#   python BlenderBatchScheduler.py --blender <path to blender> [--workers N] [--timeout SECONDS] [--retries N]
+#                                   [--log-dir DIR] [--summary result.json] [--meshes-only | --anims-only]
+#                                   [--incremental] [--split off|entity|lod] [--processor-workers N]
+#                                   [--dedup-materials] [--atlas [--atlas-max-map-size N]]
+#                                   [--no-texture-check] [--convert-textures] [--anim-takes]
+#                                   [--reduce-anims [--anim-tolerances LOC ROT SCALE]] [--check-root-motion]
+#                                   <file.blend | glob> ...
+#
+# Jobs that crash or time out are retried; jobs that fail because of export errors are not. The output of every
+# attempt is kept in the log directory and concatenated into a single batch log. This script doesn't need Blender's
+# Python - any Python 3 interpreter will do.
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BATCH_EXPORT_SCRIPT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "BlenderBatchExport.py")
+
+# exit code of BlenderBatchExport.py when the export itself failed (retrying won't help)
+EXPORT_FAILED_CODE = 1
+
+
+#---
+#--- Expands the command line file arguments (files or glob patterns) into a sorted list of unique .blend paths.
+#---
+def expand_blend_files(patterns):
+    filepaths = []
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        for filepath in sorted(matches):
+            filepath = os.path.normpath(os.path.abspath(filepath))
+            if filepath not in filepaths:
+                filepaths.append(filepath)
+    return filepaths
+
+
+#---
+#--- A single .blend file exported by a background Blender process.
+#---
+#--- @class ExportJob
+#--- @field filepath string The .blend file.
+#--- @field attempts number How many times the worker process was started.
+#--- @field result table The result reported by BlenderBatchExport.py, or one describing the crash/timeout.
+#--- @field log_files table The log file of every attempt.
+#---
+class ExportJob:
+    def __init__(self, idx, filepath):
+        self.idx = idx
+        self.filepath = filepath
+        self.attempts = 0
+        self.result = None
+        self.log_files = []
+
+    def get_name(self):
+        return f"{self.idx:04}_{os.path.splitext(os.path.basename(self.filepath))[0]}"
+
+
+#---
+#--- Runs export jobs in a bounded number of background Blender processes.
+#---
+#--- @class BatchScheduler
+#--- @param blender string The Blender executable.
+#--- @param workers number How many Blender processes run at the same time.
+#--- @param timeout number Seconds after which a worker is killed (0 - no timeout).
+#--- @param retries number How many times a crashed or timed out job is restarted.
+#--- @param log_dir string Where the logs of the workers are written.
+#--- @param worker_args table Additional arguments passed to BlenderBatchExport.py.
+#---
+class BatchScheduler:
+    def __init__(self, blender, workers, timeout, retries, log_dir, worker_args=()):
+        self.blender = blender
+        self.workers = max(1, workers)
+        self.timeout = timeout or None
+        self.retries = max(0, retries)
+        self.log_dir = log_dir
+        self.worker_args = list(worker_args)
+        self.print_lock = threading.Lock()
+
+    def log(self, text):
+        with self.print_lock:
+            print(f"[HG] {text}", flush=True)
+
+    def run(self, filepaths):
+        os.makedirs(self.log_dir, exist_ok=True)
+        jobs = [ExportJob(idx + 1, filepath) for idx, filepath in enumerate(filepaths)]
+        self.log(f"Exporting {len(jobs)} files with {self.workers} workers")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for _ in executor.map(self.run_job, jobs):
+                pass
+        return jobs
+
+    def run_job(self, job):
+        while job.attempts <= self.retries:
+            job.attempts += 1
+            job.result = self.run_attempt(job)
+            if job.result["status"] != "failed":
+                self.log(f"{job.result['status'].upper():6} {job.filepath} ({job.result['duration']}s)")
+                return job
+            if not job.result.get("crashed"):
+                break
+            if job.attempts <= self.retries:
+                self.log(f"RETRY  {job.filepath}: {job.result['error']}")
+        self.log(f"FAILED {job.filepath}: {job.result['error']}")
+        return job
+
+    def run_attempt(self, job):
+        log_file = os.path.join(self.log_dir, f"{job.get_name()}.{job.attempts}.log")
+        job.log_files.append(log_file)
+        fd, summary_file = tempfile.mkstemp(prefix="hge_batch_", suffix=".json")
+        os.close(fd)
+        cmd = [
+            self.blender, "-b", "-P", BATCH_EXPORT_SCRIPT, "--",
+            *self.worker_args, "--summary", summary_file, job.filepath,
+        ]
+        start_time = time.time()
+        result = {
+            "file": job.filepath,
+            "status": "failed",
+            "fbx": None,
+            "error": None,
+            "crashed": False,
+        }
+        try:
+            with open(log_file, "w") as log:
+                log.write(" ".join(f"\"{arg}\"" for arg in cmd) + "\n")
+                log.flush()
+                process = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT, timeout=self.timeout)
+            worker_results = []
+            if os.path.getsize(summary_file):
+                with open(summary_file) as f:
+                    worker_results = json.load(f)
+            if worker_results:
+                result.update(worker_results[0])
+            elif process.returncode == EXPORT_FAILED_CODE:
+                result["error"] = "The export failed (see the log)"
+            else:
+                result["error"] = f"Blender exited with code {process.returncode}"
+                result["crashed"] = True
+        except subprocess.TimeoutExpired:
+            result["error"] = f"Timed out after {self.timeout}s"
+            result["crashed"] = True
+        except OSError as e:
+            result["error"] = str(e)
+        finally:
+            os.remove(summary_file)
+        result["duration"] = round(time.time() - start_time, 3)
+        return result
+
+    def write_batch_log(self, jobs, filepath):
+        with open(filepath, "w") as batch_log:
+            for job in jobs:
+                for log_file in job.log_files:
+                    batch_log.write(f"===== {job.filepath} ({os.path.basename(log_file)})\n")
+                    if os.path.isfile(log_file):
+                        with open(log_file, errors="replace") as log:
+                            batch_log.write(log.read())
+                    batch_log.write("\n")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Exports .blend files in parallel background Blender processes")
+    parser.add_argument("files", nargs="+", help=".blend files or glob patterns (e.g. 'Entities/**/*.blend')")
+    parser.add_argument("--blender", default=os.getenv("BLENDER", "blender"), help="the Blender executable")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of parallel Blender processes")
+    parser.add_argument("--timeout", type=float, default=0, help="seconds before a worker is killed (0 - no limit)")
+    parser.add_argument("--retries", type=int, default=1, help="how many times crashed or timed out jobs are restarted")
+    parser.add_argument("--log-dir", default="BatchExportLogs", help="directory for the worker logs")
+    parser.add_argument("--summary", help="write the per-file results to this JSON file")
+    kind = parser.add_mutually_exclusive_group()
+    kind.add_argument("--meshes-only", action="store_true", help="don't export animations")
+    kind.add_argument("--anims-only", action="store_true", help="don't export meshes")
+    parser.add_argument("--incremental", action="store_true", help="export only entities changed since the last export")
+    parser.add_argument("--split", choices=["off", "entity", "lod"], default="off", help="export one .FBX per entity or LOD")
+    parser.add_argument("--processor-workers", type=int, help="parallel AssetsProcessor instances per worker")
+    parser.add_argument("--dedup-materials", action="store_true", help="merge materials with identical settings and maps")
+    parser.add_argument("--atlas", action="store_true", help="pack small maps of compatible materials into texture atlases")
+    parser.add_argument("--atlas-max-map-size", type=int, help="largest map packed into an atlas")
+    parser.add_argument("--no-texture-check", action="store_true", help="don't check the maps before the export")
+    parser.add_argument("--convert-textures", action="store_true", help="export unsuitable maps as 8-bit PNG copies")
+    parser.add_argument("--anim-takes", action="store_true", help="bake each animation into its own take")
+    parser.add_argument("--reduce-anims", action="store_true", help="remove animation keys within the tolerances")
+    parser.add_argument("--anim-tolerances", type=float, nargs=3, metavar=("LOC", "ROT", "SCALE"),
+        help="largest location, rotation (degrees) and scale errors of reduced animations")
+    parser.add_argument("--check-root-motion", action="store_true", help="analyze the root motion of the animations")
+    parser.add_argument("--appid", help="overrides the application id used for the output directories")
+    parser.add_argument("--game", help="overrides the game name")
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_args(argv)
+    filepaths = expand_blend_files(args.files)
+    if not filepaths:
+        print("[HG] No .blend files to export")
+        return 1
+
+    worker_args = []
+    if args.meshes_only:
+        worker_args.append("--meshes-only")
+    if args.anims_only:
+        worker_args.append("--anims-only")
+    if args.incremental:
+        worker_args.append("--incremental")
+    worker_args += ["--split", args.split]
+    if args.processor_workers:
+        worker_args += ["--processor-workers", str(args.processor_workers)]
+    if args.dedup_materials:
+        worker_args.append("--dedup-materials")
+    if args.atlas:
+        worker_args.append("--atlas")
+    if args.atlas_max_map_size:
+        worker_args += ["--atlas-max-map-size", str(args.atlas_max_map_size)]
+    if args.no_texture_check:
+        worker_args.append("--no-texture-check")
+    if args.convert_textures:
+        worker_args.append("--convert-textures")
+    if args.anim_takes:
+        worker_args.append("--anim-takes")
+    if args.reduce_anims:
+        worker_args.append("--reduce-anims")
+    if args.anim_tolerances:
+        worker_args += ["--anim-tolerances", *map(str, args.anim_tolerances)]
+    if args.check_root_motion:
+        worker_args.append("--check-root-motion")
+    if args.appid:
+        worker_args += ["--appid", args.appid]
+    if args.game:
+        worker_args += ["--game", args.game]
+
+    scheduler = BatchScheduler(args.blender, args.workers, args.timeout, args.retries, args.log_dir, worker_args)
+    start_time = time.time()
+    jobs = scheduler.run(filepaths)
+    scheduler.write_batch_log(jobs, os.path.join(args.log_dir, "batch.log"))
+
+    results = [dict(job.result, attempts=job.attempts) for job in jobs]
+    failed = [result for result in results if result["status"] == "failed"]
+    skipped = [result for result in results if result["status"] == "skipped"]
+    exported = len(results) - len(failed) - len(skipped)
+    print(f"[HG] {exported} exported, {len(skipped)} skipped, {len(failed)} failed in {time.time() - start_time:.1f}s")
+    for result in failed:
+        print(f"[HG]   FAILED {result['file']}: {result['error']}")
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -7,14 +7,28 @@
 # - `threading`: Provides a way to create and manage threads, which can be useful for running tasks concurrently.
 # - `bpy`: The Blender Python API, which provides access to Blender's data, tools, and functionality.
 # - `bpy_extras`: Additional utility functions for the Blender Python API.
+# - `mathutils`: Blender's vector and matrix types.
+# - `numpy`: Bulk array math (bundled with Blender).
 # 
 # These imports are likely used throughout the rest of the Blender Exporter JA3 project to provide functionality for tasks such as file management, data processing, and integration with the Blender application.
+import array
+import collections
+import concurrent.futures
+import hashlib
+import importlib.util
+import json
+import math
 import os
 import re
+import struct
 import subprocess
+import sys
 import threading
+import time
 import bpy
 import bpy_extras
+import mathutils
+import numpy
 
 # settings--------------------------------------------------------------------------------------------------------------------------------------------------------
 #The selected code defines a set of global variables that store various settings for the Blender Exporter JA3 project.
@@ -44,10 +58,7 @@ SETTINGS = {
 #
 #The `parse` method takes a full name string and extracts the relevant information, creating a new `EntityName` instance. The `__str__` method returns a string representation of the entity name in the expected format.
 class EntityName:
-This class represents an entity name in the Blender Exporter JA3 project. It contains information about the entity, such as its name, mesh, level of detail (LOD), LOD distance, state, comment, and inheritance.
-    
-    The `parse` method takes a full name string and extracts the relevant information, creating a new `EntityName` instance. The `__str__` method returns a string representation of the entity name in the expected format.
-        name: str
+    name: str
     mesh: str
     lod: int
     lod_distance: int
@@ -136,6 +147,117 @@ class AnimationName:
         return str(self).replace("hga", "hgx", 1)
 
 
+#---
+#--- An animation marked on an armature, parsed from its custom property: the property name is an AnimationName and
+#--- the value has the format root_motion:frame_start:frame_end:loop_anim:compensate_z.
+#---
+#--- @class ArmatureAnimation
+#--- @field prop string The custom property holding the animation (hga:entity:state:mesh).
+#--- @field name AnimationName The parsed property name.
+#--- @field export_prop string The custom property which marks the animation for export (hgx:entity:state:mesh).
+#--- @field value string The raw property value.
+#--- @field root_motion string The root motion type, None if the value is malformed.
+#--- @field frame_start number The first frame of the animation, None if the value is malformed.
+#--- @field frame_end number The last frame of the animation, None if the value is malformed.
+#--- @field loop_anim boolean Whether the animation loops.
+#--- @field compensate_z boolean Whether the Z movement of the root is compensated.
+#---
+class ArmatureAnimation:
+    def __init__(self, prop, name, value):
+        self.prop = prop
+        self.name = name
+        self.export_prop = name.get_export_name()
+        self.value = value
+        tokens = value.split(":") if isinstance(value, str) else []
+        self.root_motion = tokens[0] if len(tokens) >= 3 else None
+        try:
+            self.frame_start = int(tokens[1])
+            self.frame_end = int(tokens[2])
+        except (IndexError, ValueError):
+            self.root_motion = self.frame_start = self.frame_end = None
+        self.loop_anim = len(tokens) > 3 and tokens[3] == "True"
+        self.compensate_z = len(tokens) <= 4 or tokens[4] == "True"
+
+    def has_range(self):
+        return self.frame_start is not None
+
+    def is_exported(self, armature):
+        return bool(armature.get(self.export_prop))
+
+
+#---
+#--- The animations of each armature, parsed once from its custom properties.
+#---
+#--- The table of an armature is rebuilt when the number of its custom properties changes, when it's updated in the
+#--- depsgraph or when the code writing the properties calls `invalidate`. The export flags (hgx:...) are not cached.
+#--- The frame ranges of the legacy animations stored on bones (hga:entity:state:mesh = root:frame_start:frame_end) are
+#--- indexed per armature data the first time they're needed, so the bones are walked once instead of on every export.
+#---
+#--- @class AnimationTable
+#---
+class AnimationTable:
+    def __init__(self):
+        self.entries = {}
+        self.bone_ranges = {}
+
+    def reset(self):
+        self.entries = {}
+        self.bone_ranges = {}
+
+    def get(self, object):
+        if object.type != "ARMATURE":
+            return ()
+        entry = self.entries.get(object.name)
+        pointer, prop_count = object.as_pointer(), len(object.keys())
+        if entry is None or entry[0] != pointer or entry[1] != prop_count:
+            animations = []
+            for prop, value in object.items():
+                name = AnimationName.parse(prop)
+                if name:
+                    animations.append(ArmatureAnimation(prop, name, value))
+            entry = (pointer, prop_count, tuple(animations))
+            self.entries[object.name] = entry
+        return entry[2]
+
+    def find(self, object, prop):
+        for animation in self.get(object):
+            if animation.prop == prop:
+                return animation
+
+    def get_bone_ranges(self, object):
+        if object.type != "ARMATURE":
+            return ()
+        armature = object.data
+        entry = self.bone_ranges.get(armature.name)
+        if entry is None or entry[0] != armature.as_pointer() or entry[1] != len(armature.bones):
+            ranges = []
+            for bone in armature.bones:
+                for key, value in bone.items():
+                    if not isinstance(value, str) or not AnimationName.parse(key):
+                        continue
+                    tokens = value.split(":")
+                    if len(tokens) == 3:
+                        ranges.append((int(tokens[1]), int(tokens[2])))
+            entry = (armature.as_pointer(), len(armature.bones), tuple(ranges))
+            self.bone_ranges[armature.name] = entry
+        return entry[2]
+
+    def invalidate(self, object):
+        self.entries.pop(object.name, None)
+
+    def on_depsgraph_update(self, depsgraph):
+        if not self.entries and not self.bone_ranges:
+            return
+        for update in depsgraph.updates:
+            if isinstance(update.id, bpy.types.Object):
+                self.entries.pop(update.id.original.name, None)
+            elif isinstance(update.id, bpy.types.Armature):
+                self.bone_ranges.pop(update.id.original.name, None)
+
+
+animation_table = AnimationTable()
+
+
 #---
 #--- Checks if the given object has the specified property.
 #---
@@ -186,13 +308,242 @@ def find_states(entity, context=None, ignore_obj=None, static=True, animated=Tru
             if hge_obj_settings.state:
                 states.add(hge_obj_settings.state)
         elif object.type == "ARMATURE" and animated:
-            for prop in object.keys():
-                anim_name = AnimationName.parse(prop)
-                if not anim_name:
-                    continue
-                states.add(anim_name.state)
+            for animation in animation_table.get(object):
+                states.add(animation.name.state)
     return states
 
+
+#---
+#--- Scene-wide lookup tables used when validating objects.
+#---
+#--- Built in a single pass over the scene so that validating every object costs O(n) instead of
+#--- rescanning the scene for each mesh object. Single objects can be re-indexed with `discard`/`add`.
+#---
+#--- @field mesh_origins table Maps (entity, mesh) to a table of mesh object -> its origin object.
+#--- @field entity_states table Maps entity to a table of state -> set of static mesh objects with that state.
+#--- @field state_animations table Maps state to a set of (armature, animation property) pairs.
+#---
+class SceneValidationIndex:
+    def __init__(self, scene):
+        self.mesh_origins = {}
+        self.entity_states = {}
+        self.state_animations = {}
+        self.records = {}
+        for object in scene.objects:
+            self.add(object)
+
+    def add(self, object):
+        mesh_key, state_key, anim_keys = None, None, []
+        if object.type == "MESH":
+            hge_obj_settings = object.hge_obj_settings
+            mesh_key = (hge_obj_settings.entity, hge_obj_settings.mesh)
+            self.mesh_origins.setdefault(mesh_key, {})[object] = hge_obj_settings.find_origin()
+            if hge_obj_settings.state and hge_obj_settings.resolve_role() == "MESH":
+                state_key = (hge_obj_settings.entity, hge_obj_settings.state)
+                states = self.entity_states.setdefault(hge_obj_settings.entity, {})
+                states.setdefault(hge_obj_settings.state, set()).add(object)
+        elif object.type == "ARMATURE":
+            for animation in animation_table.get(object):
+                anim_keys.append((animation.name.state, animation.prop))
+                self.state_animations.setdefault(animation.name.state, set()).add((object, animation.prop))
+        self.records[object] = (mesh_key, state_key, anim_keys)
+
+    def discard(self, object):
+        record = self.records.pop(object, None)
+        if not record:
+            return
+        mesh_key, state_key, anim_keys = record
+        if mesh_key:
+            self.mesh_origins[mesh_key].pop(object, None)
+        if state_key:
+            entity, state = state_key
+            self.entity_states[entity][state].discard(object)
+            if not self.entity_states[entity][state]:
+                del self.entity_states[entity][state]
+        for state, prop in anim_keys:
+            self.state_animations[state].discard((object, prop))
+            if not self.state_animations[state]:
+                del self.state_animations[state]
+
+    def get_entity_objects(self, entity):
+        objects = set()
+        for (mesh_entity, mesh), origins in self.mesh_origins.items():
+            if mesh_entity == entity:
+                objects.update(origins.keys())
+        return objects
+
+    def has_other_origin(self, entity, mesh, origin):
+        return any(other_origin != origin for other_origin in self.mesh_origins.get((entity, mesh), {}).values())
+
+    def is_state_used_by_others(self, entity, state, ignore_obj=None):
+        return bool(self.entity_states.get(entity, {}).get(state, set()) - {ignore_obj})
+
+    def is_state_animated(self, state):
+        return state in self.state_animations
+
+
+#---
+#--- Returns the data the validation of an object depends on.
+#--- The first two items are the parent and the entity name - ValidationCache relies on their position.
+#---
+#--- @param object bpy.types.Object The object to describe.
+#--- @return tuple The parent, entity, name, type, parent bone, skinning, object settings and animation properties.
+#---
+def get_validation_signature(object):
+    hge_obj_settings = object.hge_obj_settings
+    return (
+        object.parent,
+        hge_obj_settings.entity,
+        object.name,
+        object.type,
+        object.parent_bone,
+        bool(object.vertex_groups),
+        tuple(getattr(hge_obj_settings, prop) for prop in HGEObjectSettings.__annotations__),
+        tuple(prop for prop in object.keys() if prop.startswith("hga:")),
+    )
+
+
+#---
+#--- Caches the role and the validation errors of the objects in a scene between UI redraws.
+#---
+#--- Entries are invalidated from a depsgraph_update_post handler only for the objects whose parent, name, type or
+#--- hge_obj_settings actually changed, together with the objects whose validation depends on them (children,
+#--- sibling surfaces and meshes of the same entity). Adding or removing objects resets the whole cache.
+#---
+class ValidationCache:
+    def __init__(self):
+        self.reset(None)
+
+    def reset(self, scene):
+        self.scene = scene
+        self.scene_ptr = scene.as_pointer() if scene else None
+        self.object_count = len(scene.objects) if scene else 0
+        self.index = None
+        self.signatures = {}
+        self.roles = {}
+        self.errors = {}
+
+    def ensure_scene(self, scene):
+        if self.scene_ptr != scene.as_pointer() or self.object_count != len(scene.objects):
+            self.reset(scene)
+
+    def get_index(self):
+        if self.scene is None:
+            # not bound to a scene through get_validation_cache yet
+            self.reset(bpy.context.scene)
+        if not self.index:
+            self.index = SceneValidationIndex(self.scene)
+            for object in self.scene.objects:
+                self.signatures[object] = get_validation_signature(object)
+        return self.index
+
+    def get_role(self, object):
+        role = self.roles.get(object)
+        if role is None:
+            self.get_index()
+            role = object.hge_obj_settings.resolve_role() or ""
+            self.roles[object] = role
+        return role
+
+    def get_errors(self, object):
+        errors = self.errors.get(object)
+        if errors is None:
+            index = self.get_index()
+            errors = object.hge_obj_settings.get_errors(index)
+            self.errors[object] = errors
+        return errors
+
+    def is_valid(self, object):
+        return not self.get_errors(object)
+
+    def invalidate(self, objects):
+        if not self.index:
+            return
+        changed, dependent = set(), set()
+        entities = set()
+        for object in objects:
+            old_signature = self.signatures.get(object)
+            parents = {object.parent}
+            entities.add(object.hge_obj_settings.entity)
+            if old_signature:
+                parents.add(old_signature[0])
+                entities.add(old_signature[1])
+            if object.type == "ARMATURE":
+                # any skinned mesh may have lost or gained its animation
+                self.errors.clear()
+            # the role of every descendant depends on the role of its parent
+            stack = [object]
+            while stack:
+                child = stack.pop()
+                if child not in changed:
+                    changed.add(child)
+                    stack.extend(child.children)
+            # surfaces are validated against their siblings
+            for parent in parents:
+                if parent:
+                    dependent.update(parent.children)
+        for entity in entities:
+            for object in self.index.get_entity_objects(entity):
+                dependent.add(object)
+                dependent.update(object.children)
+        for object in changed:
+            self.index.discard(object)
+            self.index.add(object)
+            self.signatures[object] = get_validation_signature(object)
+            self.roles.pop(object, None)
+        for object in changed | dependent:
+            self.errors.pop(object, None)
+
+    def on_depsgraph_update(self, scene, depsgraph):
+        if self.scene_ptr != scene.as_pointer() or not self.index:
+            return
+        if self.object_count != len(scene.objects):
+            self.reset(scene)
+            return
+        changed = []
+        for update in depsgraph.updates:
+            if isinstance(update.id, bpy.types.Collection):
+                self.reset(scene)
+                return
+            if not isinstance(update.id, bpy.types.Object):
+                continue
+            object = update.id.original
+            if self.signatures.get(object) != get_validation_signature(object):
+                changed.append(object)
+        if changed:
+            self.invalidate(changed)
+
+
+validation_cache = ValidationCache()
+
+
+#---
+#--- Returns the validation cache, reset if it was filled for another scene or the scene's objects were added/removed.
+#---
+#--- @param scene bpy.types.Scene The scene whose objects will be queried.
+#--- @return ValidationCache The shared validation cache.
+#---
+def get_validation_cache(scene):
+    validation_cache.ensure_scene(scene)
+    return validation_cache
+
+
+@bpy.app.handlers.persistent
+def validation_cache_depsgraph_handler(scene, depsgraph=None):
+    if depsgraph is None:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+    validation_cache.on_depsgraph_update(scene, depsgraph)
+    mesh_stats_cache.on_depsgraph_update(depsgraph)
+    animation_table.on_depsgraph_update(depsgraph)
+
+
+@bpy.app.handlers.persistent
+def validation_cache_reset_handler(*args):
+    validation_cache.reset(None)
+    mesh_stats_cache.reset()
+    animation_table.reset()
+    root_motion_reports.clear()
+
 #---
 #--- A list of property names that represent surface collider flags.
 #---
@@ -395,7 +746,7 @@ class HGEObjectSettings(bpy.types.PropertyGroup):
             ignored.append(f"{object.name} is ignored")
         return ignored
 
-    def get_errors(self):
+    def get_errors(self, index=None):
         errors = []
         object = self.id_data
         role = self.resolve_role()
@@ -403,7 +754,7 @@ class HGEObjectSettings(bpy.types.PropertyGroup):
             mesh = self.find_parent_with_role("MESH")
             if not mesh and not object.parent_bone:
                 errors.append("There is no parent mesh object")
-            elif not mesh.hge_obj_settings.is_valid():
+            elif not mesh.hge_obj_settings.is_valid(index):
                 errors.append("The mesh object has errors")
             if role == "SPOT":
                 if not self.spot_name:
@@ -422,19 +773,13 @@ class HGEObjectSettings(bpy.types.PropertyGroup):
                                 errors.append("Multiple surfaces of the same type")
                                 break
         elif role == "MESH":
+            if index is None:
+                index = SceneValidationIndex(bpy.context.scene)
             origin = self.find_origin()
             if not origin:
                 errors.append("There's no origin object")
-            else:
-                for other_object in bpy.context.scene.objects:
-                    if (other_object != self and
-                    other_object.type == "MESH" and
-                    other_object.hge_obj_settings.entity == self.entity and
-                    other_object.hge_obj_settings.mesh == self.mesh):
-                        other_origin = other_object.hge_obj_settings.find_origin()
-                        if other_origin != origin:
-                            errors.append("Multiple origins for the same mesh")
-                            break
+            elif index.has_other_origin(self.entity, self.mesh, origin):
+                errors.append("Multiple origins for the same mesh")
             if not self.entity:
                 errors.append("Entity name is empty")
             elif not re.match(r"^[a-zA-Z0-9_]+$", self.entity):
@@ -445,20 +790,10 @@ class HGEObjectSettings(bpy.types.PropertyGroup):
                 errors.append("State name is empty")
             else:
                 if self.entity:
-                    if self.state in find_states(self.entity, ignore_obj=self.id_data, animated=False) and self.lod == 1:
+                    if index.is_state_used_by_others(self.entity, self.state, object) and self.lod == 1:
                         errors.append("State name is not unique")
                     if self.is_skinned():
-                        has_animation = False
-                        for object in bpy.context.scene.objects:
-                            if object.type != "ARMATURE":
-                                continue
-                            for prop in object.keys():
-                                anim_name = AnimationName.parse(prop)
-                                if not anim_name:
-                                    continue
-                                if anim_name.state == self.state:
-                                    has_animation = True
-                                    break
+                        has_animation = index.is_state_animated(self.state)
                         if not has_animation and self.inherit_animation == "None":
                             errors.append("State of skinned mesh is not animated")
             if self.lod == 1 and self.lod_distance > 0:
@@ -470,8 +805,8 @@ class HGEObjectSettings(bpy.types.PropertyGroup):
             errors.append("The combined length of all names is too long")
         return errors
 
-    def is_valid(self):
-        return not self.get_errors()
+    def is_valid(self, index=None):
+        return not self.get_errors(index)
 
     def get_mesh_name_helper(self, comment=None):
         entity_name = EntityName()
@@ -515,6 +850,233 @@ class HGEObjectSettings(bpy.types.PropertyGroup):
             name = f"{name}^{comment}"
         return name
 
+#---
+#--- Generates decimated LOD 2..N copies of a LOD 1 mesh object.
+#---
+#--- Each copy shares the entity, mesh and state of the source, is parented the same way (so it uses the same origin)
+#--- and gets its LOD and LOD distance from the presets: LOD n keeps `ratio`^(n-1) of the triangles and starts at
+#--- `distance` * 2^(n-2). Existing LODs of the same entity mesh are regenerated in place.
+#---
+#--- @class HGEGenerateLODsOp
+#---
+class HGEGenerateLODsOp(bpy.types.Operator):
+    bl_idname = "hge.generate_lods"
+    bl_label = "Generate LODs"
+    bl_description = "Creates decimated LOD copies of the selected LOD 1 mesh"
+    bl_options = {"REGISTER", "UNDO"}
+
+    lod_count: bpy.props.IntProperty(
+        name="LODs",
+        description="The number of LODs including the source mesh",
+        min=2,
+        max=5,
+        default=3)
+    ratio: bpy.props.FloatProperty(
+        name="Ratio",
+        description="Part of the triangles of the previous LOD kept by each LOD",
+        min=0.05,
+        max=0.95,
+        default=0.5)
+    distance: bpy.props.IntProperty(
+        name="LOD 2 distance",
+        description="Distance of LOD 2; each next LOD doubles it",
+        min=1,
+        default=20)
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        return obj and obj.type == "MESH" and obj.hge_obj_settings.resolve_role() == "MESH" and obj.hge_obj_settings.lod == 1
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        source = context.object
+        if source.data.shape_keys:
+            self.report({"ERROR"}, "Meshes with shape keys can't be decimated")
+            return {"CANCELLED"}
+        if context.mode != "OBJECT":
+            bpy.ops.object.mode_set(mode="OBJECT")
+
+        generated = []
+        for lod in range(2, self.lod_count + 1):
+            lod_obj = self.find_lod(context, source, lod)
+            mesh = self.decimate(context, source, self.ratio ** (lod - 1))
+            if lod_obj:
+                old_mesh = lod_obj.data
+                lod_obj.data = mesh
+                if not old_mesh.users:
+                    bpy.data.meshes.remove(old_mesh)
+            else:
+                lod_obj = source.copy()
+                lod_obj.data = mesh
+                lod_obj.name = f"{source.name}_LOD{lod}"
+                for collection in source.users_collection:
+                    collection.objects.link(lod_obj)
+            lod_obj.hge_obj_settings.lod = lod
+            lod_obj.hge_obj_settings.lod_distance = self.distance * 2 ** (lod - 2)
+            generated.append(lod_obj)
+
+        validation_cache.invalidate(generated)
+        self.report({"INFO"}, f"Generated {len(generated)} LODs of '{source.name}'")
+        return {"FINISHED"}
+
+    def find_lod(self, context, source, lod):
+        settings = source.hge_obj_settings
+        origin = settings.find_origin()
+        for obj in context.scene.objects:
+            other = obj.hge_obj_settings
+            if obj.type == "MESH" and other.entity == settings.entity and other.mesh == settings.mesh \
+                    and other.lod == lod and other.find_origin() == origin:
+                return obj
+
+    def decimate(self, context, source, ratio):
+        # evaluate the source with only a decimate modifier so skinning and other modifiers are left for the export
+        muted = [modifier for modifier in source.modifiers if modifier.show_viewport]
+        for modifier in muted:
+            modifier.show_viewport = False
+        decimate = source.modifiers.new("HGE LOD", "DECIMATE")
+        decimate.decimate_type = "COLLAPSE"
+        decimate.ratio = ratio
+        try:
+            depsgraph = context.evaluated_depsgraph_get()
+            mesh = bpy.data.meshes.new_from_object(source.evaluated_get(depsgraph), preserve_all_data_layers=True,
+                depsgraph=depsgraph)
+        finally:
+            source.modifiers.remove(decimate)
+            for modifier in muted:
+                modifier.show_viewport = True
+        mesh.name = f"{source.data.name}_LOD"
+        return mesh
+
+
+#---
+#--- Returns the vertices (Nx3) and triangles (Mx3) of mesh objects combined in the space of their origin.
+#---
+def get_lod_geometry(objects, origin):
+    origin_inverse = origin.matrix_world.inverted() if origin else None
+    vertices, triangles = [], []
+    vertex_count = 0
+    for obj in objects:
+        mesh = obj.data
+        co = numpy.empty(len(mesh.vertices) * 3, dtype=numpy.float32)
+        mesh.vertices.foreach_get("co", co)
+        matrix = obj.matrix_world if origin_inverse is None else origin_inverse @ obj.matrix_world
+        matrix = numpy.array(matrix, dtype=numpy.float32)
+        vertices.append(co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3])
+        mesh.calc_loop_triangles()
+        tris = numpy.empty(len(mesh.loop_triangles) * 3, dtype=numpy.int32)
+        mesh.loop_triangles.foreach_get("vertices", tris)
+        triangles.append(tris.reshape(-1, 3) + vertex_count)
+        vertex_count += len(mesh.vertices)
+    return numpy.concatenate(vertices), numpy.concatenate(triangles)
+
+
+#---
+#--- Returns the geometric deviation between two LODs: the largest distance from a vertex of either LOD to the surface
+#--- of the other (symmetric Hausdorff distance measured at the vertices).
+#---
+def get_lod_deviation(reference, lod):
+    from mathutils.bvhtree import BVHTree
+    deviation = 0.0
+    for (vertices, _), (surface_vertices, surface_triangles) in ((lod, reference), (reference, lod)):
+        if not len(vertices) or not len(surface_triangles):
+            continue
+        tree = BVHTree.FromPolygons(surface_vertices.tolist(), surface_triangles.tolist())
+        distances = numpy.fromiter((tree.find_nearest(vertex)[3] or 0.0 for vertex in vertices.tolist()),
+            dtype=numpy.float64, count=len(vertices))
+        deviation = max(deviation, float(distances.max()))
+    return deviation
+
+
+#---
+#--- Returns the distance at which a geometric error projects to `pixel_error` pixels on screen.
+#---
+#--- @param fov number The vertical field of view in radians.
+#--- @param resolution number The vertical screen resolution in pixels.
+#---
+def get_lod_switch_distance(deviation, fov, resolution, pixel_error):
+    return deviation * resolution / (2.0 * math.tan(fov / 2.0) * pixel_error)
+
+
+#---
+#--- Proposes (or assigns) the LOD distances of an entity's meshes from the geometric deviation of each LOD to LOD 1,
+#--- so a LOD switch never moves the silhouette by more than the given number of pixels.
+#---
+#--- @class HGETuneLODDistancesOp
+#---
+class HGETuneLODDistancesOp(bpy.types.Operator):
+    bl_idname = "hge.tune_lod_distances"
+    bl_label = "Tune LOD distances"
+    bl_description = "Computes the LOD distances of the entity meshes from their screen space error"
+    bl_options = {"REGISTER", "UNDO"}
+
+    fov: bpy.props.FloatProperty(
+        name="Camera FOV",
+        description="Vertical field of view of the game camera",
+        subtype="ANGLE",
+        min=0.01,
+        max=3.0,
+        default=math.radians(60))
+    resolution: bpy.props.IntProperty(
+        name="Resolution",
+        description="Vertical screen resolution in pixels",
+        min=1,
+        default=1080)
+    pixel_error: bpy.props.FloatProperty(
+        name="Pixel error",
+        description="Largest allowed on-screen deviation at a LOD switch, in pixels",
+        min=0.1,
+        default=1.0)
+    assign: bpy.props.BoolProperty(
+        name="Assign distances",
+        description="Assign the computed distances (otherwise only report them)",
+        default=True)
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        return obj and obj.type == "MESH" and obj.hge_obj_settings.resolve_role() == "MESH"
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        settings = context.object.hge_obj_settings
+        origin = settings.find_origin()
+        lods = {}
+        for obj in context.scene.objects:
+            other = obj.hge_obj_settings
+            if obj.type == "MESH" and other.entity == settings.entity and other.mesh == settings.mesh \
+                    and other.resolve_role() == "MESH" and other.find_origin() == origin:
+                lods.setdefault(other.lod, []).append(obj)
+        if 1 not in lods or len(lods) < 2:
+            self.report({"ERROR"}, f"'{settings.entity}:{settings.mesh}' needs LOD 1 and at least one more LOD")
+            return {"CANCELLED"}
+
+        reference = get_lod_geometry(lods[1], origin)
+        min_distance = 0
+        proposals = []
+        for lod in sorted(lods):
+            if lod == 1:
+                continue
+            deviation = get_lod_deviation(reference, get_lod_geometry(lods[lod], origin))
+            distance = get_lod_switch_distance(deviation, self.fov, self.resolution, self.pixel_error)
+            # distances must grow with the LOD
+            distance = max(min_distance + 1, math.ceil(distance))
+            min_distance = distance
+            proposals.append(f"LOD {lod}: deviation {deviation:.4f}m -> distance {distance}")
+            if self.assign:
+                for obj in lods[lod]:
+                    obj.hge_obj_settings.lod_distance = distance
+
+        for proposal in proposals:
+            print(f"[HG] {settings.entity}:{settings.mesh} {proposal}")
+        self.report({"INFO"}, "; ".join(proposals))
+        return {"FINISHED"}
+
+
 #---
 #--- The `HGEObjectSettingsPanelBase` class is the base class for the Blender UI panel that displays settings for HGE (Havok Game Engine) objects in the Blender scene. This panel allows the user to configure various properties of the HGE object, such as the entity name, mesh, LOD, and animation inheritance.
 #---
@@ -532,6 +1094,10 @@ class HGEObjectSettingsPanelBase:
         state_row.enabled = hge_obj_settings.inherit_animation == "None"
         self.layout.prop(hge_obj_settings, "lod", slider=True)
         self.layout.prop(hge_obj_settings, "lod_distance")
+        row = self.layout.row()
+        if hge_obj_settings.lod == 1:
+            row.operator("hge.generate_lods")
+        row.operator("hge.tune_lod_distances")
 
     def draw(self, context):
         if not context.object:
@@ -569,7 +1135,7 @@ class HGEObjectSettingsPanelBase:
                 self.layout.label(text="This object will be ignored during export.")
             if role not in {"IGNORED", "ORIGIN", ""}:
                 self.layout.label(text=f"Export name: {hge_obj_settings.get_hge_name()}")
-            errors = hge_obj_settings.get_errors()
+            errors = get_validation_cache(context.scene).get_errors(context.object)
             if errors:
                 self.layout.label(text="To export this object you need to fix these errors:", icon="ERROR")
                 for i in range(len(errors)):
@@ -679,6 +1245,172 @@ MATERIAL_PROPERTIES = [
 ]
 
 
+#---
+#--- A texture file referenced by a material map; its stats are refreshed on each lookup and its content hash is
+#--- computed only when first needed after a change.
+#---
+#--- @class TextureInfo
+#--- @field filepath string The absolute path of the file.
+#--- @field exists boolean If the file exists.
+#--- @field size number The file size in bytes.
+#--- @field mtime number The modification time in nanoseconds.
+#---
+class TextureInfo:
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.exists = False
+        self.size = 0
+        self.mtime = 0
+        self.hash = None
+
+    def update(self):
+        try:
+            stat = os.stat(self.filepath)
+            exists, size, mtime = True, stat.st_size, stat.st_mtime_ns
+        except OSError:
+            exists, size, mtime = False, 0, 0
+        if (exists, size, mtime) != (self.exists, self.size, self.mtime):
+            self.exists, self.size, self.mtime = exists, size, mtime
+            self.hash = None
+
+    def get_hash(self):
+        if self.hash is None:
+            if not self.exists:
+                self.hash = ""
+            else:
+                hasher = hashlib.sha1()
+                with open(self.filepath, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        hasher.update(chunk)
+                self.hash = hasher.hexdigest()
+        return self.hash
+
+
+#---
+#--- The texture files referenced by the materials, indexed by normalised path.
+#---
+#--- Resolves image paths once per (blend file, library, image path) and keeps the file stats and hashes used by the
+#--- incremental export and validation.
+#---
+#--- @class TextureRegistry
+#---
+class TextureRegistry:
+    def __init__(self):
+        self.textures = {}
+        self.abspaths = {}
+        # normalised source path -> the converted copy exported instead of it
+        self.export_paths = {}
+
+    @staticmethod
+    def normalize_path(filepath):
+        return os.path.normcase(os.path.normpath(filepath))
+
+    def get_image_filepath(self, image):
+        library = image.library.filepath if image.library else ""
+        key = (bpy.data.filepath, library, image.filepath)
+        filepath = self.abspaths.get(key)
+        if filepath is None:
+            filepath = os.path.normpath(bpy.path.abspath(image.filepath, library=image.library)) if image.filepath else ""
+            self.abspaths[key] = filepath
+        return filepath
+
+    def get(self, filepath):
+        key = self.normalize_path(filepath)
+        texture = self.textures.get(key)
+        if not texture:
+            texture = TextureInfo(filepath)
+            self.textures[key] = texture
+        texture.update()
+        return texture
+
+    def get_image_texture(self, image):
+        filepath = self.get_image_filepath(image)
+        return filepath and self.get(filepath)
+
+    def get_export_filepath(self, image):
+        filepath = self.get_image_filepath(image)
+        return self.export_paths.get(self.normalize_path(filepath), filepath) if filepath else filepath
+
+    def load_image(self, filepath):
+        # reuses the image already using the file, if any
+        image_count = len(bpy.data.images)
+        image = bpy.data.images.load(filepath, check_existing=True)
+        if len(bpy.data.images) > image_count and bpy.data.filepath:
+            # relative like the paths set by image.open
+            try:
+                image.filepath = bpy.path.relpath(image.filepath)
+            except ValueError:
+                pass
+        return image
+
+
+texture_registry = TextureRegistry()
+
+
+#---
+#--- MATERIAL_PROPERTIES compiled for stamping materials. Per material type it keeps the properties which are stored as
+#--- custom properties (i.e. not shadowed by an RNA property of the type) along with where their values come from.
+#---
+#--- @class MaterialPropsPlan
+#--- @param props table The MaterialPropDef list to compile.
+#---
+class MaterialPropsPlan:
+    def __init__(self, props):
+        self.props = props
+        self.compiled = {}
+
+    def compile(self, material):
+        material_type = type(material)
+        plan = self.compiled.get(material_type)
+        if plan is None:
+            rna_keys = set(material_type.bl_rna.properties.keys())
+            plan = [(prop.id, prop.default, prop.settings_name, prop.map) for prop in self.props if prop.id not in rna_keys]
+            self.compiled[material_type] = plan
+        return plan
+
+    def get_values(self, material):
+        hgm_settings = material.hgm_settings
+        values = []
+        for id, default, settings_name, map in self.compile(material):
+            if not settings_name:
+                value = default
+            else:
+                value = getattr(hgm_settings, settings_name)
+                if map:
+                    value = texture_registry.get_export_filepath(value) if value else ""
+            values.append((id, value))
+        return values
+
+    #---
+    #--- Writes the custom properties of the material, skipping the ones which already have the right value.
+    #---
+    #--- @return number The number of properties written.
+    #---
+    def stamp(self, material):
+        written = 0
+        for id, value in self.get_values(material):
+            current = material.get(id)
+            if not self.is_stamped(current, value):
+                material[id] = value
+                written += 1
+        return written
+
+    @staticmethod
+    def is_stamped(current, value):
+        if isinstance(value, bool):
+            # Blender before 3.0 stores Python bools as int ID properties
+            return type(current) in (bool, int) and current in (0, 1) and bool(current) == value
+        return type(current) is type(value) and current == value
+
+    def remove(self, material):
+        for id, _, _, _ in self.compile(material):
+            if id in material:
+                del material[id]
+
+
+MATERIAL_PROPERTIES_PLAN = MaterialPropsPlan(MATERIAL_PROPERTIES)
+
+
 #---
 #Removes all material properties from the given material.
 #
@@ -686,21 +1418,18 @@ MATERIAL_PROPERTIES = [
 #
 #@param material The material to remove the properties from.
 def remove_material_props(material):
-    for prop in MATERIAL_PROPERTIES:
-        if prop_exists(material, prop.id):
-            del material[prop.id]
+    MATERIAL_PROPERTIES_PLAN.remove(material)
 
 
 #---
 #Adds the material properties defined in the `MATERIAL_PROPERTIES` list to the given material.
 #
-#This function is used to set the material properties on a material object. It iterates through the list of known material properties and sets any that are not already present on the material.
+#This function sets the custom properties of the material from its HGE material settings (or their defaults),
+#writing only the values that differ from the stored ones.
 #
 #@param material The material to add the properties to.
 def add_material_props(material):
-    for prop in MATERIAL_PROPERTIES:
-        if not prop_exists(material, prop.id):
-            material[prop.id] = prop.default
+    return MATERIAL_PROPERTIES_PLAN.stamp(material)
 
 
 #---
@@ -712,179 +1441,226 @@ def add_material_props(material):
 #
 #@param settings The material settings object containing the texture images and other properties.
 #@param context The Blender context.
-def recreate_shader_nodes(settings, context):
-    unused_nodes = []
-    material = settings.id_data
+#---
+#--- A node of the shader graph generated for the HGE materials.
+#---
+#--- @class ShaderNodeDef
+#--- @param name string The node's name in the node tree (identifies it between updates).
+#--- @param type string The node's bl_idname.
+#--- @param location table The node's location.
+#--- @param props table (optional) Node attributes to set.
+#--- @param inputs table (optional) Default values of input sockets.
+#--- @param parent string (optional) The name of the parent frame node.
+#---
+class ShaderNodeDef:
+    def __init__(self, name, type, location=(0, 0), props=None, inputs=None, parent=None):
+        self.name = name
+        self.type = type
+        self.location = location
+        self.props = props or {}
+        self.inputs = inputs or {}
+        self.parent = parent
 
-    # setup material
-    material.use_nodes = True
-    material.use_backface_culling = settings.two_sided_shading
-    material.blend_method = "OPAQUE"
-    material.alpha_threshold = 0
-    if settings.alpha_blend_mode == "1":
-        if settings.alpha_test_value > 0:
-            material.blend_method = "CLIP"
-            material.alpha_threshold = settings.alpha_test_value / 255.0
-    elif settings.alpha_blend_mode == "2":
-        material.blend_method = "BLEND"
 
-    # remove old shader nodes
-    node_tree = material.node_tree
-    node_tree.nodes.clear()
-
-    # setup new nodes and links
-    output = node_tree.nodes.new("ShaderNodeOutputMaterial")
-    output.target = "EEVEE"
-    output.location = (0, 20)
-
-    bsdf = node_tree.nodes.new("ShaderNodeBsdfPrincipled")
-    bsdf.location = (-260, 0)
-    bsdf.inputs["Specular"].default_value = 0
-    node_tree.links.new(bsdf.outputs["BSDF"], output.inputs["Surface"], verify_limits=True)
-
-    base_color = node_tree.nodes.new("ShaderNodeTexImage")
-    base_color.location = (-780, 20)
-    base_color.image = settings.base_color
-    node_tree.links.new(base_color.outputs["Color"], bsdf.inputs["Base Color"], verify_limits=True)
-    node_tree.links.new(base_color.outputs["Alpha"], bsdf.inputs["Alpha"], verify_limits=True)
-
-    normal_map = node_tree.nodes.new("ShaderNodeTexImage")
-    normal_map.location = (-780, -780)
-    normal_map.image = settings.normal_map
-    node_tree.links.new(normal_map.outputs["Color"], bsdf.inputs["Normal"], verify_limits=True)
-
-    roughness_metallic_map = node_tree.nodes.new("ShaderNodeTexImage")
-    roughness_metallic_map.location = (-780, -240)
-    roughness_metallic_map.image = settings.roughness_metallic_map
-    separate_rgb = node_tree.nodes.new("ShaderNodeSeparateRGB")
-    separate_rgb.location = (-480, -180)
-    node_tree.links.new(roughness_metallic_map.outputs["Color"], separate_rgb.inputs["Image"], verify_limits=True)
-    node_tree.links.new(separate_rgb.outputs["R"], bsdf.inputs["Roughness"], verify_limits=True)
+#---
+#--- Returns the shader graph matching the given material settings.
+#---
+#--- @return table, table The nodes (name -> ShaderNodeDef) and links (from node, output, to node, input).
+#---
+def get_shader_graph(settings):
+    nodes, links = {}, []
+    frame = "hge_frame"
+
+    def node(name, type, location, props=None, inputs=None):
+        nodes[name] = ShaderNodeDef(name, type, location, props, inputs, parent=frame)
+
+    def link(from_node, output, to_node, input):
+        links.append((from_node, output, to_node, input))
+
+    node("hge_output", "ShaderNodeOutputMaterial", (0, 20), {"target": "EEVEE"})
+    node("hge_bsdf", "ShaderNodeBsdfPrincipled", (-260, 0), inputs={"Specular": 0.0})
+    link("hge_bsdf", "BSDF", "hge_output", "Surface")
+
+    textures = ["hge_base_color", "hge_normal_map", "hge_roughness_metallic_map", "hge_self_illum_map"]
+    base_color_location = (-780, 20)
+    if settings.ambient_occlusion_map:
+        base_color_location = (-780, 300)
+        textures.append("hge_ambient_occlusion_map")
+        node("hge_ambient_occlusion_map", "ShaderNodeTexImage", (-780, 40), {"image": settings.ambient_occlusion_map})
+        node("hge_mix_rgb", "ShaderNodeMixRGB", (-480, 0), {"blend_type": "MULTIPLY"}, {"Fac": 1.0})
+        link("hge_base_color", "Color", "hge_mix_rgb", "Color1")
+        link("hge_ambient_occlusion_map", "Color", "hge_mix_rgb", "Color2")
+        link("hge_mix_rgb", "Color", "hge_bsdf", "Base Color")
+    else:
+        link("hge_base_color", "Color", "hge_bsdf", "Base Color")
+    node("hge_base_color", "ShaderNodeTexImage", base_color_location, {"image": settings.base_color})
+    if not settings.translucent_shading:
+        link("hge_base_color", "Alpha", "hge_bsdf", "Alpha")
+
+    node("hge_normal_map", "ShaderNodeTexImage", (-780, -780), {"image": settings.normal_map})
+    link("hge_normal_map", "Color", "hge_bsdf", "Normal")
+
+    node("hge_roughness_metallic_map", "ShaderNodeTexImage", (-780, -240), {"image": settings.roughness_metallic_map})
+    node("hge_separate_rgb", "ShaderNodeSeparateRGB", (-480, -180))
+    link("hge_roughness_metallic_map", "Color", "hge_separate_rgb", "Image")
+    link("hge_separate_rgb", "R", "hge_bsdf", "Roughness")
     if settings.translucent_shading:
-        invert = node_tree.nodes.new("ShaderNodeInvert")
-        invert.location = (-480, -320)
-        node_tree.links.new(separate_rgb.outputs["B"], invert.inputs["Color"], verify_limits=True)
-        node_tree.links.new(invert.outputs["Color"], bsdf.inputs["Alpha"], verify_limits=True)
+        node("hge_invert", "ShaderNodeInvert", (-480, -320))
+        link("hge_separate_rgb", "B", "hge_invert", "Color")
+        link("hge_invert", "Color", "hge_bsdf", "Alpha")
     else:
-        node_tree.links.new(separate_rgb.outputs["B"], bsdf.inputs["Metallic"], verify_limits=True)
+        link("hge_separate_rgb", "B", "hge_bsdf", "Metallic")
 
-    ambient_occlusion_map = node_tree.nodes.new("ShaderNodeTexImage")
-    ambient_occlusion_map.location = (-780, -260)
-    ambient_occlusion_map.image = settings.ambient_occlusion_map
-    if settings.ambient_occlusion_map:
-        mix_rgb = node_tree.nodes.new("ShaderNodeMixRGB")
-        mix_rgb.location = (-480, 0)
-        mix_rgb.blend_type = "MULTIPLY"
-        mix_rgb.inputs["Fac"].default_value = 1.0
-        ambient_occlusion_map.location = (-780, 40)
-        base_color.location = (-780, 300)
-        node_tree.links.new(base_color.outputs["Color"], mix_rgb.inputs["Color1"], verify_limits=True)
-        node_tree.links.new(ambient_occlusion_map.outputs["Color"], mix_rgb.inputs["Color2"], verify_limits=True)
-        node_tree.links.new(mix_rgb.outputs["Color"], bsdf.inputs["Base Color"], verify_limits=True)
-
-    self_illum_map = node_tree.nodes.new("ShaderNodeTexImage")
-    self_illum_map.location = (-780, -520)
-    self_illum_map.image = settings.self_illum_map
-    node_tree.links.new(self_illum_map.outputs["Color"], bsdf.inputs["Emission"], verify_limits=True)
-
-    colorization_mask = node_tree.nodes.new("ShaderNodeTexImage")
-    colorization_mask.location = (-780, -280)
-    colorization_mask.image = settings.colorization_mask
-
-    special_map = node_tree.nodes.new("ShaderNodeTexImage")
-    special_map.location = (-780, -300)
-    special_map.image = settings.special_map
-
-    # determine unused nodes
-    unused_nodes = []
-    for node in node_tree.nodes:
-        if not node.outputs:
-            continue
-        is_used = False
-        for out in node.outputs:
-            if out.is_linked:
-                is_used = True
-                break
-        if not is_used:
-            unused_nodes.append(node)
+    node("hge_self_illum_map", "ShaderNodeTexImage", (-780, -520), {"image": settings.self_illum_map})
+    link("hge_self_illum_map", "Color", "hge_bsdf", "Emission")
 
     # animation UV transformation
     if settings.animation_time > 0:
         frames_x = max(1, settings.animation_frames_x)
         frames_y = max(1, settings.animation_frames_y)
         if frames_x > 1 or frames_y > 1:
-            uv_map = node_tree.nodes.new("ShaderNodeUVMap")
-            uv_map.from_instancer = True
-            uv_map.location = (-1200, -520)
-            mapping = node_tree.nodes.new("ShaderNodeMapping")
-            mapping.vector_type = "VECTOR"
-            mapping.location = (-980, -460)
-            mapping.inputs["Scale"].default_value = (1.0 / frames_x, 1.0 / frames_y, 1.0)
-            node_tree.links.new(uv_map.outputs["UV"], mapping.inputs["Vector"], verify_limits=True)
-            for texture_node in node_tree.nodes:
-                if isinstance(texture_node, bpy.types.ShaderNodeTexImage) and texture_node not in unused_nodes:
-                    node_tree.links.new(mapping.outputs["Vector"], texture_node.inputs["Vector"], verify_limits=True)
-
-    # clear unused nodes
-    node_name = 'Image Texture'
-    all_tex_nodes = []
-    clear_unused_nodes = bpy.context.active_object.active_material.node_tree.nodes
-    if unused_nodes:
-        unodes_count = len(unused_nodes)
-        unodes_rem = 0
-        for node in unused_nodes:
-            clear_unused_nodes.remove(clear_unused_nodes[node.name])
-            unodes_rem += 1
-    print(f"{unodes_count - unodes_rem} unused nodes left, {unodes_rem} unused nodes removed\n")
-    unused_nodes.remove 
-    '''
-    for inode in clear_unused_nodes:
-        if inode.type == 'TEX_IMAGE':
-            all_tex_nodes.append(inode)
-            print(f"{inode.name} is type {inode.type}\n")
-    print(all_tex_nodes)
-    for tnode in all_tex_nodes:
-            #attributes = dir(tnode)
-            #print(attributes)
-            anode = tnode.image
-            print(f"{dir(anode)}\n")
-            if dir(tnode.image).count('source') > 0:# == 'FILE':
-                print(f"{tnode.name} with source {tnode.image.source} located at {tnode.image.filepath}\n")
-            else:
-                tnode.hide
-                print(f"{tnode.name} has no image source\n {tnode.location}")
-                print(f"{dir(tnode)}\n")'''
-    '''
-            if inode.image.source:
-                print(f"{inode.name} has source {inode.image.source}")
-            else:
-                print(f"{inode.name} has no source")'''
-
-    # unused nodes decoration
-    '''
-    if unused_nodes:
-        unused_frame = None
-        unused_frame = node_tree.nodes.new("NodeFrame")
-        unused_frame.label = "Unused"
-        unused_frame.use_custom_color = True
-        unused_frame.color = (0.336, 0.017, 0.026)
-        idx = 0
-        for node in unused_nodes:
-            node.hide = True
-            node.parent = unused_frame
-            node.location = (0, idx * -20)
-            idx = idx + 1
-        unused_frame.location = (40, -160)
-    '''
+            node("hge_uv_map", "ShaderNodeUVMap", (-1200, -520), {"from_instancer": True})
+            node("hge_mapping", "ShaderNodeMapping", (-980, -460), {"vector_type": "VECTOR"},
+                {"Scale": (1.0 / frames_x, 1.0 / frames_y, 1.0)})
+            link("hge_uv_map", "UV", "hge_mapping", "Vector")
+            for texture in textures:
+                link("hge_mapping", "Vector", texture, "Vector")
 
     # global decoration
-    generated_frame = node_tree.nodes.new("NodeFrame")
-    generated_frame.label = "Auto generated - don't edit manually"
-    generated_frame.use_custom_color = True
-    generated_frame.color = (0.066, 0.293, 0.059)
-    for node in node_tree.nodes:
-        if not node.parent:
-            node.parent = generated_frame
+    nodes[frame] = ShaderNodeDef(frame, "NodeFrame", props={
+        "label": "Auto generated - don't edit manually",
+        "use_custom_color": True,
+        "color": (0.066, 0.293, 0.059),
+    })
+    return nodes, links
+
+
+def values_equal(current, value):
+    if isinstance(value, float):
+        return isinstance(current, (int, float)) and abs(current - value) < 1e-6
+    if isinstance(value, (tuple, list)):
+        try:
+            return len(current) == len(value) and all(values_equal(c, v) for c, v in zip(current, value))
+        except TypeError:
+            return False
+    return current == value
+
+
+#---
+#--- Assigns a value only if it differs from the current one, so unchanged data isn't tagged for update.
+#---
+#--- @return boolean If the value was changed.
+#---
+def set_if_changed(data, attr, value):
+    if values_equal(getattr(data, attr), value):
+        return False
+    setattr(data, attr, value)
+    return True
+
+
+#---
+#--- Patches the material's node tree to match the given shader graph: only the nodes, values and links that differ are
+#--- touched, so an identical graph causes no shader recompilation. Nodes not in the graph are removed.
+#---
+#--- @return number The number of changes made.
+#---
+def apply_shader_graph(material, nodes, links):
+    node_tree = material.node_tree
+    tree_nodes = node_tree.nodes
+    changes = 0
+    for node in list(tree_nodes):
+        node_def = nodes.get(node.name)
+        if not node_def or node.bl_idname != node_def.type:
+            tree_nodes.remove(node)
+            changes += 1
+
+    for node_def in nodes.values():
+        node = tree_nodes.get(node_def.name)
+        if not node:
+            node = tree_nodes.new(node_def.type)
+            node.name = node_def.name
+            changes += 1
+        changes += set_if_changed(node, "location", node_def.location)
+        for attr, value in node_def.props.items():
+            changes += set_if_changed(node, attr, value)
+        for input, value in node_def.inputs.items():
+            changes += set_if_changed(node.inputs[input], "default_value", value)
+    for node_def in nodes.values():
+        node = tree_nodes[node_def.name]
+        parent = tree_nodes.get(node_def.parent) if node_def.parent else None
+        if node.parent != parent:
+            node.parent = parent
+            changes += 1
+
+    new_links = {}
+    for from_node, output, to_node, input in links:
+        from_socket = tree_nodes[from_node].outputs[output]
+        to_socket = tree_nodes[to_node].inputs[input]
+        new_links[(from_socket.as_pointer(), to_socket.as_pointer())] = (from_socket, to_socket)
+    for link in list(node_tree.links):
+        key = (link.from_socket.as_pointer(), link.to_socket.as_pointer())
+        if new_links.pop(key, None) is None:
+            node_tree.links.remove(link)
+            changes += 1
+    for from_socket, to_socket in new_links.values():
+        node_tree.links.new(from_socket, to_socket, verify_limits=True)
+        changes += 1
+    return changes
+
+
+def regenerate_shader_nodes(material):
+    settings = material.hgm_settings
+
+    # setup material
+    blend_method = "OPAQUE"
+    alpha_threshold = 0.0
+    if settings.alpha_blend_mode == "1":
+        if settings.alpha_test_value > 0:
+            blend_method = "CLIP"
+            alpha_threshold = settings.alpha_test_value / 255.0
+    elif settings.alpha_blend_mode == "2":
+        blend_method = "BLEND"
+    set_if_changed(material, "use_nodes", True)
+    set_if_changed(material, "use_backface_culling", settings.two_sided_shading)
+    set_if_changed(material, "blend_method", blend_method)
+    set_if_changed(material, "alpha_threshold", alpha_threshold)
+
+    nodes, links = get_shader_graph(settings)
+    apply_shader_graph(material, nodes, links)
+
+
+# names of the materials waiting for shader nodes regeneration; several property updates in a row (or a material
+# shared by many objects) result in a single regeneration once the timer fires
+shader_nodes_queue = set()
+SHADER_NODES_DELAY = 0.1
+
+
+def drain_shader_nodes_queue():
+    names = list(shader_nodes_queue)
+    shader_nodes_queue.clear()
+    for name in names:
+        material = bpy.data.materials.get(name)
+        if material and not material.library:
+            regenerate_shader_nodes(material)
+
+
+#---
+#--- Queues regeneration of the material's shader nodes; postpones the pending regeneration if already queued.
+#---
+def queue_shader_nodes(material):
+    if bpy.app.background:
+        # timers don't run while a background script is executing
+        regenerate_shader_nodes(material)
+        return
+    shader_nodes_queue.add(material.name)
+    if bpy.app.timers.is_registered(drain_shader_nodes_queue):
+        bpy.app.timers.unregister(drain_shader_nodes_queue)
+    bpy.app.timers.register(drain_shader_nodes_queue, first_interval=SHADER_NODES_DELAY)
+
+
+# update callback of the HGEMaterialSettings properties affecting the shader nodes
+def recreate_shader_nodes(settings, context):
+    queue_shader_nodes(settings.id_data)
 
 
 #---
@@ -906,10 +1682,14 @@ class HGERecreateShaderNodes(bpy.types.Operator):
     bl_description = "Recreates and cleans up on demand shader nodes by preconfigured manner!\nAlso executes on background for every texture change"
 
     def execute(self, context):
+        materials = set()
         for object in context.scene.objects:
-            if not object.material_slots:
-                continue
-            recreate_shader_nodes(object.material_slots[0].material.hgm_settings, context)
+            for slot in object.material_slots:
+                if slot.material and not slot.material.library:
+                    materials.add(slot.material)
+        for material in materials:
+            shader_nodes_queue.discard(material.name)
+            regenerate_shader_nodes(material)
         return {"FINISHED"}
 
 
@@ -1274,26 +2054,20 @@ class HGEMaterialOpenMapOp(bpy.types.Operator, bpy_extras.io_utils.ImportHelper)
 
     def execute(self, context):
         try:
-            bpy.ops.image.open(filepath=self.filepath)
+            opened_image = texture_registry.load_image(self.filepath)
         except RuntimeError as e:
             self.report({"ERROR"}, str(e))
-        opened_image = None
-        norm_self_path = self.filepath
-        norm_self_path = os.path.normpath(norm_self_path)
-        norm_self_path = os.path.normcase(norm_self_path)
-        for image in bpy.data.images:
-            norm_image_path = bpy.path.abspath(image.filepath)
-            norm_image_path = os.path.normpath(norm_image_path)
-            norm_image_path = os.path.normcase(norm_image_path)
-            if norm_image_path == norm_self_path:
-                opened_image = image
-                break
+            opened_image = None
 
         if opened_image:
             object = context.active_object
             material = object.active_material
             hgm_settings = material.hgm_settings
             setattr(hgm_settings, self.map_prop, opened_image)
+            header = read_texture_header(self.filepath)
+            errors, warnings = check_texture_header(header)
+            for problem in errors + warnings:
+                self.report({"WARNING"}, f"{os.path.basename(self.filepath)}: {problem}")
         else:
             self.report({"ERROR"}, "Failed to find opened the image")
 
@@ -1511,7 +2285,7 @@ class HGEMaterialAnimationsPanel(HGEMaterialPanelBase, bpy.types.Panel):
 #This UI list is likely used in a Blender panel or operator to allow the user to manage the marked animations for a Haemimont material.
 class HGE_UL_marked_animations(bpy.types.UIList):
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index, flt_flag):
-        anim_name = AnimationName.parse(item.prop_name)
+        anim_name = item.get_animation_name()
         row = layout.row()
         row.label(text=f"{anim_name.entity}")
         row.label(text=f"{anim_name.mesh}", icon="MESH_DATA")
@@ -1527,6 +2301,7 @@ class HGE_UL_marked_animations(bpy.types.UIList):
 #@param context The Blender context.
 def update_marked_anim_props(marked_anim, context):
     marked_anim.armature_object[marked_anim.prop_name] = marked_anim.get_anim_prop_value()
+    animation_table.invalidate(marked_anim.armature_object)
 
 
 #---
@@ -1571,8 +2346,15 @@ class HGEMarkedAnimation(bpy.types.PropertyGroup):
     def get_prop_name(self):
         return self.prop_name
 
+    def get_animation(self):
+        return self.armature_object and animation_table.find(self.armature_object, self.prop_name)
+
+    def get_animation_name(self):
+        animation = self.get_animation()
+        return animation.name if animation else AnimationName.parse(self.prop_name)
+
     def get_export_prop_name(self):
-        return AnimationName.parse(self.prop_name).get_export_name()
+        return self.get_animation_name().get_export_name()
 
     def get_anim_prop_value(self):
         return ":".join([
@@ -1704,6 +2486,8 @@ class HGEMarkAnimationOp(bpy.types.Operator):
             marked_anim.frame_end = hge_settings.mark_anim_frame_end
             armature_object[anim_name_str] = marked_anim.get_anim_prop_value()
             armature_object[anim_name.get_export_name()] = True
+            animation_table.invalidate(armature_object)
+            validation_cache.invalidate([armature_object])
             self.report({"INFO"}, "The animation was added")
             return {"FINISHED"}
 
@@ -1736,70 +2520,842 @@ class HGEUnmarkAnimationOp(bpy.types.Operator):
                 del armature_object[prop_name]
             if export_prop_name in armature_object:
                 del armature_object[export_prop_name]
+            animation_table.invalidate(armature_object)
+            validation_cache.invalidate([armature_object])
             hge_settings.marked_animations.remove(hge_settings.active_marked_animation_index)
         return {"FINISHED"}
 
-# export--------------------------------------------------------------------------------------------------------------------------------------------------------
+# toolchain--------------------------------------------------------------------------------------------------------------------------------------------------------
 
 #---
-#--- Represents a property group for HGE animation exports.
-#--- This property group contains various properties related to the animation export, such as the animation name, armature name, property name, and whether the animation should be exported.
+#--- Returns the appdata, registry and toolchain cache helpers shared with the addon, which needs them to locate this file.
+#--- The addon registers its copy before importing this module; the batch export loads the one shipped next to this file.
 #---
-#--- @class HGEAnimExportProperty
-#--- @field label string The animation name.
-#--- @field armature string The armature name.
-#--- @field property string The property name.
-#--- @field export boolean Whether the animation should be exported.
-class HGEAnimExportProperty(bpy.types.PropertyGroup):
-    label: bpy.props.StringProperty(name="Animation Name")
-    armature: bpy.props.StringProperty(name="Armature Name")
-    property: bpy.props.StringProperty(name="Property Name")
-    export: bpy.props.BoolProperty(
-        name="Export",
-        description="If this animation should be exported",
-        default=True)
+def import_toolchain_cache():
+    module = sys.modules.get("HGEToolchainCache")
+    if module:
+        return module
+    filepath = os.path.join(os.path.dirname(os.path.realpath(__file__)), "HG Blender Exporter", "HGEToolchainCache.py")
+    spec = importlib.util.spec_from_file_location("HGEToolchainCache", filepath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules["HGEToolchainCache"] = module
+    return module
+
+
+HGEToolchainCache = import_toolchain_cache()
 
 
 #---
-#--- Represents a property group for HGE mesh exports.
-#--- This property group contains various properties related to the mesh export, such as the mesh name, entity name, LOD, and whether the mesh should be exported.
+#--- Returns the per-user directory of the game (%APPDATA%\<appid> on Windows) where the exported files are written.
+#--- HGE_APPDATA overrides %APPDATA%; without either (e.g. on Linux) $XDG_CONFIG_HOME or ~/.config is used.
 #---
-#--- @class HGEMeshExportProperty
-#--- @field label string The mesh name.
-#--- @field entity string The entity name.
-#--- @field mesh string The mesh name.
-#--- @field lod string The LOD.
-#--- @field export boolean Whether the mesh should be exported.
+def get_appdata_dirname():
+    return HGEToolchainCache.get_appdata_dirname(SETTINGS["appid"])
+
+
 #---
-#--- @function get_key()
-#--- Returns a unique key for this mesh export property.
+#--- Returns the directory of the game as recorded by its last launch in the Windows registry (nil elsewhere).
 #---
-#--- @function matches_entity_name(entity_name)
-#--- Checks if this mesh export property matches the given entity name.
-#--- @param entity_name table The entity name to check against.
-#--- @return boolean True if the mesh export property matches the entity name, false otherwise.
-class HGEMeshExportProperty(bpy.types.PropertyGroup):
-    label: bpy.props.StringProperty(name="Mesh Name")
-    entity: bpy.props.StringProperty(name="Entity Name")
-    mesh: bpy.props.StringProperty(name="Mesh Name")
-    lod: bpy.props.StringProperty(name="LOD")
-    export: bpy.props.BoolProperty(
-        name="Export",
-        description="If this mesh should be exported",
-        default=True)
+def read_registry_game_dir():
+    return HGEToolchainCache.read_registry_game_dir(SETTINGS["appid"])
 
-    def get_key(self):
-        return f"{self.entity}:{self.mesh}:{self.lod}"
 
-    def matches_entity_name(self, entity_name):
-        return (
-            self.entity == entity_name.name and
-            self.mesh == entity_name.mesh and
-            self.lod == entity_name.lod)
+#---
+#--- Returns the executable `name` in `dirname` (with or without .exe, so Linux builds and wrappers work too).
+#---
+def find_executable(dirname, name):
+    if not dirname:
+        return
+    for filename in (name + ".exe", name):
+        filepath = os.path.join(dirname, filename)
+        if os.path.isfile(filepath):
+            return filepath
 
 
-#---
-#--- Represents a context manager for exporting animations.
+def find_trunk_assets_processor():
+    trunk_path = os.getenv("HGETrunkRoot")
+    if trunk_path:
+        return find_executable(os.path.join(trunk_path, "Tools", "AssetsProcessor", "Bin"), "AssetsProcessor")
+
+
+def find_game_assets_processor():
+    game_dir = toolchain.get("game_dir")
+    if game_dir:
+        return find_executable(os.path.join(game_dir, "ModTools", "AssetsProcessor"), "AssetsProcessor")
+
+
+def find_exporter_assets_processor():
+    return find_executable(os.path.join(os.path.dirname(os.path.realpath(__file__)), "AssetsProcessor"), "AssetsProcessor")
+
+
+# environment variables which, when set, override the discovery of a toolchain path
+TOOLCHAIN_ENV_VARS = {
+    "assets_processor": "HGEAP",
+    "game_dir": "HGE_GAME_DIR",
+}
+
+# discovery steps of each toolchain path, tried in order; use add_toolchain_resolver to plug in more
+TOOLCHAIN_RESOLVERS = {
+    "assets_processor": [
+        find_trunk_assets_processor,
+        find_game_assets_processor,
+        find_exporter_assets_processor,
+    ],
+    "game_dir": [
+        read_registry_game_dir,
+    ],
+}
+
+
+#---
+#--- Adds a discovery step for a toolchain path.
+#---
+#--- @param key string The toolchain path ("assets_processor", "game_dir").
+#--- @param resolver function Called without arguments, returns a candidate path or nil.
+#--- @param first boolean (optional) Try it before the built-in steps.
+#---
+def add_toolchain_resolver(key, resolver, first=False):
+    resolvers = TOOLCHAIN_RESOLVERS.setdefault(key, [])
+    resolvers.insert(0, resolver) if first else resolvers.append(resolver)
+    toolchain.invalidate(key)
+
+
+#---
+#--- The paths of the external tools used by the export, discovered once and cached in HGEToolchain.json (see HGEToolchainCache,
+#--- the addon keeps the exporter directory in the same file).
+#---
+#--- A cached path is used as long as it exists; only then the discovery steps run again. Explicit settings take
+#--- precedence over the cache: the environment variables in TOOLCHAIN_ENV_VARS and the JSON file pointed by
+#--- HGE_TOOLCHAIN_CONFIG (e.g. {"assets_processor": "/opt/hg/AssetsProcessor"} on a Linux build machine).
+#---
+#--- @class Toolchain
+#---
+class Toolchain:
+    def __init__(self):
+        self.paths = None
+
+    def load(self):
+        if self.paths is not None:
+            return
+        self.paths = HGEToolchainCache.read_cache(SETTINGS["appid"])
+
+    def save(self):
+        HGEToolchainCache.write_cache(SETTINGS["appid"], self.paths)
+
+    def get_override(self, key):
+        env_var = TOOLCHAIN_ENV_VARS.get(key)
+        path = env_var and os.getenv(env_var)
+        if not path:
+            path = HGEToolchainCache.read_json(os.getenv("HGE_TOOLCHAIN_CONFIG")).get(key)
+        return path and os.path.normpath(path)
+
+    def get(self, key):
+        path = self.get_override(key)
+        if path:
+            return path
+        self.load()
+        path = self.paths.get(key)
+        if path and os.path.exists(path):
+            return path
+        path = self.resolve(key)
+        if path:
+            self.paths[key] = path
+            self.save()
+        return path
+
+    def resolve(self, key):
+        for resolver in TOOLCHAIN_RESOLVERS.get(key, ()):
+            path = resolver()
+            if path and os.path.exists(path):
+                path = os.path.normpath(path)
+                print(f"[HG] Found {key} at {path}")
+                return path
+
+    def invalidate(self, key=None):
+        if self.paths is None:
+            return
+        if key:
+            self.paths.pop(key, None)
+        else:
+            self.paths.clear()
+
+
+toolchain = Toolchain()
+
+
+#---
+#--- Returns the AssetsProcessor executable (see Toolchain) or nil if it can't be found.
+#---
+def find_assets_processor():
+    return toolchain.get("assets_processor")
+
+
+# texture preflight--------------------------------------------------------------------------------------------------------------------------------------------------------
+
+#---
+#--- Reads the dimensions, channels and bit depth of an image from its file header, without decoding the pixels.
+#---
+#--- @return table format, width, height, channels, bits (per channel) and alpha, or error.
+#---
+def read_texture_header(filepath):
+    try:
+        with open(filepath, "rb") as f:
+            data = f.read(32)
+            if data.startswith(b"\x89PNG\r\n\x1a\n"):
+                return read_png_header(f, data)
+            if data.startswith(b"\xff\xd8"):
+                return read_jpeg_header(f)
+            if data.startswith(b"BM"):
+                return read_bmp_header(data)
+            if data[:4] in (b"II*\x00", b"MM\x00*"):
+                return read_tiff_header(f, data)
+            if os.path.splitext(filepath)[1].lower() == ".tga":
+                return read_tga_header(data)
+    except (OSError, ValueError, IndexError, struct.error) as e:
+        return {"error": f"Unreadable image: {e}"}
+    return {"error": "Unsupported image format"}
+
+
+def read_png_header(f, data):
+    width, height, bits, color_type = struct.unpack(">IIBB", data[16:26])
+    channels = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}[color_type]
+    alpha = color_type in (4, 6)
+    if color_type == 3:
+        # palette images have alpha if there's a transparency chunk before the pixel data
+        f.seek(8)
+        while True:
+            length, chunk = struct.unpack(">I4s", f.read(8))
+            if chunk in (b"IDAT", b"IEND"):
+                break
+            if chunk == b"tRNS":
+                alpha, channels = True, 4
+                break
+            f.seek(length + 4, os.SEEK_CUR)
+        bits = 8
+    return {"format": "PNG", "width": width, "height": height, "channels": channels, "bits": bits, "alpha": alpha}
+
+
+def read_jpeg_header(f):
+    f.seek(2)
+    while True:
+        marker, length = struct.unpack(">2sH", f.read(4))
+        if marker[0] != 0xFF:
+            raise ValueError("invalid JPEG marker")
+        if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+            bits, height, width, channels = struct.unpack(">BHHB", f.read(6))
+            return {"format": "JPEG", "width": width, "height": height, "channels": channels, "bits": bits, "alpha": False}
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_bmp_header(data):
+    width, height, _, bpp = struct.unpack("<iiHH", data[18:30])
+    channels = 4 if bpp == 32 else 3 if bpp >= 16 else 1
+    return {"format": "BMP", "width": abs(width), "height": abs(height), "channels": channels, "bits": 8, "alpha": bpp == 32}
+
+
+def read_tga_header(data):
+    image_type = data[2]
+    width, height, bpp, descriptor = struct.unpack("<HHBB", data[12:18])
+    if image_type in (1, 9):
+        channels = 3
+    else:
+        channels = max(1, bpp // 8)
+    alpha_bits = descriptor & 0x0F
+    return {"format": "TGA", "width": width, "height": height, "channels": channels, "bits": 8, "alpha": alpha_bits > 0}
+
+
+def read_tiff_header(f, data):
+    order = "<" if data[:2] == b"II" else ">"
+    f.seek(struct.unpack(order + "I", data[4:8])[0])
+    count = struct.unpack(order + "H", f.read(2))[0]
+    tags = {}
+    for _ in range(count):
+        tag, type, value_count, value = struct.unpack(order + "HHI4s", f.read(12))
+        fmt = {3: "H", 4: "I"}.get(type)
+        if fmt and value_count * struct.calcsize(fmt) <= 4:
+            tags[tag] = struct.unpack(order + fmt * value_count, value[:value_count * struct.calcsize(fmt)])
+        elif fmt:
+            # values which don't fit in the entry are stored at an offset
+            position = f.tell()
+            f.seek(struct.unpack(order + "I", value)[0])
+            tags[tag] = struct.unpack(order + fmt * value_count, f.read(value_count * struct.calcsize(fmt)))
+            f.seek(position)
+    channels = tags.get(277, (1,))[0]
+    return {
+        "format": "TIFF",
+        "width": tags[256][0],
+        "height": tags[257][0],
+        "channels": channels,
+        "bits": max(tags.get(258, (8,))),
+        "alpha": channels in (2, 4) or 338 in tags,
+    }
+
+
+def is_power_of_two(value):
+    return value > 0 and value & (value - 1) == 0
+
+
+#---
+#--- Checks a texture header against what the AssetsProcessor expects for the given map.
+#---
+#--- @return table Error messages (the export can't continue) and warning messages.
+#---
+def check_texture_header(header, needs_alpha=False):
+    errors, warnings = [], []
+    if "error" in header:
+        errors.append(header["error"])
+        return errors, warnings
+    width, height = header["width"], header["height"]
+    if not is_power_of_two(width) or not is_power_of_two(height):
+        warnings.append(f"{width}x{height} is not a power of two")
+    if header["bits"] > 8:
+        warnings.append(f"{header['bits']}-bit source")
+    if needs_alpha and not header["alpha"]:
+        warnings.append("no alpha channel for the alpha blending mode")
+    return errors, warnings
+
+
+# texture formats the AssetsProcessor reads best; others (and high bit depth sources) can be pre-converted to PNG
+TEXTURE_PREFERRED_FORMATS = {"PNG", "TGA"}
+
+
+#---
+#--- Header information of texture files keyed by content hash, kept in HGETexturePreflight.json between sessions.
+#---
+#--- @class TexturePreflightCache
+#---
+class TexturePreflightCache:
+    FILENAME = "HGETexturePreflight.json"
+
+    def __init__(self):
+        self.headers = None
+        self.modified = False
+
+    def get_filepath(self):
+        return os.path.join(get_appdata_dirname(), self.FILENAME)
+
+    def load(self):
+        if self.headers is not None:
+            return
+        self.headers = {}
+        filepath = self.get_filepath()
+        if os.path.isfile(filepath):
+            try:
+                with open(filepath) as f:
+                    self.headers = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[HG] Ignoring unreadable texture preflight cache {filepath}: {e}")
+
+    def save(self):
+        if not self.modified:
+            return
+        filepath = self.get_filepath()
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, "w") as f:
+                json.dump(self.headers, f)
+            self.modified = False
+        except OSError as e:
+            print(f"[HG] Failed to write the texture preflight cache {filepath}: {e}")
+
+    def get(self, digest):
+        self.load()
+        return self.headers.get(digest)
+
+    def set(self, digest, header):
+        self.load()
+        self.headers[digest] = header
+        self.modified = True
+
+
+texture_preflight_cache = TexturePreflightCache()
+
+
+def preflight_texture(texture):
+    # runs in a worker thread: hashing and header parsing only touch the file
+    if not texture.exists:
+        return texture, None, {"error": "File not found"}
+    digest = texture.get_hash()
+    header = texture_preflight_cache.get(digest)
+    if header is None:
+        header = read_texture_header(texture.filepath)
+    return texture, digest, header
+
+
+#---
+#--- Checks the maps of the given materials in parallel and returns the problems found.
+#---
+#--- @param materials table The materials whose maps are checked.
+#--- @param max_workers number (optional) The number of worker threads.
+#--- @return table, table, table Errors and warnings ("<file>: <problem>" strings) and the header of each texture
+#--- keyed by normalised path.
+#---
+def preflight_textures(materials, max_workers=None):
+    textures = {}
+    needs_alpha = set()
+    for material in materials:
+        hgm_settings = material.hgm_settings
+        uses_alpha = (hgm_settings.alpha_blend_mode == "1" and hgm_settings.alpha_test_value > 0) or \
+            hgm_settings.alpha_blend_mode in ("2", "5")
+        for prop in MATERIAL_PROPERTIES:
+            image = prop.map and getattr(hgm_settings, prop.settings_name)
+            texture = image and texture_registry.get_image_texture(image)
+            if not texture:
+                continue
+            key = TextureRegistry.normalize_path(texture.filepath)
+            textures[key] = texture
+            if uses_alpha and prop.settings_name == "base_color":
+                needs_alpha.add(key)
+
+    texture_preflight_cache.load()
+    errors, warnings, headers = [], [], {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or min(32, os.cpu_count() or 1)) as executor:
+        for texture, digest, header in executor.map(preflight_texture, textures.values()):
+            key = TextureRegistry.normalize_path(texture.filepath)
+            if digest and "error" not in header:
+                texture_preflight_cache.set(digest, header)
+            headers[key] = header
+            texture_errors, texture_warnings = check_texture_header(header, key in needs_alpha)
+            errors.extend(f"{texture.filepath}: {error}" for error in texture_errors)
+            warnings.extend(f"{texture.filepath}: {warning}" for warning in texture_warnings)
+    texture_preflight_cache.save()
+    return errors, warnings, headers
+
+
+#---
+#--- Encodes scene linear RGB values (the alpha channel is left as it is) with the sRGB transfer function.
+#---
+#--- @param pixels table numpy array (pixels, 4) of RGBA floats; changed in place.
+#---
+def linear_to_srgb(pixels):
+    rgb = numpy.clip(pixels[:, :3], 0.0, 1.0)
+    pixels[:, :3] = numpy.where(rgb <= 0.0031308, rgb * 12.92, 1.055 * numpy.power(rgb, 1.0 / 2.4) - 0.055)
+    return pixels
+
+
+#---
+#--- Saves an 8-bit PNG copy of an image (in the export directory, named after the content hash) for sources the
+#--- AssetsProcessor doesn't read well; unchanged sources are converted only once.
+#--- 16-bit and float sources are loaded as scene linear float buffers, so their colour maps are encoded to sRGB
+#--- before being quantized; data maps (normals, roughness, ...) are written as they are.
+#---
+#--- @return string The path of the converted file.
+#---
+def convert_texture(image, texture):
+    dirname = os.path.join(get_fbx_dirname(), "ConvertedTextures")
+    filepath = os.path.join(dirname, f"{texture.get_hash()}.png")
+    if os.path.isfile(filepath):
+        return filepath
+    os.makedirs(dirname, exist_ok=True)
+    width, height = image.size
+    pixels = numpy.empty(width * height * 4, dtype=numpy.float32)
+    image.pixels.foreach_get(pixels)
+    colorspace = image.colorspace_settings.name
+    if image.is_float and not image.colorspace_settings.is_data:
+        linear_to_srgb(pixels.reshape(-1, 4))
+        colorspace = "sRGB"
+    converted = bpy.data.images.new(f"{image.name}.converted", width, height, alpha=True, float_buffer=False)
+    try:
+        converted.colorspace_settings.name = colorspace
+        converted.pixels.foreach_set(pixels)
+        converted.filepath_raw = filepath
+        converted.file_format = "PNG"
+        converted.save()
+    finally:
+        bpy.data.images.remove(converted)
+    print(f"[HG] Converted {texture.filepath} to {filepath}")
+    return filepath
+
+
+# texture atlases--------------------------------------------------------------------------------------------------------------------------------------------------------
+
+# largest atlas created by the export; materials which don't fit start a new atlas
+ATLAS_MAX_SIZE = 4096
+# pixels around each packed map, filled by extending its edges so mip-maps don't bleed neighbouring maps
+ATLAS_PADDING = 4
+# UVs may exceed [0, 1] by this much and still be considered non-tiling
+ATLAS_UV_TOLERANCE = 0.001
+
+
+def next_power_of_two(value):
+    size = 1
+    while size < value:
+        size *= 2
+    return size
+
+
+#---
+#--- Packs square cells with power of two sizes into a square atlas with shelf packing.
+#---
+#--- @param cells table (key, size) pairs sorted by descending size.
+#--- @param atlas_size number The size of the atlas.
+#--- @return table, table The placed (key, size, x, y) cells and the (key, size) cells which didn't fit.
+#---
+def pack_atlas_cells(cells, atlas_size):
+    placed, rest = [], []
+    x = y = shelf_height = 0
+    for key, size in cells:
+        if x + size > atlas_size:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if y + size > atlas_size or size > atlas_size:
+            rest.append((key, size))
+            continue
+        placed.append((key, size, x, y))
+        x += size
+        shelf_height = max(shelf_height, size)
+    return placed, rest
+
+
+#---
+#--- Splits the cells into as few atlases as possible, each one the smallest power of two (up to ATLAS_MAX_SIZE) fitting
+#--- its cells.
+#---
+#--- @return table (atlas size, placed cells) pairs.
+#---
+def layout_atlases(cells):
+    cells = sorted(cells, key=lambda cell: -cell[1])
+    atlases = []
+    while cells:
+        area = sum(size * size for _, size in cells)
+        atlas_size = min(ATLAS_MAX_SIZE, next_power_of_two(max(cells[0][1], int(area ** 0.5))))
+        placed, rest = pack_atlas_cells(cells, atlas_size)
+        while rest and atlas_size < ATLAS_MAX_SIZE:
+            atlas_size *= 2
+            placed, rest = pack_atlas_cells(cells, atlas_size)
+        if not placed:
+            break
+        atlases.append((atlas_size, placed))
+        cells = rest
+    return atlases
+
+
+#---
+#--- Returns the pixels of an image scaled to size x size as a (size, size, 4) RGBA float array.
+#---
+def read_image_pixels(image, size):
+    scaled = image
+    if tuple(image.size) != (size, size):
+        scaled = image.copy()
+        scaled.scale(size, size)
+    pixels = numpy.empty(size * size * 4, dtype=numpy.float32)
+    scaled.pixels.foreach_get(pixels)
+    if scaled != image:
+        bpy.data.images.remove(scaled)
+    return pixels.reshape(size, size, 4)
+
+
+#---
+#--- Returns the size of the atlas cell holding a map of the given size and its padding.
+#---
+def get_atlas_cell_size(map_size):
+    return next_power_of_two(map_size + 2 * ATLAS_PADDING)
+
+
+#---
+#--- Copies a map, scaled to map_size x map_size, into an atlas cell and extends its edges into the padding around it.
+#---
+#--- @param atlas_pixels table numpy array (atlas size, atlas size, 4) of the atlas.
+#--- @param x, y number The corner of the padded map in the atlas pixels.
+#---
+def blit_atlas_cell(atlas_pixels, image, map_size, x, y):
+    pad = ATLAS_PADDING
+    pixels = read_image_pixels(image, map_size)
+    padded_size = map_size + 2 * pad
+    atlas_pixels[y:y + padded_size, x:x + padded_size] = numpy.pad(pixels, ((pad, pad), (pad, pad), (0, 0)), mode="edge")
+
+
+#---
+#--- Returns the UV layer used by the textures of the mesh.
+#---
+def get_render_uv_layer(mesh):
+    for uv_layer in mesh.uv_layers:
+        if uv_layer.active_render:
+            return uv_layer
+    return mesh.uv_layers.active
+
+
+#---
+#--- Returns the UV coordinates of the mesh's texture UV layer (loops x 2 array) and the material slot of each loop.
+#---
+def get_loop_uvs(mesh):
+    uv_layer = get_render_uv_layer(mesh)
+    if not uv_layer:
+        return None, None
+    uvs = numpy.empty(len(mesh.loops) * 2, dtype=numpy.float32)
+    uv_layer.data.foreach_get("uv", uvs)
+    polygons = mesh.polygons
+    loop_totals = numpy.empty(len(polygons), dtype=numpy.int32)
+    material_indices = numpy.empty(len(polygons), dtype=numpy.int32)
+    polygons.foreach_get("loop_total", loop_totals)
+    polygons.foreach_get("material_index", material_indices)
+    loop_slots = numpy.repeat(material_indices, loop_totals)
+    return uvs.reshape(-1, 2), loop_slots
+
+
+#---
+#--- Represents a context manager packing the maps of the exported materials into shared texture atlases.
+#--- When entering the context, compatible materials (same non-map settings, same set of maps, maps up to
+#--- `max_map_size`, UVs not tiling, no UV animation) are grouped; the maps of each group are packed into atlas images
+#--- saved next to the .FBX and the meshes get temporary copies with remapped UVs using a temporary atlas material whose
+#--- *MapFile custom properties point to the atlases.
+#--- When exiting the context, the original meshes and materials are restored and the temporary data is removed.
+#---
+#--- @class AtlasExportContext
+#--- @param context table The Blender context to operate on.
+#--- @param enabled boolean If false the context does nothing.
+#--- @param max_map_size number The largest map which is packed.
+#---
+class AtlasExportContext:
+    MAP_PROPERTIES = [prop for prop in MATERIAL_PROPERTIES if prop.map]
+
+    def __init__(self, context, enabled=True, max_map_size=512):
+        self.context = context
+        self.enabled = enabled
+        self.max_map_size = max_map_size
+        self.old_meshes = []
+        self.old_materials = []
+        self.temp_meshes = []
+        self.temp_materials = []
+        self.temp_images = []
+        self.report = ""
+
+    def __enter__(self):
+        if self.enabled:
+            print("[HG] Packing texture atlases")
+            try:
+                self.__pack_atlases(self.context)
+            except:
+                self.__revert()
+                raise
+            if self.report:
+                print(f"[HG] {self.report}")
+        return self
+
+    def __exit__(self, ex_type, ex_value, ex_traceback):
+        self.__revert()
+
+    def __revert(self):
+        if self.old_meshes:
+            print("[HG] Reverting texture atlases")
+        for slot_owner, idx, material in reversed(self.old_materials):
+            slot_owner.material_slots[idx].material = material
+        for obj, mesh in self.old_meshes:
+            obj.data = mesh
+        bpy.data.batch_remove(self.temp_meshes + self.temp_materials + self.temp_images)
+        self.old_meshes, self.old_materials = [], []
+        self.temp_meshes, self.temp_materials, self.temp_images = [], [], []
+
+    def __get_objects(self, context):
+        index = SceneValidationIndex(context.scene)
+        for obj in context.scene.objects:
+            if obj.type == "MESH" and obj.hge_export and obj.hge_obj_settings.resolve_role() == "MESH" and obj.hge_obj_settings.is_valid(index):
+                yield obj
+
+    def __get_maps(self, material):
+        hgm_settings = material.hgm_settings
+        if hgm_settings.animation_time > 0:
+            return
+        maps = {}
+        for prop in self.MAP_PROPERTIES:
+            image = getattr(hgm_settings, prop.settings_name)
+            if not image:
+                continue
+            width, height = image.size
+            if not width or not height or max(width, height) > self.max_map_size:
+                return
+            maps[prop.settings_name] = image
+        return maps or None
+
+    def __get_group_key(self, material, maps):
+        map_ids = {prop.id for prop in self.MAP_PROPERTIES}
+        values = tuple((id, value) for id, value in MATERIAL_PROPERTIES_PLAN.get_values(material) if id not in map_ids)
+        return values, tuple(sorted(maps))
+
+    def __pack_atlases(self, context):
+        objects = list(self.__get_objects(context))
+
+        # materials with packable maps and the objects using them, minus the ones with tiling UVs
+        material_maps, material_users = {}, {}
+        rejected = set()
+        for obj in objects:
+            uvs, loop_slots = None, None
+            for idx, slot in enumerate(obj.material_slots):
+                material = slot.material
+                if not material or material.name in rejected:
+                    continue
+                if material.name not in material_maps:
+                    maps = self.__get_maps(material)
+                    if not maps:
+                        rejected.add(material.name)
+                        continue
+                    material_maps[material.name] = maps
+                if uvs is None:
+                    uvs, loop_slots = get_loop_uvs(obj.data)
+                if uvs is None or not self.__uvs_in_unit_square(uvs, loop_slots, idx):
+                    rejected.add(material.name)
+                    continue
+                material_users.setdefault(material.name, []).append((obj, idx))
+        for name in rejected:
+            material_maps.pop(name, None)
+            material_users.pop(name, None)
+
+        groups = {}
+        for name, maps in material_maps.items():
+            if name in material_users:
+                material = bpy.data.materials[name]
+                groups.setdefault(self.__get_group_key(material, maps), []).append(material)
+
+        atlas_idx = 0
+        packed_textures = atlas_textures = 0
+        remaps = {}
+        map_sizes = {}
+        for materials in groups.values():
+            if len(materials) < 2:
+                continue
+            cells = []
+            for material in materials:
+                maps = material_maps[material.name]
+                size = max(max(image.size) for image in maps.values())
+                map_sizes[material.name] = size
+                # power of two cells pack without gaps; the map keeps its size inside the padding
+                cells.append((material, get_atlas_cell_size(size)))
+            for atlas_size, placed in layout_atlases(cells):
+                if len(placed) < 2:
+                    continue
+                atlas_material = self.__create_atlas(atlas_idx, atlas_size, placed, material_maps, map_sizes)
+                atlas_idx += 1
+                atlas_textures += len(material_maps[placed[0][0].name])
+                for material, _, x, y in placed:
+                    packed_textures += len(material_maps[material.name])
+                    map_size = map_sizes[material.name]
+                    scale = map_size / atlas_size
+                    offset = ((x + ATLAS_PADDING) / atlas_size, 1.0 - (y + map_size + ATLAS_PADDING) / atlas_size)
+                    remaps[material.name] = (atlas_material, scale, offset)
+
+        self.__remap_objects(objects, material_users, remaps)
+        if atlas_idx:
+            self.report = (f"Texture atlases: {len(remaps)} materials packed into {atlas_idx} atlases, "
+                f"{packed_textures} -> {atlas_textures} textures")
+
+    def __uvs_in_unit_square(self, uvs, loop_slots, slot_idx):
+        slot_uvs = uvs[loop_slots == slot_idx]
+        return bool(((slot_uvs >= -ATLAS_UV_TOLERANCE) & (slot_uvs <= 1.0 + ATLAS_UV_TOLERANCE)).all())
+
+    def __create_atlas(self, atlas_idx, atlas_size, placed, material_maps, map_sizes):
+        base_name = os.path.splitext(os.path.basename(bpy.data.filepath))[0]
+        atlas_material = placed[0][0].copy()
+        atlas_material.name = f"{base_name}.atlas{atlas_idx}"
+        self.temp_materials.append(atlas_material)
+        for map_name in material_maps[placed[0][0].name]:
+            atlas_pixels = numpy.zeros((atlas_size, atlas_size, 4), dtype=numpy.float32)
+            for material, _, x, y in placed:
+                # cells are placed top-down, image rows go bottom-up
+                map_size = map_sizes[material.name]
+                blit_atlas_cell(atlas_pixels, material_maps[material.name][map_name], map_size, x,
+                    atlas_size - y - map_size - 2 * ATLAS_PADDING)
+            source = material_maps[placed[0][0].name][map_name]
+            atlas = bpy.data.images.new(f"{atlas_material.name}.{map_name}", atlas_size, atlas_size, alpha=True)
+            self.temp_images.append(atlas)
+            atlas.colorspace_settings.name = source.colorspace_settings.name
+            atlas.pixels.foreach_set(atlas_pixels.ravel())
+            atlas.filepath_raw = os.path.join(get_fbx_dirname(), f"{atlas.name}.png")
+            atlas.file_format = "PNG"
+            atlas.save()
+            print(f"[HG] Saved texture atlas {atlas.filepath_raw}")
+            setattr(atlas_material.hgm_settings, map_name, atlas)
+        MATERIAL_PROPERTIES_PLAN.stamp(atlas_material)
+        return atlas_material
+
+    def __remap_objects(self, objects, material_users, remaps):
+        slots_by_object = {}
+        for name, users in material_users.items():
+            if name in remaps:
+                for obj, idx in users:
+                    slots_by_object.setdefault(obj, []).append((idx, remaps[name]))
+        for obj, slots in slots_by_object.items():
+            mesh = obj.data.copy()
+            self.temp_meshes.append(mesh)
+            self.old_meshes.append((obj, obj.data))
+            obj.data = mesh
+            uvs, loop_slots = get_loop_uvs(mesh)
+            # per slot scale and offset (identity for the slots which aren't remapped), looked up for every loop
+            slot_count = max(len(obj.material_slots), int(loop_slots.max()) + 1 if len(loop_slots) else 0)
+            scales = numpy.ones(slot_count, dtype=numpy.float32)
+            offsets = numpy.zeros((slot_count, 2), dtype=numpy.float32)
+            for idx, (_, scale, offset) in slots:
+                scales[idx] = scale
+                offsets[idx] = offset
+            uvs = uvs * scales[loop_slots, None] + offsets[loop_slots]
+            get_render_uv_layer(mesh).data.foreach_set("uv", uvs.ravel())
+            for idx, (atlas_material, _, _) in slots:
+                slot = obj.material_slots[idx]
+                if slot.link == "OBJECT":
+                    self.old_materials.append((obj, idx, slot.material))
+                slot.material = atlas_material
+
+
+# export--------------------------------------------------------------------------------------------------------------------------------------------------------
+
+#---
+#--- Represents a property group for HGE animation exports.
+#--- This property group contains various properties related to the animation export, such as the animation name, armature name, property name, and whether the animation should be exported.
+#---
+#--- @class HGEAnimExportProperty
+#--- @field label string The animation name.
+#--- @field armature string The armature name.
+#--- @field property string The property name.
+#--- @field export boolean Whether the animation should be exported.
+class HGEAnimExportProperty(bpy.types.PropertyGroup):
+    label: bpy.props.StringProperty(name="Animation Name")
+    armature: bpy.props.StringProperty(name="Armature Name")
+    property: bpy.props.StringProperty(name="Property Name")
+    export: bpy.props.BoolProperty(
+        name="Export",
+        description="If this animation should be exported",
+        default=True)
+
+
+#---
+#--- Represents a property group for HGE mesh exports.
+#--- This property group contains various properties related to the mesh export, such as the mesh name, entity name, LOD, and whether the mesh should be exported.
+#---
+#--- @class HGEMeshExportProperty
+#--- @field label string The mesh name.
+#--- @field entity string The entity name.
+#--- @field mesh string The mesh name.
+#--- @field lod string The LOD.
+#--- @field export boolean Whether the mesh should be exported.
+#---
+#--- @function get_key()
+#--- Returns a unique key for this mesh export property.
+#---
+#--- @function matches_entity_name(entity_name)
+#--- Checks if this mesh export property matches the given entity name.
+#--- @param entity_name table The entity name to check against.
+#--- @return boolean True if the mesh export property matches the entity name, false otherwise.
+class HGEMeshExportProperty(bpy.types.PropertyGroup):
+    label: bpy.props.StringProperty(name="Mesh Name")
+    entity: bpy.props.StringProperty(name="Entity Name")
+    mesh: bpy.props.StringProperty(name="Mesh Name")
+    lod: bpy.props.StringProperty(name="LOD")
+    export: bpy.props.BoolProperty(
+        name="Export",
+        description="If this mesh should be exported",
+        default=True)
+
+    def get_key(self):
+        return f"{self.entity}:{self.mesh}:{self.lod}"
+
+    def matches_entity_name(self, entity_name):
+        return (
+            self.entity == entity_name.name and
+            self.mesh == entity_name.mesh and
+            self.lod == entity_name.lod)
+
+
+#---
+#--- Represents a context manager for exporting animations.
 #--- When entering the context, it clips the scene animation to the specified start and end frames.
 #--- When exiting the context, it reverts the scene animation to the original start and end frames.
 #---
@@ -1827,10 +3383,258 @@ class AnimExportContext:
         self.scene.frame_end = self.old_frame_end        
 
 
+#---
+#--- Selects the keys of a curve which are needed to reproduce it with linear interpolation within a tolerance
+#--- (Ramer-Douglas-Peucker on the value error at the given frames).
+#---
+#--- @param frames table numpy array of the frames (ascending).
+#--- @param values table numpy array of the curve values at the frames.
+#--- @param tolerance number The largest allowed difference between the original and the reduced curve.
+#--- @param keep table (optional) numpy boolean array of keys which must be kept.
+#--- @return table numpy boolean array of the kept keys.
+#---
+def reduce_curve_keys(frames, values, tolerance, keep=None):
+    count = len(frames)
+    mask = numpy.zeros(count, dtype=bool) if keep is None else keep.copy()
+    if count <= 2:
+        mask[:] = True
+        return mask
+    mask[0] = mask[-1] = True
+    anchors = numpy.flatnonzero(mask)
+    stack = list(zip(anchors[:-1], anchors[1:]))
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        t = (frames[first + 1:last] - frames[first]) / (frames[last] - frames[first])
+        lerp = values[first] + t * (values[last] - values[first])
+        errors = numpy.abs(values[first + 1:last] - lerp)
+        worst = int(numpy.argmax(errors))
+        if errors[worst] > tolerance:
+            split = first + 1 + worst
+            mask[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return mask
+
+
+#---
+#--- Represents a context manager reducing the keys of the exported animations during the export process.
+#--- When entering the context, the action of every armature with an exported animation is replaced by a copy whose
+#--- pose bone curves keep only the keys needed to stay within the location, rotation and scale tolerances (the kept
+#--- keys are linearly interpolated, so the FBX writer's curve simplification drops the baked frames in between).
+#--- Curves whose motion between the keys isn't linear (Bezier, stepped) are checked against their values sampled at
+#--- every baked frame instead of only at their keys, and are kept as they are when the reduction saves no keys.
+#--- Keys on the first and last frame of every marked animation are always kept.
+#--- When exiting the context, the original actions are restored and the copies removed.
+#---
+#--- @class AnimReductionExportContext
+#--- @param context table The Blender context to operate on.
+#--- @param enabled boolean If false the context does nothing.
+#--- @param location_tolerance number Largest location error in scene units.
+#--- @param rotation_tolerance number Largest rotation error in radians (quaternion components use the same value).
+#--- @param scale_tolerance number Largest scale error.
+#---
+class AnimReductionExportContext:
+    BONE_PATH_PREFIX = "pose.bones["
+
+    def __init__(self, context, enabled=True, location_tolerance=0.001, rotation_tolerance=math.radians(0.1), scale_tolerance=0.001):
+        self.context = context
+        self.enabled = enabled
+        self.tolerances = {
+            "location": location_tolerance,
+            "rotation_quaternion": rotation_tolerance,
+            "rotation_euler": rotation_tolerance,
+            "rotation_axis_angle": rotation_tolerance,
+            "scale": scale_tolerance,
+        }
+        self.actions = []
+        self.copies = {}
+        self.report = ""
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        print("[HG] Reducing the keys of the exported animations")
+        armature_anims = {}
+        for marked_anim in self.context.scene.hge_settings.marked_animations:
+            armature = marked_anim.armature_object
+            if armature and armature.get(marked_anim.get_export_prop_name()):
+                armature_anims.setdefault(armature, []).append(marked_anim)
+
+        counts = []
+        try:
+            for armature, marked_anims in armature_anims.items():
+                action = armature.animation_data and armature.animation_data.action
+                if not action:
+                    continue
+                ranges = [(marked_anim.frame_start, marked_anim.frame_end) for marked_anim in marked_anims]
+                if action.name not in self.copies:
+                    self.copies[action.name] = self.__reduce_action(action, ranges)
+                reduced, keys = self.copies[action.name]
+                self.actions.append((armature, action))
+                armature.animation_data.action = reduced
+                for marked_anim, (frame_start, frame_end) in zip(marked_anims, ranges):
+                    before = after = 0
+                    for frames, mask in keys:
+                        in_range = (frames >= frame_start) & (frames <= frame_end)
+                        before += int(numpy.count_nonzero(in_range))
+                        after += int(numpy.count_nonzero(in_range & mask))
+                    counts.append((marked_anim.get_animation_name().state, before, after))
+        except:
+            self.__exit__(None, None, None)
+            raise
+
+        if counts:
+            self.report = "Animation keys: " + ", ".join(
+                f"{state} {before} -> {after} ({before / max(after, 1):.1f}x)" for state, before, after in counts)
+            print(f"[HG] {self.report}")
+        return self
+
+    def __exit__(self, ex_type, ex_value, ex_traceback):
+        if not self.enabled:
+            return
+        print("[HG] Restoring the original animations")
+        for armature, action in self.actions:
+            armature.animation_data.action = action
+        for reduced, _ in self.copies.values():
+            bpy.data.actions.remove(reduced)
+        self.actions = []
+        self.copies = {}
+
+    def __reduce_action(self, action, ranges):
+        reduced = action.copy()
+        reduced.name = f"{action.name}.hge_reduced"
+        # registered right away so that a failure below doesn't leak the copy
+        self.copies[action.name] = (reduced, [])
+        keys = []
+        for fcurve in list(reduced.fcurves):
+            tolerance = self.tolerances.get(fcurve.data_path.rpartition(".")[2])
+            count = len(fcurve.keyframe_points)
+            if not fcurve.data_path.startswith(self.BONE_PATH_PREFIX) or tolerance is None or count <= 2 or fcurve.modifiers:
+                continue
+            co = numpy.empty(count * 2, dtype=numpy.float32)
+            fcurve.keyframe_points.foreach_get("co", co)
+            key_frames = co[0::2].astype(numpy.float64)
+            frames, values = key_frames, co[1::2].astype(numpy.float64)
+            if not self.__is_baked_linear(fcurve, frames):
+                frames = self.__get_baked_frames(frames)
+                values = numpy.fromiter((fcurve.evaluate(frame) for frame in frames), dtype=numpy.float64, count=len(frames))
+            keep = numpy.zeros(len(frames), dtype=bool)
+            for frame_start, frame_end in ranges:
+                keep |= (frames == frame_start) | (frames == frame_end)
+            mask = reduce_curve_keys(frames, values, tolerance, keep)
+            if numpy.count_nonzero(mask) >= count:
+                keys.append((key_frames, numpy.ones(count, dtype=bool)))
+                continue
+            keys.append((frames, mask))
+            points = numpy.column_stack((frames, values))[mask].astype(numpy.float32)
+            self.__rebuild_fcurve(reduced, fcurve, points)
+        return reduced, keys
+
+    # the baked frames of the curve lie on the lines between its keys: all keys are linear or there is a key on every frame
+    def __is_baked_linear(self, fcurve, frames):
+        if numpy.all(numpy.diff(frames) == 1) and numpy.all(frames == numpy.round(frames)):
+            return True
+        return all(point.interpolation == "LINEAR" for point in list(fcurve.keyframe_points)[:-1])
+
+    # every whole frame between the first and the last key, plus the keys at both ends
+    def __get_baked_frames(self, frames):
+        whole_frames = numpy.arange(math.ceil(frames[0]), math.floor(frames[-1]) + 1, dtype=numpy.float64)
+        return numpy.union1d(whole_frames, frames[[0, -1]])
+
+    def __rebuild_fcurve(self, action, fcurve, points):
+        data_path, index, extrapolation = fcurve.data_path, fcurve.array_index, fcurve.extrapolation
+        group = fcurve.group.name if fcurve.group else ""
+        action.fcurves.remove(fcurve)
+        fcurve = action.fcurves.new(data_path, index=index, action_group=group)
+        fcurve.extrapolation = extrapolation
+        fcurve.keyframe_points.add(len(points))
+        fcurve.keyframe_points.foreach_set("co", points.ravel())
+        for point in fcurve.keyframe_points:
+            point.interpolation = "LINEAR"
+        fcurve.update()
+
+
+#---
+#--- Represents a context manager exporting each marked animation as its own FBX take.
+#--- When entering the context, the existing NLA tracks are muted and every marked animation selected for export gets a
+#--- temporary NLA track with a single strip named after the animation property (hga:entity:state:mesh) which plays only
+#--- the animation's frame range of the armature's action. With bake_anim_use_nla_strips the FBX writer bakes one take
+#--- per strip over that range instead of one timeline covering all animations.
+#--- When exiting the context, the temporary tracks are removed and the mute flags restored.
+#---
+#--- @class AnimTakesExportContext
+#--- @param context table The Blender context to operate on.
+#--- @param enabled boolean If false the context does nothing.
+#--- @param export_anims boolean If false no takes are created (and the existing NLA tracks are still muted).
+#---
+class AnimTakesExportContext:
+    TRACK_PREFIX = "hge_take"
+
+    def __init__(self, context, enabled=True, export_anims=True):
+        self.context = context
+        self.enabled = enabled
+        self.export_anims = export_anims
+        self.tracks = []
+        self.muted = []
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        print("[HG] Creating an animation take for each exported animation")
+        for object in self.context.scene.objects:
+            animation_data = object.animation_data
+            if not animation_data:
+                continue
+            for track in animation_data.nla_tracks:
+                if not track.mute:
+                    self.muted.append(track)
+                    track.mute = True
+        try:
+            for marked_anim in self.context.scene.hge_settings.marked_animations:
+                armature = marked_anim.armature_object
+                if not self.export_anims or not armature or not armature.get(marked_anim.get_export_prop_name()):
+                    continue
+                self.__add_take(armature, marked_anim)
+        except:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def __exit__(self, ex_type, ex_value, ex_traceback):
+        if not self.enabled:
+            return
+        print("[HG] Removing the animation takes")
+        for object, track in self.tracks:
+            object.animation_data.nla_tracks.remove(track)
+        for track in self.muted:
+            track.mute = False
+        self.tracks = []
+        self.muted = []
+
+    def __add_take(self, armature, marked_anim):
+        action = armature.animation_data and armature.animation_data.action
+        if not action:
+            raise ExportError(f"'{armature.name}' has no action to export the animation '{marked_anim.prop_name}' from.")
+        track = armature.animation_data.nla_tracks.new()
+        track.name = f"{self.TRACK_PREFIX}.{len(self.tracks)}"
+        self.tracks.append((armature, track))
+        strip = track.strips.new(marked_anim.prop_name, marked_anim.frame_start, action)
+        strip.action_frame_start = marked_anim.frame_start
+        strip.action_frame_end = marked_anim.frame_end
+        # recalculates the strip bounds from the new action range
+        strip.scale = 1.0
+        strip.repeat = 1.0
+        strip.mute = False
+
+
 #---
 #--- Represents a context manager for managing object names during the export process.
-#--- When entering the context, it assigns special names to objects in the scene.
-#--- When exiting the context, it reverts the object names back to their original names.
+#--- When entering the context, it computes the special names of the objects in the scene and makes the FBX writer
+#--- use them instead of the Blender names. The objects themselves are never renamed.
+#--- The later export stages read and change the export names through get_export_name and set_export_name.
+#--- When exiting the context, it restores the FBX writer.
 #---
 #--- @class ObjectNamesExportContext
 #--- @param context table The Blender context to operate on.
@@ -1838,84 +3642,218 @@ class AnimExportContext:
 class ObjectNamesExportContext:
     def __init__(self, context):
         self.context = context
+        self.old_names = {}
 
     def __enter__(self):
         print("[HG] Assigning special names")
-        self.old_names = self.__assign_hge_names(self.context)
+        self.hge_names = self.__get_hge_names(self.context)
+        self.patched = self.__patch_fbx_writer(self.hge_names)
+        if not self.patched:
+            # the FBX writer has no name hook to patch - fall back to renaming the objects
+            print("[HG] FBX writer name hook not found, renaming objects")
+            self.old_names = self.__rename_objects(self.hge_names)
+        return self
 
     def __exit__(self, ex_type, ex_value, ex_traceback):
         print("[HG] Reverting special names")
-        self.__revert_hge_names(self.old_names)
-
-    def __assign_hge_names(self, context):
-        old_names = {}
-        new_names = set()
+        if self.patched:
+            for module, get_name in self.patched:
+                module.get_blenderID_name = get_name
+        else:
+            self.__rename_objects(self.old_names)
+
+    def get_export_name(self, object):
+        if self.patched:
+            return self.hge_names.get(object.name, object.name)
+        return object.name
+
+    def set_export_name(self, object, name):
+        if self.patched:
+            # the FBX writer hook reads the same map
+            self.hge_names[object.name] = name
+        elif object.name != name:
+            old_name = self.old_names.pop(object.name, object.name)
+            object.name = name
+            self.old_names[object.name] = old_name
+
+    def __get_hge_names(self, context):
+        # maps Blender object name to export name; collisions get numbered comments (name^1, name^2, ...)
+        hge_names = {}
+        objects = []
+        used_names = set()
         for object in context.scene.objects:
-            old_names[object] = object.name
             new_name = object.hge_obj_settings.get_hge_name()
-            if not new_name:
-                continue
-            idx = 1
-            while new_name in new_names:
+            if new_name:
+                objects.append((object, new_name))
+            else:
+                used_names.add(object.name)
+        next_idx = {}
+        for object, new_name in objects:
+            base_name = new_name
+            idx = next_idx.get(base_name, 1)
+            while new_name in used_names:
                 new_name = object.hge_obj_settings.get_hge_name(idx)
                 idx = idx + 1
-            new_names.add(new_name)
-            # print(f"[HG] Rename '{object.name}' to '{new_name}'")
-            object.name = new_name
+            next_idx[base_name] = idx
+            used_names.add(new_name)
+            hge_names[object.name] = new_name
+        return hge_names
+
+    def __patch_fbx_writer(self, hge_names):
+        try:
+            from io_scene_fbx import export_fbx_bin, fbx_utils
+        except ImportError:
+            return
+        get_name = getattr(fbx_utils, "get_blenderID_name", None)
+        if not get_name:
+            return
+
+        def get_blenderID_name(bid):
+            if isinstance(bid, bpy.types.Object):
+                return hge_names.get(bid.name, bid.name)
+            return get_name(bid)
+
+        patched = []
+        for module in (fbx_utils, export_fbx_bin):
+            if getattr(module, "get_blenderID_name", None) is get_name:
+                module.get_blenderID_name = get_blenderID_name
+                patched.append((module, get_name))
+        return patched
+
+    def __rename_objects(self, names):
+        old_names = {}
+        for object in self.context.scene.objects:
+            new_name = names.get(object.name)
+            if new_name:
+                old_names[new_name] = object.name
+                object.name = new_name
         return old_names
 
-    def __revert_hge_names(self, old_names):
-        for object, old_name in old_names.items():
-            object.name = old_name
+
+#---
+#--- Represents a context manager merging duplicate materials of the exported meshes during the export process.
+#--- When entering the context, materials with the same MATERIAL_PROPERTIES values (settings and map paths) are
+#--- fingerprinted and every slot of an exported mesh is pointed to the first material of its group.
+#--- When exiting the context, the original slot materials are restored.
+#---
+#--- @class MaterialDedupExportContext
+#--- @param context table The Blender context to operate on.
+#--- @param enabled boolean If false the context does nothing.
+#---
+class MaterialDedupExportContext:
+    def __init__(self, context, enabled=True):
+        self.context = context
+        self.enabled = enabled
+        self.old_materials = []
+        self.summary = None
+
+    def __enter__(self):
+        if self.enabled:
+            print("[HG] Merging duplicate materials")
+            self.summary = self.__merge_materials(self.context)
+            print(f"[HG] {self.get_report()}")
+        return self
+
+    def __exit__(self, ex_type, ex_value, ex_traceback):
+        if self.old_materials:
+            print("[HG] Restoring merged materials")
+        for slot_owner, idx, material in reversed(self.old_materials):
+            slot_owner.material_slots[idx].material = material
+        self.old_materials = []
+
+    def get_report(self):
+        if not self.summary:
+            return ""
+        materials_before, materials_after, draw_calls_before, draw_calls_after = self.summary
+        return (f"Material merge: {materials_before} -> {materials_after} materials, "
+            f"{draw_calls_before} -> {draw_calls_after} draw calls")
+
+    def __get_objects(self, context):
+        index = SceneValidationIndex(context.scene)
+        for obj in context.scene.objects:
+            if obj.type == "MESH" and obj.hge_export and obj.hge_obj_settings.resolve_role() == "MESH" and obj.hge_obj_settings.is_valid(index):
+                yield obj
+
+    def __get_used_slots(self, obj):
+        polygons = obj.data.polygons
+        material_indices = array.array("i", [0]) * len(polygons)
+        polygons.foreach_get("material_index", material_indices)
+        return set(material_indices)
+
+    def __merge_materials(self, context):
+        fingerprints = {}
+        canonical = {}
+        draw_calls_before = draw_calls_after = 0
+        for obj in self.__get_objects(context):
+            used_slots = self.__get_used_slots(obj)
+            materials_before, materials_after = set(), set()
+            for idx, slot in enumerate(obj.material_slots):
+                material = slot.material
+                if not material:
+                    continue
+                if material.name not in canonical:
+                    fingerprint = tuple(MATERIAL_PROPERTIES_PLAN.get_values(material))
+                    canonical[material.name] = fingerprints.setdefault(fingerprint, material)
+                merged = canonical[material.name]
+                if idx in used_slots:
+                    materials_before.add(material.name)
+                    materials_after.add(merged.name)
+                if merged != material:
+                    self.old_materials.append((obj, idx, material))
+                    slot.material = merged
+            draw_calls_before += len(materials_before)
+            draw_calls_after += len(materials_after)
+        return len(canonical), len(fingerprints), draw_calls_before, draw_calls_after
 
 
 #---
 #--- Represents a context manager for managing waypoints during the export process.
 #--- When entering the context, it sets up waypoints for objects in the scene.
 #--- When exiting the context, it reverts the waypoints back to their original state.
+#--- The spot paths are found and named by their export names; hiding a path only changes its export name.
 #---
 #--- @class WaypointsExportContext
 #--- @param context table The Blender context to operate on.
+#--- @param names ObjectNamesExportContext The export names of the objects.
 #---
 class WaypointsExportContext:
-    def __init__(self, context):
+    def __init__(self, context, names):
         self.context = context
+        self.names = names
 
     def __enter__(self):
         print("[HG] Setting up waypoints for export")
-        self.waypoints, self.attaches = self.__setup_waypoints(self.context)
+        self.waypoints = self.__setup_waypoints(self.context)
 
     def __exit__(self, ex_type, ex_value, ex_traceback):
         print("[HG] Reverting waypoints")
-        try:
-            self.__revert_waypoints(self.waypoints)
-        except:
-            raise
-        finally:
-            self.__revert_names(self.attaches)
+        self.__revert_waypoints(self.waypoints)
 
     def __setup_waypoints(self, context):
-        waypoints, attaches = [], []
+        waypoints = []
+        waypoint_names = {}
+        used_names = {self.names.get_export_name(object) for object in context.scene.objects}
         chains_count = 0
         for parent in context.scene.objects:
             if parent.type != "MESH":
                 continue
 
             for child in parent.children:
-                if not is_attach(child.name) or child.type != "CURVE":
+                if child.type != "CURVE":
+                    continue
+                child_name = self.names.get_export_name(child)
+                if not is_attach(child_name):
                     continue
 
-                new_waypoints = self.__setup_one_waypoint(parent, child, chains_count)
+                new_waypoints = self.__setup_one_waypoint(context, parent, child, child_name, chains_count, waypoint_names, used_names)
                 chains_count += 1
-                child.name = child.name[1:]
-                # print(f"[HG] Hide attach name: {child.name}")
-                attaches.append(child)
+                # the path itself is exported as a plain object, only its waypoints are spots
+                self.names.set_export_name(child, child_name[1:])
                 waypoints.extend(new_waypoints)
 
-        return waypoints, attaches
+        return waypoints
 
-    def __setup_one_waypoint(self, parent, child, chain_idx):
-        child_name = child.name
+    def __setup_one_waypoint(self, context, parent, child, child_name, chain_idx, waypoint_names, used_names):
         regex_result = re.match(r"^-(.*?)(\.\d+)?$", child_name, flags=0)
         if regex_result:
             child_name = f"-{regex_result.group(1)}"
@@ -1923,22 +3861,33 @@ class WaypointsExportContext:
             child_name += str(child["attach"])
         child_name_pieces = child_name.split(";")
 
+        # curve space -> parent space, computed once per curve; the waypoints are parented without inverse matrix
+        transform = parent.matrix_world.inverted() @ child.matrix_world
+        collection = context.scene.collection
+        objects = bpy.data.objects
+        waypoint_name = f"{child_name_pieces[0]};"
         new_waypoints = []
-        # print(f"[HG] Selected object type: {child.type}")
-        # print(f"[HG] Splines count: {len(child.data.splines)}")
         for spline in child.data.splines:
-            # print(f"[HG] Points count: {len(spline.points)}")
-            for i in range(len(spline.points)):
-                point = spline.points[i]
-                # print(f"[HG] Coordinates: {point.co}")
-                transform = child.matrix_world * parent.matrix_world.inverted()
-                location = transform @ point.co
-                bpy.ops.object.empty_add(location=location.xyz)
-                waypoint_obj = bpy.data.objects[bpy.context.active_object.name]
+            points = spline.points
+            coords = array.array("f", bytes(4 * 4 * len(points)))
+            points.foreach_get("co", coords)
+            for i in range(len(points)):
+                # the same names Blender would assign (name, name.001, ...), skipping the taken export names
+                name_idx = waypoint_names.get(waypoint_name, 0)
+                name = f"{waypoint_name}.{name_idx:03}" if name_idx else waypoint_name
+                while name in used_names:
+                    name_idx += 1
+                    name = f"{waypoint_name}.{name_idx:03}"
+                waypoint_names[waypoint_name] = name_idx + 1
+                used_names.add(name)
+                waypoint_obj = objects.new(name, None)
+                collection.objects.link(waypoint_obj)
+                # Blender renames the object if the name is taken, the export name stays
+                self.names.set_export_name(waypoint_obj, name)
                 waypoint_obj.parent = parent
+                waypoint_obj.location = transform @ mathutils.Vector(coords[i * 4:i * 4 + 3])
                 new_waypoints.append(waypoint_obj)
 
-                waypoint_obj.name = f"{child_name_pieces[0]};"
                 additional_name = ""
                 if i == 0:
                     for j in range(1, len(child_name_pieces)):
@@ -1949,14 +3898,732 @@ class WaypointsExportContext:
         return new_waypoints
 
     def __revert_waypoints(self, waypoints):
-        bpy.ops.object.select_all(action="DESELECT")
-        for waypoint_obj in waypoints:
-            waypoint_obj.select_set(True)
-        bpy.ops.object.delete()
-    
-    def __revert_names(seff, attaches):
-        for attach in attaches:
-            attach.name = f"-{attach.name}"
+        bpy.data.batch_remove(waypoints)
+
+
+
+# incremental export--------------------------------------------------------------------------------------------------------------------------------------------------------
+
+def hash_values(hasher, *values):
+    hasher.update(repr(values).encode())
+
+
+#---
+#--- Feeds a whole attribute of a Blender collection into a hash (e.g. all vertex coordinates) with one foreach_get.
+#---
+#--- @param typecode string The array typecode of the attribute ("f" for floats, "i" for ints, "b" for booleans).
+#--- @param size number The number of values per item (e.g. 3 for vertex coordinates).
+#---
+def hash_foreach(hasher, collection, attr, typecode, size=1):
+    values = array.array(typecode, [0]) * (len(collection) * size)
+    collection.foreach_get(attr, values)
+    hasher.update(values.tobytes())
+
+
+def hash_mesh(hasher, mesh):
+    hash_foreach(hasher, mesh.vertices, "co", "f", 3)
+    hash_foreach(hasher, mesh.loops, "vertex_index", "i")
+    hash_foreach(hasher, mesh.polygons, "loop_total", "i")
+    hash_foreach(hasher, mesh.polygons, "material_index", "i")
+    hash_foreach(hasher, mesh.polygons, "use_smooth", "b")
+    for uv_layer in mesh.uv_layers:
+        hash_values(hasher, uv_layer.name)
+        hash_foreach(hasher, uv_layer.data, "uv", "f", 2)
+    for color_layer in mesh.vertex_colors:
+        hash_values(hasher, color_layer.name)
+        hash_foreach(hasher, color_layer.data, "color", "f", 4)
+    for vertex in mesh.vertices:
+        hash_values(hasher, [(group.group, group.weight) for group in vertex.groups])
+
+
+def hash_material(hasher, material):
+    hgm_settings = material.hgm_settings
+    hash_values(hasher, material.name)
+    for prop in MATERIAL_PROPERTIES:
+        if not prop.settings_name:
+            continue
+        settings_value = getattr(hgm_settings, prop.settings_name)
+        if prop.map:
+            texture = settings_value and texture_registry.get_image_texture(settings_value)
+            if texture:
+                hash_values(hasher, prop.id, texture.filepath, texture.get_hash())
+            else:
+                hash_values(hasher, prop.id, "", "")
+        else:
+            hash_values(hasher, prop.id, settings_value)
+
+
+#---
+#--- Hashes an exported object together with its children (spots, surfaces, paths): names, transforms, the evaluated
+#--- mesh data, vertex groups and materials.
+#---
+def hash_object(hasher, obj, depsgraph, material_digests):
+    hge_obj_settings = obj.hge_obj_settings
+    hash_values(hasher, obj.type, hge_obj_settings.get_hge_name(), obj.parent_bone, [tuple(row) for row in obj.matrix_local])
+    if obj.type == "MESH":
+        hash_values(hasher, [group.name for group in obj.vertex_groups])
+        eval_obj = obj.evaluated_get(depsgraph)
+        hash_mesh(hasher, eval_obj.to_mesh())
+        eval_obj.to_mesh_clear()
+        for slot in obj.material_slots:
+            material = slot.material
+            if not material:
+                continue
+            if material not in material_digests:
+                material_hasher = hashlib.sha1()
+                hash_material(material_hasher, material)
+                material_digests[material] = material_hasher.hexdigest()
+            hasher.update(material_digests[material].encode())
+    elif obj.type == "CURVE":
+        for spline in obj.data.splines:
+            hash_foreach(hasher, spline.points, "co", "f", 4)
+    for child in sorted(obj.children, key=lambda child: child.name):
+        hash_object(hasher, child, depsgraph, material_digests)
+
+
+def hash_armature_rest(hasher, armature):
+    hash_values(hasher, armature.name, [tuple(row) for row in armature.matrix_world])
+    hash_foreach(hasher, armature.data.bones, "head_local", "f", 3)
+    hash_foreach(hasher, armature.data.bones, "tail_local", "f", 3)
+
+
+def hash_action(hasher, action):
+    for fcurve in action.fcurves:
+        hash_values(hasher, fcurve.data_path, fcurve.array_index)
+        hash_foreach(hasher, fcurve.keyframe_points, "co", "f", 2)
+        hash_foreach(hasher, fcurve.keyframe_points, "handle_left", "f", 2)
+        hash_foreach(hasher, fcurve.keyframe_points, "handle_right", "f", 2)
+
+
+#---
+#--- Returns the manifest key of an entity part: one per mesh LOD and one per marked animation, matching what the
+#--- export dialog lets the user select.
+#---
+def get_mesh_part_key(mesh, lod):
+    return f"mesh:{mesh}:{lod}"
+
+
+def get_anim_part_key(prop):
+    return f"anim:{prop}"
+
+
+#---
+#--- Computes a content hash for every part of every entity in the scene.
+#---
+#--- A mesh part (entity mesh LOD) covers the mesh data of its valid mesh objects and their children, the HGE settings
+#--- of their materials (including the contents of the referenced textures) and the rest pose of the skinning
+#--- armatures. An animation part covers the marked animation and the keyframes of its armature's action.
+#---
+#--- @param context bpy.types.Context The Blender context.
+#--- @return table Maps entity name to a table of part key -> hex digest.
+#---
+def compute_entity_hashes(context):
+    depsgraph = context.evaluated_depsgraph_get()
+    index = SceneValidationIndex(context.scene)
+    hashers = {}
+    material_digests = {}
+    action_digests = {}
+
+    def get_hasher(entity, part):
+        hasher = hashers.get((entity, part))
+        if not hasher:
+            hasher = hashlib.sha1()
+            hash_values(hasher, CM_VERSION, SETTINGS["game"], SETTINGS["appid"])
+            hashers[(entity, part)] = hasher
+        return hasher
+
+    mesh_objects = []
+    for obj in context.scene.objects:
+        hge_obj_settings = obj.hge_obj_settings
+        if obj.type == "MESH" and hge_obj_settings.resolve_role() == "MESH" and hge_obj_settings.is_valid(index):
+            mesh_objects.append(obj)
+    mesh_objects.sort(key=lambda obj: obj.hge_obj_settings.get_hge_name())
+    for obj in mesh_objects:
+        hge_obj_settings = obj.hge_obj_settings
+        hasher = get_hasher(hge_obj_settings.entity, get_mesh_part_key(hge_obj_settings.mesh, hge_obj_settings.lod))
+        hash_object(hasher, obj, depsgraph, material_digests)
+        armature = hge_obj_settings.find_parent_with_role("ARMATURE")
+        if armature:
+            hash_armature_rest(hasher, armature)
+
+    for obj in context.scene.objects:
+        if obj.type != "ARMATURE":
+            continue
+        action = obj.animation_data and obj.animation_data.action
+        if action and action.name not in action_digests:
+            action_hasher = hashlib.sha1()
+            hash_action(action_hasher, action)
+            action_digests[action.name] = action_hasher.hexdigest()
+        for animation in animation_table.get(obj):
+            hasher = get_hasher(animation.name.entity, get_anim_part_key(animation.prop))
+            # the export flag (hgx:...) is the dialog's selection, not content
+            hash_values(hasher, obj.name, animation.prop, animation.value, action_digests.get(action.name) if action else None)
+
+    entity_hashes = {}
+    for (entity, part), hasher in hashers.items():
+        entity_hashes.setdefault(entity, {})[part] = hasher.hexdigest()
+    return entity_hashes
+
+
+def get_manifest_filepath():
+    filename = os.path.basename(bpy.data.filepath)
+    return os.path.join(get_fbx_dirname(), os.path.splitext(filename)[0] + ".manifest.json")
+
+
+#---
+#--- The entity part hashes of the last successful export of a .blend file, stored next to its .FBX file.
+#---
+#--- Only the parts actually exported are recorded, so a partial export (meshes or animations only, some LODs
+#--- unticked) leaves the other parts of the entity dirty. Parts which no longer exist are dropped once all current
+#--- parts of the entity are up to date.
+#---
+#--- @class ExportManifest
+#--- @param filepath string The manifest file.
+#---
+class ExportManifest:
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.entities = {}
+        if os.path.isfile(filepath):
+            try:
+                with open(filepath) as f:
+                    self.entities = json.load(f).get("entities", {})
+            except (OSError, ValueError) as e:
+                print(f"[HG] Ignoring unreadable export manifest {filepath}: {e}")
+
+    def get_dirty_parts(self, entity_hashes):
+        dirty_parts = {}
+        for entity, parts in entity_hashes.items():
+            recorded = self.entities.get(entity)
+            if not isinstance(recorded, dict):
+                dirty = set(parts)
+            else:
+                dirty = {part for part, digest in parts.items() if recorded.get(part) != digest}
+                if not dirty and recorded.keys() != parts.keys():
+                    # a part was removed; the whole entity has to be exported again
+                    dirty = set(parts)
+            if dirty:
+                dirty_parts[entity] = dirty
+        return dirty_parts
+
+    def update(self, entity_hashes, exported_parts):
+        for entity, parts in exported_parts.items():
+            current = entity_hashes.get(entity)
+            if not current:
+                continue
+            recorded = self.entities.get(entity)
+            recorded = dict(recorded) if isinstance(recorded, dict) else {}
+            for part in parts:
+                if part in current:
+                    recorded[part] = current[part]
+            if all(recorded.get(part) == digest for part, digest in current.items()):
+                recorded = dict(current)
+            self.entities[entity] = recorded
+
+    def save(self):
+        with open(self.filepath, "w") as f:
+            json.dump({"entities": self.entities}, f, indent=1, sort_keys=True)
+
+
+#---
+#--- Raised by the export pipeline when a step of the export fails.
+#---
+class ExportError(Exception):
+    pass
+
+
+#---
+#--- Returns the directory where the exported .FBX files are written, creating it if needed.
+#---
+def get_fbx_dirname():
+    fbx_dirname = os.path.join(get_appdata_dirname(), "ModAssets", "FBX")
+    os.makedirs(fbx_dirname, exist_ok=True)
+    return fbx_dirname
+
+
+#---
+#--- Returns the name of the .FBX file exported from the current .blend file.
+#---
+#--- @param group_key string (optional) The entity (or entity:mesh:lod) key of a split export.
+#--- @return string The absolute path of the .FBX file.
+#---
+def get_fbx_filepath(group_key=None):
+    filename = os.path.splitext(os.path.basename(bpy.data.filepath))[0]
+    if group_key:
+        filename = f"{filename}.{group_key.replace(':', '_')}"
+    return os.path.join(get_fbx_dirname(), filename + ".fbx")
+
+
+#---
+#--- Returns the objects that need to be exported together with the given one: its parents (origin, armature)
+#--- and, optionally, all of its descendants (spots, surfaces, waypoints).
+#---
+def get_export_hierarchy(obj, descendants=True):
+    objects = set()
+    parent = obj.parent
+    while parent:
+        objects.add(parent)
+        parent = parent.parent
+    stack = [obj]
+    while stack:
+        child = stack.pop()
+        objects.add(child)
+        if descendants:
+            stack.extend(child.children)
+    return objects
+
+
+#---
+#--- Runs the AssetsProcessor on one or more .FBX files without blocking the caller.
+#---
+#--- Up to `max_workers` processes run at the same time. Their output is collected by reader threads and can be
+#--- queried at any time; `update` must be called periodically (e.g. from a modal timer) to start the pending files and
+#--- collect exit codes. Any executable accepting the same arguments (e.g. a stub set in HGEAP) can stand in for the
+#--- AssetsProcessor.
+#---
+#--- @class AssetsProcessorRun
+#--- @param assets_processor string The AssetsProcessor executable.
+#--- @param fbx_filepaths table The .FBX files to process.
+#--- @param max_workers number How many processes may run at the same time.
+#---
+class AssetsProcessorRun:
+    OUTPUT_LINES = 200
+
+    def __init__(self, assets_processor, fbx_filepaths, max_workers=1):
+        self.assets_processor = assets_processor
+        self.fbx_filepaths = list(fbx_filepaths)
+        self.pending = list(fbx_filepaths)
+        self.max_workers = max(1, max_workers)
+        self.processes = {}
+        self.return_codes = {}
+        self.output = collections.deque(maxlen=self.OUTPUT_LINES)
+        self.output_lock = threading.Lock()
+        self.cancelled = False
+
+    def get_cmd(self, fbx_filepath):
+        return [self.assets_processor, fbx_filepath, "-globalappdirs"]
+
+    def start(self):
+        while self.pending and len(self.processes) < self.max_workers:
+            fbx_filepath = self.pending.pop(0)
+            cmd = self.get_cmd(fbx_filepath)
+            print(f"[HG] AssetProcessor cmd line: {subprocess.list2cmdline(cmd)}")
+            try:
+                process = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    universal_newlines=True,
+                    errors="replace")
+            except OSError as e:
+                self.add_output(fbx_filepath, str(e))
+                self.return_codes[fbx_filepath] = -1
+                continue
+            self.processes[fbx_filepath] = process
+            reader = threading.Thread(target=self.read_output, args=(fbx_filepath, process), daemon=True)
+            reader.start()
+
+    def read_output(self, fbx_filepath, process):
+        for line in process.stdout:
+            self.add_output(fbx_filepath, line.rstrip())
+        process.stdout.close()
+
+    def add_output(self, fbx_filepath, line):
+        line = f"{os.path.basename(fbx_filepath)}: {line}"
+        with self.output_lock:
+            self.output.append(line)
+        print(f"[HG] {line}")
+
+    def get_output(self):
+        with self.output_lock:
+            return list(self.output)
+
+    def update(self):
+        for fbx_filepath, process in list(self.processes.items()):
+            return_code = process.poll()
+            if return_code is not None:
+                del self.processes[fbx_filepath]
+                self.return_codes[fbx_filepath] = return_code
+        if not self.cancelled:
+            self.start()
+        return self.is_finished()
+
+    def cancel(self):
+        self.cancelled = True
+        self.pending.clear()
+        for process in self.processes.values():
+            process.terminate()
+
+    def is_finished(self):
+        return not self.pending and not self.processes
+
+    def get_progress(self):
+        return len(self.return_codes), len(self.fbx_filepaths)
+
+    def get_error(self):
+        if self.cancelled:
+            return "The AssetsProcessor was cancelled."
+        failed = [f"{os.path.basename(path)} ({code})" for path, code in self.return_codes.items() if code != 0]
+        if failed:
+            return f"The AssetsProcessor failed for {', '.join(failed)}."
+
+
+#---
+#--- The export steps shared by the export dialog and the headless batch export.
+#---
+#--- Prepares the materials, exports the scene to an .FBX file named after the .blend file and runs the AssetsProcessor
+#--- on it. It doesn't use any UI context (windows, workspaces), so it can run in background mode (`blender -b`).
+#---
+#--- @class ExportPipeline
+#--- @param export_meshes boolean Whether to export meshes.
+#--- @param export_anims boolean Whether to export animations.
+#--- @param use_selection boolean Whether to export only the selected entities.
+#--- @param incremental boolean Whether only the entities changed since the last export are preselected.
+#--- @param split_mode string "OFF" for a single .FBX, "ENTITY" for one .FBX per entity or "LOD" for one per entity mesh LOD.
+#--- @param processor_workers number How many AssetsProcessor instances may run at the same time for split exports.
+#--- @param check_textures boolean Whether the maps of the exported materials are checked before the export.
+#--- @param convert_textures boolean Whether maps the AssetsProcessor doesn't read well are exported as 8-bit PNG copies.
+#--- @param anim_takes boolean Whether each marked animation is baked into its own FBX take over its own frame range
+#--- instead of one timeline covering all animations.
+#--- @param reduce_anims boolean Whether the keys of the exported animations are reduced within anim_tolerances.
+#--- @param anim_tolerances table The largest location, rotation (radians) and scale errors of the reduced animations.
+#--- @param check_root_motion boolean Whether the root motion of the exported animations is analyzed before the export.
+#---
+class ExportPipeline:
+    def __init__(self, export_meshes=True, export_anims=True, use_selection=False, incremental=False,
+            split_mode="OFF", processor_workers=None, dedup_materials=False, atlas_maps=False, atlas_max_map_size=512,
+            check_textures=True, convert_textures=False, anim_takes=False, reduce_anims=False,
+            anim_tolerances=(0.001, math.radians(0.1), 0.001), check_root_motion=False):
+        self.export_meshes = export_meshes
+        self.export_anims = export_anims
+        self.use_selection = use_selection
+        self.incremental = incremental
+        self.split_mode = split_mode
+        self.processor_workers = processor_workers or os.cpu_count() or 1
+        self.dedup_materials = dedup_materials
+        self.dedup_report = ""
+        self.atlas_maps = atlas_maps
+        self.atlas_max_map_size = atlas_max_map_size
+        self.atlas_report = ""
+        self.check_textures = check_textures
+        self.convert_textures = convert_textures
+        self.texture_report = ""
+        self.texture_warnings = []
+        self.anim_takes = anim_takes
+        self.reduce_anims = reduce_anims
+        self.anim_tolerances = anim_tolerances
+        self.anim_report = ""
+        self.check_root_motion = check_root_motion
+        self.root_motion_warnings = []
+
+    def find_dirty_parts(self, context):
+        # maps entity to the keys of its parts changed since the last export (see get_mesh_part_key/get_anim_part_key)
+        manifest = ExportManifest(get_manifest_filepath())
+        return manifest.get_dirty_parts(compute_entity_hashes(context))
+
+    def mark_scene_defaults(self, context):
+        # what the export dialog would preselect: every valid mesh and every marked animation
+        # (unless animations are skipped altogether) or only the changed ones for incremental exports
+        dirty_parts = self.find_dirty_parts(context) if self.incremental else None
+        index = SceneValidationIndex(context.scene)
+        for obj in context.scene.objects:
+            if obj.type == "MESH":
+                hge_obj_settings = obj.hge_obj_settings
+                if hge_obj_settings.resolve_role() != "MESH" or not hge_obj_settings.is_valid(index):
+                    continue
+                part = get_mesh_part_key(hge_obj_settings.mesh, hge_obj_settings.lod)
+                obj.hge_export = dirty_parts is None or part in dirty_parts.get(hge_obj_settings.entity, ())
+            elif obj.type == "ARMATURE":
+                for animation in animation_table.get(obj):
+                    if not self.export_anims:
+                        obj[animation.export_prop] = False
+                    elif dirty_parts is not None:
+                        part = get_anim_part_key(animation.prop)
+                        obj[animation.export_prop] = part in dirty_parts.get(animation.name.entity, ())
+                    elif not prop_exists(obj, animation.export_prop):
+                        obj[animation.export_prop] = True
+        return dirty_parts
+
+    def get_exported_parts(self, context):
+        parts = {}
+        index = SceneValidationIndex(context.scene)
+        for obj in context.scene.objects:
+            hge_obj_settings = obj.hge_obj_settings
+            if obj.type == "MESH" and obj.hge_export:
+                if hge_obj_settings.resolve_role() == "MESH" and hge_obj_settings.is_valid(index):
+                    part = get_mesh_part_key(hge_obj_settings.mesh, hge_obj_settings.lod)
+                    parts.setdefault(hge_obj_settings.entity, set()).add(part)
+            elif obj.type == "ARMATURE" and self.export_anims:
+                for animation in animation_table.get(obj):
+                    if animation.is_exported(obj):
+                        parts.setdefault(animation.name.entity, set()).add(get_anim_part_key(animation.prop))
+        return parts
+
+    def update_manifest(self):
+        # called once the AssetsProcessor succeeded for everything exported by run()
+        manifest = ExportManifest(self.manifest_filepath)
+        manifest.update(self.entity_hashes, self.exported_parts)
+        manifest.save()
+
+    def run(self, context, process_assets=True):
+        # hashed before anything gets renamed or generated for the export
+        self.entity_hashes = compute_entity_hashes(context)
+        self.manifest_filepath = get_manifest_filepath()
+
+        # basically copies everything from HGEMaterialSettings
+        # into custom properties according to MATERIAL_PROPERTIES
+        self.prepare_materials()
+
+        # report bad root motion before it gets baked and processed
+        if self.check_root_motion and self.export_anims:
+            self.analyze_root_motion(context)
+
+        # shrink animation range (takes are baked over their own ranges, so the scene range is kept)
+        scene = context.scene
+        if self.anim_takes:
+            anim_start, anim_end = scene.frame_start, scene.frame_end
+        else:
+            anim_start, anim_end = self.find_anim_range(context)
+        with AnimExportContext(scene, anim_start, anim_end), \
+                AnimReductionExportContext(context, self.reduce_anims and self.export_anims, *self.anim_tolerances) as reduction, \
+                AnimTakesExportContext(context, self.anim_takes, self.export_anims):
+            self.anim_report = reduction.report
+            with ObjectNamesExportContext(context) as names:
+                # splines represent sequences of spots; each point of a spline
+                # gets converted into a separate spot (the original object is hidden)
+                with WaypointsExportContext(context, names):
+                    self.mark_objects_for_export(context)
+
+                    # optionally point duplicate materials to a single one
+                    with MaterialDedupExportContext(context, self.dedup_materials) as dedup, \
+                            AtlasExportContext(context, self.atlas_maps, self.atlas_max_map_size) as atlas:
+                        self.dedup_report = dedup.get_report()
+                        self.atlas_report = atlas.report
+
+                        # export .FBX
+                        if self.split_mode == "OFF":
+                            fbx_filepath = get_fbx_filepath()
+                            if "FINISHED" not in self.export_fbx(fbx_filepath):
+                                raise ExportError(".FBX export failed.")
+                            fbx_filepaths = [fbx_filepath]
+                        else:
+                            fbx_filepaths = self.export_split_fbx(context)
+        self.exported_parts = self.get_exported_parts(context)
+
+        # otherwise the caller processes the files (e.g. with HGEProcessAssetsOp) and updates the manifest
+        if process_assets:
+            self.process_assets(fbx_filepaths)
+            self.update_manifest()
+        return fbx_filepaths
+
+    def get_export_groups(self, context):
+        # maps group key (entity or entity:mesh:lod) to the objects needed to export it
+        groups = {}
+        index = SceneValidationIndex(context.scene)
+        for obj in context.scene.objects:
+            hge_obj_settings = obj.hge_obj_settings
+            if obj.type == "MESH":
+                if not obj.hge_export or hge_obj_settings.resolve_role() != "MESH" or not hge_obj_settings.is_valid(index):
+                    continue
+                if self.split_mode == "LOD":
+                    # same format as in HGEMeshExportProperty.get_key()
+                    key = f"{hge_obj_settings.entity}:{hge_obj_settings.mesh}:{hge_obj_settings.lod}"
+                else:
+                    key = hge_obj_settings.entity
+                groups.setdefault(key, set()).update(get_export_hierarchy(obj))
+            elif obj.type == "ARMATURE":
+                for animation in animation_table.get(obj):
+                    if not animation.is_exported(obj):
+                        continue
+                    if self.split_mode == "LOD":
+                        # animations go with the first LOD of their mesh
+                        key = f"{animation.name.entity}:{animation.name.mesh}:1"
+                    else:
+                        key = animation.name.entity
+                    groups.setdefault(key, set()).update(get_export_hierarchy(obj, descendants=False))
+        return groups
+
+    def export_split_fbx(self, context):
+        groups = self.get_export_groups(context)
+        if not groups:
+            raise ExportError("There is nothing to export.")
+        view_layer = context.view_layer
+        old_selection = {obj for obj in view_layer.objects if obj.select_get()}
+        fbx_filepaths = []
+        try:
+            for key, objects in sorted(groups.items()):
+                for obj in view_layer.objects:
+                    obj.select_set(obj in objects and (not self.use_selection or obj in old_selection))
+                fbx_filepath = get_fbx_filepath(key)
+                if "FINISHED" not in self.export_fbx(fbx_filepath, use_selection=True):
+                    raise ExportError(f".FBX export of {key} failed.")
+                fbx_filepaths.append(fbx_filepath)
+        finally:
+            for obj in view_layer.objects:
+                obj.select_set(obj in old_selection)
+        return fbx_filepaths
+
+    def create_assets_processor_run(self, fbx_filepaths):
+        print(f"[HG] Starting AssetsProcessor...")
+        assets_processor = find_assets_processor()
+        if not assets_processor:
+            raise ExportError("Failed to invoke the AssetsProcessor.")
+        return AssetsProcessorRun(assets_processor, fbx_filepaths, self.processor_workers)
+
+    def process_assets(self, fbx_filepaths):
+        # blocks until all AssetsProcessor instances exit
+        run = self.create_assets_processor_run(fbx_filepaths)
+        run.start()
+        while not run.update():
+            time.sleep(0.1)
+        error = run.get_error()
+        if error:
+            raise ExportError(error)
+
+    def analyze_root_motion(self, context):
+        self.root_motion_warnings = []
+        for report in analyze_marked_animations(context.scene, exported_only=True):
+            print(f"[HG] Root motion of '{report.state}': {report.get_summary()}")
+            for warning in report.warnings:
+                print(f"[HG]   {warning}")
+                self.root_motion_warnings.append(f"{report.state}: {warning}")
+
+    def find_anim_range(self, context):
+        scene = context.scene
+        min_frame = scene.frame_start
+        max_frame = scene.frame_end
+        # the marked animations, plus the legacy ones stored on bones (indexed once per armature)
+        ranges = [
+            (marked_anim.frame_start, marked_anim.frame_end)
+            for marked_anim in scene.hge_settings.marked_animations
+            if marked_anim.armature_object
+        ]
+        for object in scene.objects:
+            if object.type == "ARMATURE":
+                ranges.extend(animation_table.get_bone_ranges(object))
+        for frame_start, frame_end in ranges:
+            if min_frame > frame_start:
+                min_frame = frame_start
+            if max_frame < frame_end:
+                max_frame = frame_end
+
+        return min_frame, max_frame
+
+    def mark_objects_for_export(self, context):
+        index = SceneValidationIndex(context.scene)
+        for object in context.scene.objects:
+            if object.hge_obj_settings.resolve_role() != "MESH" or not object.hge_obj_settings.is_valid(index):
+                continue
+            # hge_export holds the choice made in the export dialog (or by mark_scene_defaults)
+            object.hge_export = self.export_meshes and object.hge_export and (not self.use_selection or object.select_get())
+
+    def prepare_materials(self):
+        index = SceneValidationIndex(bpy.context.scene)
+        materials = {}
+        for obj in bpy.data.objects:
+            if obj.type != "MESH":
+                continue
+            if obj.hge_obj_settings.resolve_role() != "MESH" or not obj.hge_obj_settings.is_valid(index):
+                continue
+
+            # There is no materials for this mesh.
+            # Add a default material.
+            if not any(slot.material for slot in obj.material_slots):
+                new_material = bpy.data.materials.new(name="Material")
+                obj.data.materials.append(new_material)
+
+            # materials shared by many objects are prepared once
+            for slot in obj.material_slots:
+                if slot.material:
+                    materials.setdefault(slot.material.name, slot.material)
+
+        # the maps are checked (and converted) before their paths get stamped
+        self.preflight_materials(list(materials.values()))
+
+        for material in materials.values():
+            self.prepare_one_material(material)
+
+    def preflight_materials(self, materials):
+        texture_registry.export_paths.clear()
+        if not self.check_textures and not self.convert_textures:
+            return
+        errors, warnings, headers = preflight_textures(materials)
+        self.texture_warnings = warnings
+        for warning in warnings:
+            print(f"[HG] Texture warning: {warning}")
+        if errors:
+            raise ExportError("Texture preflight failed:\n" + "\n".join(errors))
+
+        converted = 0
+        if self.convert_textures:
+            images = {}
+            for material in materials:
+                for prop in MATERIAL_PROPERTIES:
+                    image = prop.map and getattr(material.hgm_settings, prop.settings_name)
+                    if image:
+                        images[image.name] = image
+            for image in images.values():
+                texture = texture_registry.get_image_texture(image)
+                if not texture:
+                    continue
+                key = TextureRegistry.normalize_path(texture.filepath)
+                header = headers[key]
+                if header["format"] in TEXTURE_PREFERRED_FORMATS and header["bits"] <= 8:
+                    continue
+                texture_registry.export_paths[key] = convert_texture(image, texture)
+                converted += 1
+        self.texture_report = f"Checked {len(headers)} textures: {len(warnings)} warnings, {converted} converted"
+
+    def prepare_one_material(self, material):
+        # copy settings into the material's custom properties
+        written = add_material_props(material)
+        print(f"[HG] Prepared material '{material.name}' ({written} properties changed)")
+
+    def export_fbx(self, fbx_filepath, use_selection=None):
+        print(f"[HG] Exporting FBX to {fbx_filepath}...")
+        if os.path.exists(fbx_filepath):
+            os.remove(fbx_filepath)
+        if use_selection is None:
+            use_selection = self.use_selection
+        if use_selection:
+            print(f"[HG] Exporting only selected entities...")
+        return bpy.ops.export_scene.fbx(
+            axis_forward="Y",
+            axis_up="Z",
+            filepath=fbx_filepath,
+            use_selection=use_selection,
+            # use_active_collection=False,
+            # global_scale=1.0,
+            # apply_unit_scale=True,
+            apply_scale_options="FBX_SCALE_ALL",
+            # use_space_transform=True,
+            # bake_space_transform=False,
+            object_types={"ARMATURE", "OTHER", "MESH", "EMPTY"},
+            # use_mesh_modifiers=True,
+            # use_mesh_modifiers_render=True,
+            # mesh_smooth_type="OFF",
+            # use_subsurf=False,
+            # use_mesh_edges=False,
+            # use_tspace=False,
+            use_custom_props=True,
+            add_leaf_bones=False,
+            # primary_bone_axis="Y",
+            # secondary_bone_axis="X",
+            # use_armature_deform_only=False,
+            # armature_nodetype="NULL",
+            # bake_anim=True,
+            # bake_anim_use_all_bones=True,
+            bake_anim_use_nla_strips=self.anim_takes,
+            bake_anim_use_all_actions=False,
+            # bake_anim_force_startend_keying=True,
+            # bake_anim_step=1.0,
+            # bake_anim_simplify_factor=1.0,
+            # path_mode="AUTO",
+            # embed_textures=False,
+            batch_mode="OFF",
+            use_batch_own_dir=False,
+            # use_metadata=True,
+        )
 
 
 
@@ -1974,6 +4641,7 @@ class HGEExportOp(bpy.types.Operator):
         bl_idname (str): The identifier name for the operator.
         bl_label (str): The label displayed for the operator in the user interface.
         bl_description (str): The description of the operator displayed in the user interface.
+        use_selection (bool): Flag indicating whether to export only selected entities.
         export_meshes (bool): Flag indicating whether to export meshes.
         export_anims (bool): Flag indicating whether to export animations.
         animations (CollectionProperty): Collection of metadata for each exported animation.
@@ -1984,21 +4652,17 @@ class HGEExportOp(bpy.types.Operator):
         invoke(self, context, event): Invoked when the operator is called.
         __register_mesh(self, obj): Registers a mesh for export.
         __register_armature(self, obj): Registers an armature for export.
-        execute(self, context): Executes the export operation.
-        __find_anim_range(self, context): Finds the animation range for the export.
-        __mark_objects_for_export(self, context): Marks objects for export based on settings.
-        __prepare_materials(self): Prepares materials for export.
-        __prepare_one_material(self, material): Prepares a single material for export.
+        execute(self, context): Applies the dialog choices and runs the ExportPipeline.
     """
 class HGEExportOp(bpy.types.Operator):
     bl_idname = "hge.export_dialog"
     bl_label = "Export entity"
     bl_description = "Opens export dialog box with list of items and settings"
 
-    #use_selection: bpy.props.BoolProperty(
-    #    name="Export only selected",
-    #    description="Only entities in the current selection will be exported",
-    #    default=True)
+    use_selection: bpy.props.BoolProperty(
+        name="Export only selected",
+        description="Only entities in the current selection will be exported",
+        default=False)
     export_meshes: bpy.props.BoolProperty(
         name="Export meshes",
         description="Opens a dialog box with list of eligable meshes\nand settings for their export.\nYou can deselect unwanterd meshes for export",
@@ -2007,6 +4671,71 @@ class HGEExportOp(bpy.types.Operator):
         name="Export animations",
         description="Opens a dialog box with list of eligable animations\nand settings for their export.\nYou can deselect unwanterd animations for export",
         default=True)
+    split_mode: bpy.props.EnumProperty(
+        name="Split .FBX",
+        description="Export a separate .FBX file for each entity (or entity LOD) and process them in parallel",
+        items=[
+            ("OFF", "Single file", "Export everything in one .FBX file"),
+            ("ENTITY", "Per entity", "Export one .FBX file per entity"),
+            ("LOD", "Per LOD", "Export one .FBX file per entity mesh LOD"),
+        ], default="OFF")
+    processor_workers: bpy.props.IntProperty(
+        name="AssetsProcessor instances",
+        description="How many AssetsProcessor instances may run at the same time when the .FBX is split",
+        min=1,
+        default=max(1, (os.cpu_count() or 1) // 2))
+    dedup_materials: bpy.props.BoolProperty(
+        name="Merge duplicate materials",
+        description="Export materials with identical HGE settings and maps as a single material",
+        default=False)
+    atlas_maps: bpy.props.BoolProperty(
+        name="Pack texture atlases",
+        description="Pack the small maps of compatible materials into shared texture atlases",
+        default=False)
+    atlas_max_map_size: bpy.props.IntProperty(
+        name="Largest packed map",
+        description="Maps larger than this are not packed into atlases",
+        min=16,
+        max=2048,
+        default=512)
+    check_textures: bpy.props.BoolProperty(
+        name="Check textures",
+        description="Check the size, channels and bit depth of the maps before the export",
+        default=True)
+    convert_textures: bpy.props.BoolProperty(
+        name="Convert textures",
+        description="Export maps in formats the AssetsProcessor doesn't read well (or with more than 8 bits) as PNG copies",
+        default=False)
+    anim_takes: bpy.props.BoolProperty(
+        name="One take per animation",
+        description="Bake each marked animation into its own take over its own frame range instead of one timeline covering all animations",
+        default=False)
+    reduce_anims: bpy.props.BoolProperty(
+        name="Reduce animation keys",
+        description="Remove the animation keys which can be interpolated from their neighbours within the tolerances",
+        default=False)
+    anim_location_tolerance: bpy.props.FloatProperty(
+        name="Location tolerance",
+        description="Largest location error of the reduced animations",
+        min=0.0,
+        precision=4,
+        default=0.001)
+    anim_rotation_tolerance: bpy.props.FloatProperty(
+        name="Rotation tolerance",
+        description="Largest rotation error of the reduced animations",
+        subtype="ANGLE",
+        min=0.0,
+        default=math.radians(0.1))
+    anim_scale_tolerance: bpy.props.FloatProperty(
+        name="Scale tolerance",
+        description="Largest scale error of the reduced animations",
+        min=0.0,
+        precision=4,
+        default=0.001)
+    check_root_motion: bpy.props.BoolProperty(
+        name="Check root motion",
+        description="Analyze the root displacement, speed, foot sliding and loops of the exported animations before the export",
+        default=False)
 
     animations: bpy.props.CollectionProperty(
         name="Animations",
@@ -2017,11 +4746,16 @@ class HGEExportOp(bpy.types.Operator):
         description="Metadata for each exported mesh",
         type=HGEMeshExportProperty)
     entity_mesh_objects: dict
+    validation_index: SceneValidationIndex
+    dirty_parts: dict
 
     def invoke(self, context, event):
         self.animations.clear()
         self.entity_meshes.clear()
         self.entity_mesh_objects = dict()
+        self.validation_index = SceneValidationIndex(context.scene)
+        # only the mesh LODs and animations changed since the last export are preselected
+        self.dirty_parts = ExportPipeline().find_dirty_parts(context)
         # http://blender.stackexchange.com/questions/1779/dynamic-creation-of-properties-for-export-script
         # add properties for each mesh & animation
         scene = context.scene
@@ -2036,31 +4770,30 @@ class HGEExportOp(bpy.types.Operator):
 
     def __register_mesh(self, obj):
         hge_obj_settings = obj.hge_obj_settings
-        if hge_obj_settings.resolve_role() != "MESH" or not hge_obj_settings.is_valid():
+        if hge_obj_settings.resolve_role() != "MESH" or not hge_obj_settings.is_valid(self.validation_index):
             return
             
         entity_name = hge_obj_settings.get_mesh_name_helper()
 
         ent_mesh = None
         for ent_mesh2 in self.entity_meshes:
-            pass
-
+            if ent_mesh2.matches_entity_name(entity_name):
+                ent_mesh = ent_mesh2
+                break
 
         if not ent_mesh:
-            pass
-
-
-        # same format as in HGEMeshExportProperty.get_key()
-        entity_mesh_key = f"{entity_name.name}:{entity_name.mesh}:{entity_name.lod}"
-        if entity_mesh_key not in self.entity_mesh_objects:
-            pass
-
-        self.entity_mesh_objects[entity_mesh_key].add(obj)
-        entity_metadata = self.entity_meshes.add()
-        entity_metadata.label = entity_label
-        entity_metadata.entity = entity_name.name
-        entity_metadata.mesh = entity_name.mesh
-        entity_metadata.lod = str(entity_name.lod)
+            entity_label = "; ".join([
+                f"Entity:{entity_name.name}",
+                f"Mesh:{entity_name.mesh}",
+                f"LOD:{entity_name.lod}",
+            ])
+            entity_metadata = self.entity_meshes.add()
+            entity_metadata.label = entity_label
+            entity_metadata.entity = entity_name.name
+            entity_metadata.mesh = entity_name.mesh
+            entity_metadata.lod = str(entity_name.lod)
+            part = get_mesh_part_key(entity_name.mesh, entity_name.lod)
+            entity_metadata.export = part in self.dirty_parts.get(entity_name.name, ())
 
         # same format as in HGEMeshExportProperty.get_key()
         entity_mesh_key = f"{entity_name.name}:{entity_name.mesh}:{entity_name.lod}"
@@ -2069,34 +4802,27 @@ class HGEExportOp(bpy.types.Operator):
         self.entity_mesh_objects[entity_mesh_key].add(obj)
 
     def __register_armature(self, obj):
-        for key, val in obj.items():
-            anim_name = AnimationName.parse(key)
-            if not anim_name:
-                continue
-
-            export_anim_name = anim_name.get_export_name()
+        for animation in animation_table.get(obj):
+            anim_name = animation.name
+            export_anim_name = animation.export_prop
             if not prop_exists(obj, export_anim_name):
                 obj[export_anim_name] = True
 
-            # prop value format: root_motion:frame_start:frame_end:loop_anim:compensate_z
-            prop_tokens = val.split(":")
-            root_motion = prop_tokens[0]
-            frame_start = prop_tokens[1]
-            frame_end = prop_tokens[2]
             anim_label = "; ".join([
                 f"State:{anim_name.state}",
                 f"Entity:{anim_name.entity}",
                 f"Mesh:{anim_name.mesh}"
-                f"Motion:{root_motion}",
-                f"Start:{frame_start}",
-                f"End:{frame_end}",
+                f"Motion:{animation.root_motion}",
+                f"Start:{animation.frame_start}",
+                f"End:{animation.frame_end}",
             ])
 
             anim_metadata = self.animations.add()
             anim_metadata.label = anim_label
             anim_metadata.armature = obj.name
             anim_metadata.property = export_anim_name
-            anim_metadata.export = obj[export_anim_name]
+            part = get_anim_part_key(animation.prop)
+            anim_metadata.export = bool(obj[export_anim_name]) and part in self.dirty_parts.get(anim_name.entity, ())
 
     def execute(self, context):
         print(f"[HG] Beginning export...")
@@ -2120,202 +4846,48 @@ class HGEExportOp(bpy.types.Operator):
                 obj.hge_export = entity_metadata.export
         self.entity_meshes.clear()
 
-        # basically copies everything from HGEMaterialSettings
-        # into custom properties according to MATERIAL_PROPERTIES
-        self.__prepare_materials()
-
-        # shrink animation range
-        scene = context.scene
-        anim_start, anim_end = self.__find_anim_range(context)
-        with AnimExportContext(scene, anim_start, anim_end):
-            with ObjectNamesExportContext(context):
-                # splines represent sequences of spots; each point of a spline
-                # gets converted into a separate spot (the original object is hidden)
-                with WaypointsExportContext(context):
-                    self.__mark_objects_for_export(context)
-
-                    # export .FBX
-                    filename = os.path.basename(bpy.data.filepath)
-                    fbx_dirname = os.path.join(os.getenv("APPDATA"), SETTINGS["appid"], "ModAssets", "FBX")
-                    if not os.path.isdir(fbx_dirname):
-                        os.makedirs(fbx_dirname)
-                    fbx_filename = os.path.splitext(filename)[0] + ".fbx"
-                    fbx_filepath = os.path.join(fbx_dirname, fbx_filename)
-                    export_result = self.__export_fbx(fbx_filepath)
-
-        if "FINISHED" not in export_result:
-            self.report({"ERROR"}, ".FBX export failed.")
-            print(f"[HG] Export failed!")
-            return {"CANCELLED"}
-
-        ap_success = self.__run_assets_processor(fbx_filepath)
-        if not ap_success:
-            self.report({"ERROR"}, "Failed to invoke the AssetsProcessor.")
+        pipeline = ExportPipeline(
+            export_meshes=self.export_meshes,
+            export_anims=self.export_anims,
+            use_selection=self.use_selection,
+            split_mode=self.split_mode,
+            processor_workers=self.processor_workers,
+            dedup_materials=self.dedup_materials,
+            atlas_maps=self.atlas_maps,
+            atlas_max_map_size=self.atlas_max_map_size,
+            check_textures=self.check_textures,
+            convert_textures=self.convert_textures,
+            anim_takes=self.anim_takes,
+            reduce_anims=self.reduce_anims,
+            anim_tolerances=(self.anim_location_tolerance, self.anim_rotation_tolerance, self.anim_scale_tolerance),
+            check_root_motion=self.check_root_motion)
+        try:
+            fbx_filepaths = pipeline.run(context, process_assets=False)
+            for warning in pipeline.texture_warnings + pipeline.root_motion_warnings:
+                self.report({"WARNING"}, warning)
+            if pipeline.texture_report:
+                self.report({"INFO"}, pipeline.texture_report)
+            if pipeline.anim_report:
+                self.report({"INFO"}, pipeline.anim_report)
+            if pipeline.dedup_report:
+                self.report({"INFO"}, pipeline.dedup_report)
+            if pipeline.atlas_report:
+                self.report({"INFO"}, pipeline.atlas_report)
+            run = pipeline.create_assets_processor_run(fbx_filepaths)
+        except ExportError as e:
+            self.report({"ERROR"}, str(e))
             print(f"[HG] Export failed!")
             return {"CANCELLED"}
+        finally:
+            print(f"[HG] Switching to previous workspace {current_mode}")
+            bpy.context.window.workspace = bpy.data.workspaces[current_mode]
 
-        self.report({"INFO"}, "HGE export finished")
-        print(f"[HG] Export finished!")
-        print(f"[HG] Switching to previous workspace {current_mode}")
-        bpy.context.window.workspace = bpy.data.workspaces[current_mode]
+        # the AssetsProcessor keeps running in the background; HGEProcessAssetsOp reports the result
+        start_assets_processing(pipeline, run)
+        bpy.ops.hge.process_assets("INVOKE_DEFAULT")
+        print("[HG] FBX export finished, processing assets...")
         return {"FINISHED"}
 
-    def __find_anim_range(self, context):
-        scene = context.scene
-        min_frame = scene.frame_start
-        max_frame = scene.frame_end
-        for object in scene.objects:
-            if object.type != "ARMATURE":
-                continue
-            bones = object.data.bones
-            for bone in bones:
-                keys = bone.keys()
-                for key in keys:
-                    anim_name = AnimationName.parse(key)
-                    if not anim_name:
-                        continue
-                    prop = bone[key]
-                    # prop format: root:frame_start:frame_end
-                    tokens_prop = prop.split(":")
-                    if len(tokens_prop) != 3:
-                        continue
-                    frame_start = int(tokens_prop[1])
-                    frame_end = int(tokens_prop[2])
-                    if min_frame > frame_start:
-                        min_frame = frame_start
-                    if max_frame < frame_end:
-                        max_frame = frame_end
-
-        return min_frame, max_frame
-
-    def __mark_objects_for_export(self, context):
-        for object in context.scene.objects:
-            if object.hge_obj_settings.resolve_role() != "MESH" or not object.hge_obj_settings.is_valid():
-                object.hge_export = self.export_meshes and (not self.use_selection or object.hge_export)
-
-    def __prepare_materials(self):
-        for obj in bpy.data.objects:
-            if obj.type != "MESH":
-                continue
-            if obj.hge_obj_settings.resolve_role() != "MESH" or not obj.hge_obj_settings.is_valid():
-                continue
-
-            print(f"[HG] Preparing material for '{obj.name}'")
-            obj_has_materials = False
-            for slot in obj.material_slots:
-                if slot.material:
-                    self.__prepare_one_material(slot.material)
-                    obj_has_materials = True
-
-            # There is no materials for this mesh.
-            # Add a default material and try again.
-            if not obj_has_materials:
-                new_material = bpy.data.materials.new(name="Material")
-                obj.data.materials.append(new_material)
-                for slot in obj.material_slots:
-                    if slot.material:
-                        self.__prepare_one_material(slot.material)
-
-    def __prepare_one_material(self, material):
-        # reset properties
-        remove_material_props(material)
-        add_material_props(material)
-        # copy settings into the material's custom properties
-        hgm_settings = material.hgm_settings
-        for prop in MATERIAL_PROPERTIES:
-            if not prop.settings_name:
-                continue  # Add an indented block here to fix the indentation error
-            settings_value = getattr(hgm_settings, prop.settings_name)
-            if prop.map:
-                if settings_value:
-                    material[prop.id] = bpy.path.abspath(settings_value.filepath)
-                else:
-                    material[prop.id] = ""
-            elif isinstance(material, bool):
-                material[prop.id] = 1 if settings_value else 0
-            else:
-                material[prop.id] = settings_value
-
-    def __export_fbx(self, fbx_filepath):
-        print(f"[HG] Exporting FBX to {fbx_filepath}...")
-        if os.path.exists(fbx_filepath):
-            os.remove(fbx_filepath)
-        if self.use_selection:
-            print(f"[HG] Exporting only selected entities...")
-        return bpy.ops.export_scene.fbx(
-            axis_forward="Y",
-            axis_up="Z",
-            filepath=fbx_filepath,
-            use_selection=self.use_selection,
-            # use_active_collection=False,
-            # global_scale=1.0,
-            # apply_unit_scale=True,
-            apply_scale_options="FBX_SCALE_ALL",
-            # use_space_transform=True,
-            # bake_space_transform=False,
-            object_types={"ARMATURE", "OTHER", "MESH", "EMPTY"},
-            # use_mesh_modifiers=True,
-            # use_mesh_modifiers_render=True,
-            # mesh_smooth_type="OFF",
-            # use_subsurf=False,
-            # use_mesh_edges=False,
-            # use_tspace=False,
-            use_custom_props=True,
-            add_leaf_bones=False,
-            # primary_bone_axis="Y",
-            # secondary_bone_axis="X",
-            # use_armature_deform_only=False,
-            # armature_nodetype="NULL",
-            # bake_anim=True,
-            # bake_anim_use_all_bones=True,
-            bake_anim_use_nla_strips=False,
-            bake_anim_use_all_actions=False,
-            # bake_anim_force_startend_keying=True,
-            # bake_anim_step=1.0,
-            # bake_anim_simplify_factor=1.0,
-            # path_mode="AUTO",
-            # embed_textures=False,
-            batch_mode="OFF",
-            use_batch_own_dir=False,
-            # use_metadata=True,
-        )
-
-    def __run_assets_processor(self, fbx_filepath):
-        print(f"[HG] Starting AssetsProcessor...")
-        assets_proc_paths = []
-        # read special environment variable
-        hgeap = os.getenv("HGEAP")
-        if hgeap:
-            print("[HG] Looking for AssetsProcessor using HGEAP")
-            assets_proc_paths.append(hgeap)
-        # read trunk environment variable
-        trunk_path = os.getenv('HGETrunkRoot')
-        if trunk_path:
-            print("[HG] Looking for AssetsProcessor in trunk directory")
-            assets_proc_paths.append(os.path.join(trunk_path, "Tools", "AssetsProcessor", "Bin", "AssetsProcessor.exe"))
-        # read last game launch location from registry
-        appid = SETTINGS["appid"]
-        registry_cmd = f"reg query \"HKEY_CURRENT_USER\\SOFTWARE\\Haemimont Games\\{appid}\" /v Path"
-        registry_result = subprocess.check_output(registry_cmd, stderr=subprocess.STDOUT).decode("ascii")
-        registry_result = re.search(r"REG_SZ\s*(.*)\\", registry_result)
-        if registry_result:
-            print("[HG] Looking for AssetsProcessor in game directory")
-            assets_proc_paths.append(os.path.join(registry_result.group(1), "ModTools", "AssetsProcessor", "AssetsProcessor.exe"))
-        # read this file's location
-        own_path = os.path.realpath(__file__)
-        if own_path:
-            print(f"[HG] Looking for AssetsProcessor in exporter directory {own_path}")
-            assets_proc_paths.append(os.path.join(os.path.dirname(own_path), "AssetsProcessor", "AssetsProcessor.exe"))
-
-        assets_proc_paths = [os.path.normpath(path) for path in assets_proc_paths]
-        assets_proc_paths = [path for path in assets_proc_paths if os.path.isfile(path)]
-        if not assets_proc_paths:
-            return
-        asset_prop_args = f"\"{assets_proc_paths[0]}\" \"{fbx_filepath}\" -globalappdirs"
-        print(f"[HG] AssetProcessor cmd line: {asset_prop_args}")
-        os.system(f"\"{asset_prop_args}\"")
-        return True
-
     def draw(self, context):
         self.layout.label(text="What to export:", icon='MENU_PANEL')
 
@@ -2324,7 +4896,7 @@ class HGEExportOp(bpy.types.Operator):
                 label_pieces = []
                 for obj in self.entity_mesh_objects[entity_metadata.get_key()]:
                     hge_obj_settings = obj.hge_obj_settings
-                    if hge_obj_settings.resolve_role() != "MESH" or not obj.hge_obj_settings.is_valid():
+                    if hge_obj_settings.resolve_role() != "MESH" or not obj.hge_obj_settings.is_valid(self.validation_index):
                         continue
                     entity_name = hge_obj_settings.get_mesh_name_helper()
                     if entity_name.state:
@@ -2344,6 +4916,475 @@ class HGEExportOp(bpy.types.Operator):
                 self.layout.prop(anim_metadata, "export", text=anim_metadata.label, icon="ARMATURE_DATA")
 
         self.layout.prop(self, "use_selection", expand=True)
+        if self.export_anims:
+            self.layout.prop(self, "check_root_motion")
+            self.layout.prop(self, "anim_takes")
+            self.layout.prop(self, "reduce_anims")
+            if self.reduce_anims:
+                row = self.layout.row()
+                row.prop(self, "anim_location_tolerance")
+                row.prop(self, "anim_rotation_tolerance")
+                row.prop(self, "anim_scale_tolerance")
+        if self.export_meshes:
+            self.layout.prop(self, "dedup_materials")
+            self.layout.prop(self, "atlas_maps")
+            if self.atlas_maps:
+                self.layout.prop(self, "atlas_max_map_size")
+            self.layout.prop(self, "check_textures")
+            self.layout.prop(self, "convert_textures")
+        self.layout.prop(self, "split_mode")
+        if self.split_mode != "OFF":
+            self.layout.prop(self, "processor_workers")
+
+# the AssetsProcessor run started by the last export (and the pipeline that started it)
+assets_processing = None
+
+
+#---
+#--- Starts processing the exported .FBX files in the background, unless another run is still active.
+#---
+def start_assets_processing(pipeline, run):
+    global assets_processing
+    if assets_processing and not assets_processing[1].is_finished():
+        assets_processing[1].cancel()
+    assets_processing = (pipeline, run)
+    run.start()
+
+
+def is_assets_processing():
+    return bool(assets_processing) and not assets_processing[1].is_finished()
+
+
+"""
+Modal operator that waits for the AssetsProcessor started by the export without blocking the UI.
+
+It polls the running processes on a timer, redraws the HGE Tools panels to show the progress and reports the result
+once all processes have exited.
+"""
+class HGEProcessAssetsOp(bpy.types.Operator):
+    bl_idname = "hge.process_assets"
+    bl_label = "Process assets"
+    bl_description = "Waits for the AssetsProcessor to process the exported .FBX files"
+
+    timer = None
+    pipeline = None
+    run = None
+
+    def invoke(self, context, event):
+        if not assets_processing:
+            return {"CANCELLED"}
+        # the run this operator reports; a later export replaces the global one
+        self.pipeline, self.run = assets_processing
+        self.timer = context.window_manager.event_timer_add(0.2, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context, event):
+        if event.type != "TIMER" or event.timer != self.timer:
+            return {"PASS_THROUGH"}
+        pipeline, run = self.pipeline, self.run
+        if not assets_processing or assets_processing[1] is not run:
+            # cancelled by start_assets_processing for a newer export, which has its own operator
+            run.update()
+            context.window_manager.event_timer_remove(self.timer)
+            self.report({"WARNING"}, "The AssetsProcessor was stopped by a newer export")
+            print("[HG] Previous AssetsProcessor run cancelled")
+            return {"CANCELLED"}
+        finished = run.update()
+        for area in context.screen.areas:
+            if area.type == "VIEW_3D":
+                area.tag_redraw()
+        if not finished:
+            return {"PASS_THROUGH"}
+
+        context.window_manager.event_timer_remove(self.timer)
+        error = run.get_error()
+        if error:
+            self.report({"ERROR"}, error)
+            print(f"[HG] Export failed!")
+            return {"CANCELLED"}
+        pipeline.update_manifest()
+        self.report({"INFO"}, "HGE export finished")
+        print(f"[HG] Export finished!")
+        return {"FINISHED"}
+
+
+class HGECancelAssetsProcessingOp(bpy.types.Operator):
+    bl_idname = "hge.cancel_assets_processing"
+    bl_label = "Cancel"
+    bl_description = "Stops the running AssetsProcessor instances"
+
+    @classmethod
+    def poll(cls, context):
+        return is_assets_processing()
+
+    def execute(self, context):
+        assets_processing[1].cancel()
+        return {"FINISHED"}
+
+
+# mesh budgets--------------------------------------------------------------------------------------------------------------------------------------------------------
+
+#---
+#--- Per entity LOD limits checked by the Budgets panel (0 disables a check).
+#---
+#--- @class HGEBudgetSettings
+#--- @field max_triangles integer Triangles of all meshes of an entity LOD.
+#--- @field max_vertices integer Vertices of all meshes of an entity LOD.
+#--- @field max_influences integer Vertex groups (bones) affecting a single vertex.
+#--- @field max_uv_sets integer UV layers of a mesh.
+#--- @field max_size number Largest bounding box dimension in the entity's origin space (meters).
+#---
+class HGEBudgetSettings(bpy.types.PropertyGroup):
+    max_triangles: bpy.props.IntProperty(
+        name="Triangles",
+        description="Maximum triangles per entity LOD (0 - no limit)",
+        min=0,
+        default=20000)
+    max_vertices: bpy.props.IntProperty(
+        name="Vertices",
+        description="Maximum vertices per entity LOD (0 - no limit)",
+        min=0,
+        default=0)
+    max_influences: bpy.props.IntProperty(
+        name="Bone influences",
+        description="Maximum bone influences per vertex (0 - no limit)",
+        min=0,
+        default=4)
+    max_uv_sets: bpy.props.IntProperty(
+        name="UV sets",
+        description="Maximum UV layers per mesh (0 - no limit)",
+        min=0,
+        default=2)
+    max_size: bpy.props.FloatProperty(
+        name="Size",
+        description="Maximum bounding box dimension of an entity in meters (0 - no limit)",
+        min=0,
+        default=0,
+        unit="LENGTH")
+
+
+#---
+#--- Reads the budget relevant numbers of a mesh object with bulk foreach_get calls into NumPy arrays.
+#---
+#--- @return table triangles, vertices, uv_sets, max_influences, influence_overflow (a list of vertex influence counts
+#--- is needed for the latter two - only for skinned meshes), corners (bounding box in origin space, 8x3 array).
+#---
+def get_mesh_stats(obj):
+    mesh = obj.data
+    polygon_count = len(mesh.polygons)
+    loop_totals = numpy.empty(polygon_count, dtype=numpy.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    stats = {
+        "triangles": int(loop_totals.sum()) - 2 * polygon_count,
+        "vertices": len(mesh.vertices),
+        "uv_sets": len(mesh.uv_layers),
+        "influences": None,
+    }
+    if obj.hge_obj_settings.is_skinned():
+        # vertex group memberships have no bulk accessor
+        stats["influences"] = numpy.fromiter((len(vertex.groups) for vertex in mesh.vertices), dtype=numpy.int32,
+            count=len(mesh.vertices))
+
+    matrix = obj.matrix_world
+    origin = obj.hge_obj_settings.find_origin()
+    if origin:
+        matrix = origin.matrix_world.inverted() @ matrix
+    corners = numpy.ones((8, 4))
+    corners[:, :3] = numpy.array(obj.bound_box)
+    stats["corners"] = (corners @ numpy.array(matrix).T)[:, :3]
+    return stats
+
+
+#---
+#--- Caches get_mesh_stats per object until its geometry or transform changes.
+#---
+#--- @class MeshStatsCache
+#---
+class MeshStatsCache:
+    def __init__(self):
+        self.stats = {}
+
+    def reset(self):
+        self.stats = {}
+
+    def get(self, obj):
+        stats = self.stats.get(obj.name)
+        if stats is None:
+            stats = get_mesh_stats(obj)
+            self.stats[obj.name] = stats
+        return stats
+
+    def on_depsgraph_update(self, depsgraph):
+        if not self.stats:
+            return
+        for update in depsgraph.updates:
+            if isinstance(update.id, bpy.types.Mesh):
+                # can't tell cheaply which objects use the mesh
+                self.reset()
+                return
+            if isinstance(update.id, bpy.types.Object) and (update.is_updated_geometry or update.is_updated_transform):
+                stack = [update.id.original]
+                while stack:
+                    obj = stack.pop()
+                    self.stats.pop(obj.name, None)
+                    stack.extend(obj.children)
+
+
+mesh_stats_cache = MeshStatsCache()
+
+
+#---
+#--- The summed statistics of all meshes of an entity LOD and the budgets they exceed.
+#---
+#--- @class EntityBudget
+#---
+class EntityBudget:
+    def __init__(self, entity, lod):
+        self.entity = entity
+        self.lod = lod
+        self.triangles = 0
+        self.vertices = 0
+        self.uv_sets = 0
+        self.max_influences = 0
+        self.influence_overflow = 0
+        self.size = 0.0
+        self.violations = []
+
+
+#---
+#--- Computes the statistics of every valid entity LOD in the scene and checks them against the budgets.
+#---
+#--- @return table The EntityBudget of each (entity, LOD), sorted by entity and LOD.
+#---
+def analyze_mesh_budgets(scene, budgets):
+    cache = get_validation_cache(scene)
+    results = {}
+    corners = {}
+    for obj in scene.objects:
+        if obj.type != "MESH" or cache.get_role(obj) != "MESH" or not cache.is_valid(obj):
+            continue
+        hge_obj_settings = obj.hge_obj_settings
+        key = (hge_obj_settings.entity, hge_obj_settings.lod)
+        result = results.get(key)
+        if not result:
+            result = EntityBudget(*key)
+            results[key] = result
+        stats = mesh_stats_cache.get(obj)
+        result.triangles += stats["triangles"]
+        result.vertices += stats["vertices"]
+        result.uv_sets = max(result.uv_sets, stats["uv_sets"])
+        influences = stats["influences"]
+        if influences is not None and len(influences):
+            result.max_influences = max(result.max_influences, int(influences.max()))
+            if budgets.max_influences:
+                result.influence_overflow += int(numpy.count_nonzero(influences > budgets.max_influences))
+        corners.setdefault(key, []).append(stats["corners"])
+
+    for key, result in results.items():
+        points = numpy.concatenate(corners[key])
+        result.size = float((points.max(axis=0) - points.min(axis=0)).max())
+        if budgets.max_triangles and result.triangles > budgets.max_triangles:
+            result.violations.append(f"{result.triangles} triangles (max {budgets.max_triangles})")
+        if budgets.max_vertices and result.vertices > budgets.max_vertices:
+            result.violations.append(f"{result.vertices} vertices (max {budgets.max_vertices})")
+        if result.influence_overflow:
+            result.violations.append(f"{result.influence_overflow} vertices with over {budgets.max_influences} influences")
+        if budgets.max_uv_sets and result.uv_sets > budgets.max_uv_sets:
+            result.violations.append(f"{result.uv_sets} UV sets (max {budgets.max_uv_sets})")
+        if budgets.max_size and result.size > budgets.max_size:
+            result.violations.append(f"size {result.size:.2f}m (max {budgets.max_size:.2f}m)")
+    return [results[key] for key in sorted(results)]
+
+
+# root motion--------------------------------------------------------------------------------------------------------------------------------------------------------
+
+# horizontal root displacement (meters) below which the root is considered in place
+ROOT_MOTION_MIN_DISTANCE = 0.05
+# largest speed deviation (fraction of the mean speed) of constant root motion (CME, InverseCME)
+ROOT_MOTION_SPEED_VARIATION = 0.25
+# largest vertical root drift (meters) when Z is not compensated
+ROOT_MOTION_Z_DRIFT = 0.02
+# height above its lowest point (meters) at which a foot is considered planted
+FOOT_CONTACT_HEIGHT = 0.03
+# largest horizontal speed (meters per second) of a planted foot
+FOOT_SLIDE_SPEED = 0.15
+# largest difference (meters) between the first and last pose of a looping animation, relative to the root
+LOOP_POSE_TOLERANCE = 0.01
+
+FOOT_BONE_PATTERN = re.compile(r"foot|toe|ankle|heel", re.IGNORECASE)
+
+
+#---
+#--- Returns the index of the root bone of an armature: the parentless bone named "root" if there is one, otherwise the
+#--- first parentless bone.
+#---
+def find_root_bone(armature):
+    roots = [idx for idx, bone in enumerate(armature.data.bones) if not bone.parent]
+    for idx in roots:
+        if "root" in armature.data.bones[idx].name.lower():
+            return idx
+    return roots[0] if roots else None
+
+
+#---
+#--- Samples the world space head positions of all pose bones of an armature over a frame range.
+#---
+#--- The frames are evaluated with scene.frame_set (so constraints and drivers are included) and the pose matrices of
+#--- each frame are read with a single foreach_get. The current frame is restored afterwards.
+#---
+#--- @return table numpy array (frames x bones x 3).
+#---
+def sample_bone_positions(scene, armature, frame_start, frame_end):
+    pose_bones = armature.pose.bones
+    bone_count = len(pose_bones)
+    frame_count = frame_end - frame_start + 1
+    matrices = numpy.empty((frame_count, bone_count * 16), dtype=numpy.float32)
+    world = numpy.empty((frame_count, 4, 4), dtype=numpy.float32)
+    old_frame, old_subframe = scene.frame_current, scene.frame_subframe
+    try:
+        for idx in range(frame_count):
+            scene.frame_set(frame_start + idx)
+            pose_bones.foreach_get("matrix", matrices[idx])
+            world[idx] = numpy.array(armature.matrix_world, dtype=numpy.float32)
+    finally:
+        scene.frame_set(old_frame, subframe=old_subframe)
+    # matrices are flattened column by column, so the translation is the 4th column
+    heads = matrices.reshape(frame_count, bone_count, 4, 4)[:, :, 3, :3]
+    return numpy.einsum("fij,fbj->fbi", world[:, :3, :3], heads) + world[:, None, :3, 3]
+
+
+#---
+#--- The root motion analysis of a marked animation.
+#---
+#--- @class RootMotionReport
+#--- @field state string The animated state.
+#--- @field root_motion string The root motion type of the marked animation.
+#--- @field distance number Horizontal root displacement between the first and last frame (meters).
+#--- @field vertical number Vertical root displacement between the first and last frame (meters).
+#--- @field mean_speed number Mean horizontal root speed (meters per second).
+#--- @field speed_variation number Largest deviation of the horizontal root speed from the mean (fraction of the mean).
+#--- @field max_slide number Largest horizontal speed of a planted foot (meters per second).
+#--- @field loop_gap number Largest difference between the first and last pose relative to the root (meters).
+#--- @field warnings table The problems found.
+#---
+class RootMotionReport:
+    def __init__(self, state, root_motion):
+        self.state = state
+        self.root_motion = root_motion
+        self.distance = 0.0
+        self.vertical = 0.0
+        self.mean_speed = 0.0
+        self.speed_variation = 0.0
+        self.max_slide = 0.0
+        self.loop_gap = 0.0
+        self.warnings = []
+
+    def get_summary(self):
+        return (f"{self.distance:.2f}m, {self.mean_speed:.2f}m/s (±{self.speed_variation:.0%}), "
+            f"Z {self.vertical:+.2f}m, slide {self.max_slide:.2f}m/s, loop gap {self.loop_gap:.3f}m")
+
+
+#---
+#--- Computes the root displacement and velocity curves of a marked animation and checks them against its root motion
+#--- settings: moving roots without root motion (and vice versa), non-constant CME speed, uncompensated Z drift, sliding
+#--- planted feet and, for looping animations, the difference between the first and last pose.
+#---
+#--- @param scene table The scene to evaluate the animation in.
+#--- @param marked_anim HGEMarkedAnimation The animation to analyze.
+#--- @return RootMotionReport The analysis.
+#---
+def analyze_root_motion(scene, marked_anim):
+    armature = marked_anim.armature_object
+    report = RootMotionReport(marked_anim.get_animation_name().state, marked_anim.root_motion)
+    root = find_root_bone(armature) if armature and armature.type == "ARMATURE" else None
+    if root is None:
+        report.warnings.append("The armature has no root bone")
+        return report
+    if marked_anim.frame_end <= marked_anim.frame_start:
+        report.warnings.append("The animation has less than 2 frames")
+        return report
+
+    positions = sample_bone_positions(scene, armature, marked_anim.frame_start, marked_anim.frame_end)
+    fps = scene.render.fps / scene.render.fps_base
+    root_positions = positions[:, root]
+    displacement = root_positions[-1] - root_positions[0]
+    velocity = numpy.diff(root_positions, axis=0) * fps
+    speed = numpy.linalg.norm(velocity[:, :2], axis=1)
+    report.distance = float(numpy.linalg.norm(displacement[:2]))
+    report.vertical = float(displacement[2])
+    report.mean_speed = float(speed.mean())
+    if report.mean_speed > 0:
+        report.speed_variation = float(numpy.abs(speed - report.mean_speed).max() / report.mean_speed)
+
+    moving = report.distance >= ROOT_MOTION_MIN_DISTANCE
+    if marked_anim.root_motion == "None" and moving:
+        report.warnings.append(f"The root moves {report.distance:.2f}m but there's no root motion")
+    elif marked_anim.root_motion != "None" and not moving:
+        report.warnings.append(f"{marked_anim.root_motion} root motion but the root moves only {report.distance:.2f}m")
+    if marked_anim.root_motion in ("CME", "InverseCME") and moving and report.speed_variation > ROOT_MOTION_SPEED_VARIATION:
+        report.warnings.append(f"The root speed varies by {report.speed_variation:.0%} (constant motion expected)")
+    if not marked_anim.compensate_z and abs(report.vertical) > ROOT_MOTION_Z_DRIFT:
+        report.warnings.append(f"The root drifts {report.vertical:+.2f}m vertically without Z compensation")
+
+    # with root motion the planted feet must not move in world space
+    feet = [idx for idx, bone in enumerate(armature.data.bones) if FOOT_BONE_PATTERN.search(bone.name)]
+    if marked_anim.root_motion != "None" and feet:
+        foot_positions = positions[:, feet]
+        heights = foot_positions[:, :, 2]
+        planted = heights <= heights.min(axis=0) + FOOT_CONTACT_HEIGHT
+        planted = planted[1:] & planted[:-1]
+        foot_speed = numpy.linalg.norm(numpy.diff(foot_positions[:, :, :2], axis=0), axis=2) * fps
+        if planted.any():
+            report.max_slide = float(foot_speed[planted].max())
+        if report.max_slide > FOOT_SLIDE_SPEED:
+            report.warnings.append(f"Planted feet slide at up to {report.max_slide:.2f}m/s")
+
+    if marked_anim.loop_anim:
+        relative = positions - root_positions[:, None]
+        report.loop_gap = float(numpy.linalg.norm(relative[-1] - relative[0], axis=1).max())
+        if report.loop_gap > LOOP_POSE_TOLERANCE:
+            report.warnings.append(f"The first and last poses differ by {report.loop_gap:.3f}m")
+        if moving and len(speed) > 1 and abs(speed[-1] - speed[0]) > ROOT_MOTION_SPEED_VARIATION * report.mean_speed:
+            report.warnings.append(f"The root speed jumps from {speed[-1]:.2f} to {speed[0]:.2f}m/s at the loop")
+    return report
+
+
+# the last root motion reports, keyed by (armature name, animation property)
+root_motion_reports = {}
+
+
+#---
+#--- Analyzes the root motion of the marked animations of a scene and keeps the reports for the Root Motion panel.
+#---
+#--- @param exported_only boolean Whether only the animations marked for export are analyzed.
+#--- @return table The reports, in the order of the marked animations.
+#---
+def analyze_marked_animations(scene, exported_only=False):
+    reports = []
+    for marked_anim in scene.hge_settings.marked_animations:
+        armature = marked_anim.armature_object
+        if not armature or (exported_only and not armature.get(marked_anim.get_export_prop_name())):
+            continue
+        report = analyze_root_motion(scene, marked_anim)
+        root_motion_reports[(armature.name, marked_anim.prop_name)] = report
+        reports.append(report)
+    return reports
+
+
+#---
+#Analyzes the root motion of all marked animations and shows the results in the Root Motion panel.
+class HGEAnalyzeRootMotionOp(bpy.types.Operator):
+    bl_idname = "hge.analyze_root_motion"
+    bl_label = "Analyze root motion"
+    bl_description = "Checks the root displacement, velocity, foot sliding and loops of the marked animations"
+
+    def execute(self, context):
+        root_motion_reports.clear()
+        reports = analyze_marked_animations(context.scene)
+        problems = sum(1 for report in reports if report.warnings)
+        self.report({"WARNING"} if problems else {"INFO"}, f"Analyzed {len(reports)} animations ({problems} with problems)")
+        return {"FINISHED"}
 
 # user interface--------------------------------------------------------------------------------------------------------------------------------------------------------
 
@@ -2367,7 +5408,7 @@ class HGEOpenOutputDirOp(bpy.types.Operator):
     bl_description = "Opens output directory for exports"
 
     def execute(self, context):
-        dir = os.path.join(os.getenv("APPDATA"), SETTINGS["appid"], "ExportedEntities")
+        dir = os.path.join(get_appdata_dirname(), "ExportedEntities")
         bpy.ops.wm.path_open(filepath=dir)
         return {"FINISHED"}
 
@@ -2439,6 +5480,30 @@ class HGEToolbarAnimations(HGEToolbarBase, bpy.types.Panel):
             self.layout.prop(active_marked_anim, "root_motion")
 
 
+#---
+#Shows the root displacement, speed, foot sliding and loop analysis of each marked animation (see analyze_root_motion).
+class HGEToolbarRootMotion(HGEToolbarBase, bpy.types.Panel):
+    bl_idname = "HGE_PT_root_motion"
+    bl_parent_id = "HGE_PT_animations"
+    bl_label = "Root Motion"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        self.layout.operator("hge.analyze_root_motion", icon="ANIM")
+        hge_settings = context.scene.hge_settings
+        for marked_anim in hge_settings.marked_animations:
+            armature = marked_anim.armature_object
+            report = armature and root_motion_reports.get((armature.name, marked_anim.prop_name))
+            if not report:
+                continue
+            box = self.layout.box()
+            box.alert = bool(report.warnings)
+            box.label(text=f"{report.state} ({report.root_motion})", icon="ERROR" if report.warnings else "CHECKMARK")
+            box.label(text=report.get_summary())
+            for warning in report.warnings:
+                box.label(text=warning)
+
+
 #This class represents the HGE Tools toolbar panel in the Blender 3D viewport. It is a subclass of the `HGEToolbarBase` class and the `bpy.types.Panel` class, which provides the base functionality for a Blender UI panel.
 #
 #The `HGEToolbarStatistics` panel displays various statistics about the objects in the scene that are relevant to the HGE exporter, such as the number of entities, states, mesh objects, and animations. It also identifies any objects with errors that may prevent them from being exported correctly.
@@ -2455,11 +5520,12 @@ class HGEToolbarStatistics(HGEToolbarBase, bpy.types.Panel):
         surfaces, surfaces_with_errors = [], []
         animations, animations_with_errors = [], []
         ignored = []
+        cache = get_validation_cache(context.scene)
         for object in context.scene.objects:
-            role = object.hge_obj_settings.resolve_role()
+            role = cache.get_role(object)
             if role == "MESH":
                 meshes.append(object)
-                if not object.hge_obj_settings.is_valid():
+                if not cache.is_valid(object):
                     meshes_with_errors.append(object)
                 else:
                     if object.hge_obj_settings.entity:
@@ -2468,19 +5534,16 @@ class HGEToolbarStatistics(HGEToolbarBase, bpy.types.Panel):
                         states.add(object.hge_obj_settings.state)
             elif role == "SPOT":
                 spots.append(object)
-                if not object.hge_obj_settings.is_valid():
+                if not cache.is_valid(object):
                     spots_with_errors.append(object)
             elif role == "SURFACE":
                 surfaces.append(object)
-                if not object.hge_obj_settings.is_valid():
+                if not cache.is_valid(object):
                     surfaces_with_errors.append(object)
             elif object.type == "ARMATURE":
-                for prop in object.keys():
-                    anim_name = AnimationName.parse(prop)
-                    if not anim_name:
-                        continue
-                    animations.append((object, prop))
-                    states.add(anim_name.state)
+                for animation in animation_table.get(object):
+                    animations.append((object, animation.prop))
+                    states.add(animation.name.state)
             elif role == "IGNORED":
                 ignored.append(object)
         """for anim in animations:
@@ -2512,6 +5575,36 @@ class HGEToolbarStatistics(HGEToolbarBase, bpy.types.Panel):
                 self.layout.label(text=f"{i+1}) {animations_with_errors[i].state}", icon="ERROR")"""
 
 
+#---
+#Shows the triangle, vertex, bone influence, UV set and size statistics of each entity LOD and flags the ones over budget.
+class HGEToolbarBudgets(HGEToolbarBase, bpy.types.Panel):
+    bl_idname = "HGE_PT_budgets"
+    bl_parent_id = "HGE_PT_statistics"
+    bl_label = "Budgets"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        budgets = context.scene.hge_budgets
+        col = self.layout.column(align=True)
+        for prop in ("max_triangles", "max_vertices", "max_influences", "max_uv_sets", "max_size"):
+            col.prop(budgets, prop)
+
+        results = analyze_mesh_budgets(context.scene, budgets)
+        if not results:
+            self.layout.label(text="There are no valid meshes in the scene")
+            return
+        over_budget = sum(1 for result in results if result.violations)
+        self.layout.label(text=f"Entity LODs: {len(results)} ({over_budget} over budget)")
+        for result in results:
+            box = self.layout.box()
+            box.alert = bool(result.violations)
+            box.label(text=f"{result.entity} LOD {result.lod}", icon="ERROR" if result.violations else "CHECKMARK")
+            box.label(text=f"{result.triangles} tris, {result.vertices} verts, {result.uv_sets} UV sets, "
+                f"{result.max_influences} influences, {result.size:.2f}m")
+            for violation in result.violations:
+                box.label(text=violation)
+
+
 #---
 #This class represents the toolbar panel for the HGE (Haxe Game Engine) exporter in Blender. It inherits from the `HGEToolbarBase` class and the `bpy.types.Panel` class, which provides the basic functionality for a Blender UI panel.
 #
@@ -2529,14 +5622,15 @@ class HGEToolbarExport(HGEToolbarBase, bpy.types.Panel):
         op_meshes = self.layout.row()
         op_anims = self.layout.row()
 
+        cache = get_validation_cache(context.scene)
         for object in context.scene.objects:
-            role = object.hge_obj_settings.resolve_role()
+            role = cache.get_role(object)
             if role:
                 any_objects = True
                 op_both.alert = False
                 op_meshes.alert = False
                 op_anims.alert = False
-                if not object.hge_obj_settings.is_valid():
+                if not cache.is_valid(object):
                     any_errors = True
                     break
         if not any_objects:
@@ -2573,12 +5667,43 @@ class HGEToolbarExport(HGEToolbarBase, bpy.types.Panel):
         op_anims.export_meshes = False
         op_anims.export_anims = True'''
 
+#---
+#Shows the progress and the latest output of the AssetsProcessor while it processes the exported files.
+class HGEToolbarAssetsProcessor(HGEToolbarBase, bpy.types.Panel):
+    bl_idname = "HGE_PT_toolbar_assets_processor"
+    bl_label = "Assets Processor"
+    bl_order = 5
+
+    OUTPUT_LINES = 8
+
+    @classmethod
+    def poll(cls, context):
+        return bool(assets_processing)
+
+    def draw(self, context):
+        run = assets_processing[1]
+        done, total = run.get_progress()
+        if not run.is_finished():
+            self.layout.label(text=f"Processing {done}/{total} files...", icon="SORTTIME")
+            self.layout.operator("hge.cancel_assets_processing", icon="CANCEL")
+        else:
+            error = run.get_error()
+            if error:
+                self.layout.label(text=error, icon="ERROR")
+            else:
+                self.layout.label(text=f"Processed {total} files", icon="CHECKMARK")
+        col = self.layout.column(align=True)
+        for line in run.get_output()[-self.OUTPUT_LINES:]:
+            col.label(text=line)
+
 # registration--------------------------------------------------------------------------------------------------------------------------------------------------------
 
 #This code defines a list of Blender classes that are used for the HGE (Haxe Game Engine) Exporter addon. The classes include:
 #
 #- HGEObjectSettings: Settings for HGE objects
 #- HGEObjectSettingsPanel: UI panel for HGE object settings
+#- HGEGenerateLODsOp: Operator generating decimated LODs of a mesh
+#- HGETuneLODDistancesOp: Operator computing LOD distances from the screen space error
 #- HGEMaterialSettings: Settings for HGE materials
 #- HGERecreateShaderNodes: Utility for recreating shader nodes
 #- HGEMaterialOpenMapOp: Operator for opening material maps
@@ -2593,20 +5718,29 @@ class HGEToolbarExport(HGEToolbarBase, bpy.types.Panel):
 #- HGE_UL_marked_animations: UI list for marked animations
 #- HGEMarkedAnimation: Representation of a marked animation
 #- HGEAnimationSettings: Settings for HGE animations
+#- HGEBudgetSettings: Mesh budgets checked by the statistics
+#- HGEAnalyzeRootMotionOp: Operator analyzing the root motion of the marked animations
 #- HGEMarkAnimationOp: Operator for marking an animation
 #- HGEUnmarkAnimationOp: Operator for unmarking an animation
 #- HGEAnimExportProperty: Property for exporting animations
 #- HGEMeshExportProperty: Property for exporting meshes
 #- HGEExportOp: Operator for exporting HGE data
+#- HGEProcessAssetsOp: Operator waiting for the AssetsProcessor
+#- HGECancelAssetsProcessingOp: Operator for stopping the AssetsProcessor
 #- HGEOpenOutputDirOp: Operator for opening the output directory
 #- HGEToolbarVersion: UI element for the HGE toolbar version
 #- HGEToolbarObject: UI element for the HGE toolbar object settings
 #- HGEToolbarAnimations: UI element for the HGE toolbar animations
+#- HGEToolbarRootMotion: UI element for the root motion reports
 #- HGEToolbarStatistics: UI element for the HGE toolbar statistics
+#- HGEToolbarBudgets: UI element for the HGE toolbar mesh budgets
 #- HGEToolbarExport: UI element for the HGE toolbar export
+#- HGEToolbarAssetsProcessor: UI element for the AssetsProcessor progress
 classes = (
     HGEObjectSettings,
     HGEObjectSettingsPanel,
+    HGEGenerateLODsOp,
+    HGETuneLODDistancesOp,
     # materials
     HGEMaterialSettings,
     HGERecreateShaderNodes,
@@ -2626,17 +5760,26 @@ classes = (
     HGEAnimationSettings,
     HGEMarkAnimationOp,
     HGEUnmarkAnimationOp,
+    # mesh budgets
+    HGEBudgetSettings,
+    # root motion
+    HGEAnalyzeRootMotionOp,
     # export
     HGEAnimExportProperty,
     HGEMeshExportProperty,
     HGEExportOp,
+    HGEProcessAssetsOp,
+    HGECancelAssetsProcessingOp,
     # user interface
     HGEOpenOutputDirOp,
     HGEToolbarVersion,
     HGEToolbarObject,
     HGEToolbarAnimations,
+    HGEToolbarRootMotion,
     HGEToolbarStatistics,
+    HGEToolbarBudgets,
     HGEToolbarExport,
+    HGEToolbarAssetsProcessor,
 )
 reg_classes, unreg_classes = bpy.utils.register_classes_factory(classes)
 
@@ -2647,9 +5790,14 @@ reg_classes, unreg_classes = bpy.utils.register_classes_factory(classes)
 def register():
     reg_classes()
     bpy.types.Scene.hge_settings = bpy.props.PointerProperty(type=HGEAnimationSettings)
+    bpy.types.Scene.hge_budgets = bpy.props.PointerProperty(type=HGEBudgetSettings)
     bpy.types.Material.hgm_settings = bpy.props.PointerProperty(type=HGEMaterialSettings)
     bpy.types.Object.hge_obj_settings = bpy.props.PointerProperty(type=HGEObjectSettings)
     bpy.types.Object.hge_export = bpy.props.BoolProperty(name="HGE Export", default=True)
+    bpy.app.handlers.depsgraph_update_post.append(validation_cache_depsgraph_handler)
+    bpy.app.handlers.load_post.append(validation_cache_reset_handler)
+    bpy.app.handlers.undo_post.append(validation_cache_reset_handler)
+    bpy.app.handlers.redo_post.append(validation_cache_reset_handler)
 
 
 #---
@@ -2657,8 +5805,22 @@ def register():
 #
 #This function is called to unregister the custom Blender classes that were registered in the `register()` function. It removes the custom properties and unregisters the classes from Blender.
 def unregister():
+    bpy.app.handlers.redo_post.remove(validation_cache_reset_handler)
+    bpy.app.handlers.undo_post.remove(validation_cache_reset_handler)
+    bpy.app.handlers.load_post.remove(validation_cache_reset_handler)
+    bpy.app.handlers.depsgraph_update_post.remove(validation_cache_depsgraph_handler)
+    validation_cache.reset(None)
+    mesh_stats_cache.reset()
+    animation_table.reset()
+    root_motion_reports.clear()
+    if bpy.app.timers.is_registered(drain_shader_nodes_queue):
+        bpy.app.timers.unregister(drain_shader_nodes_queue)
+    shader_nodes_queue.clear()
+    if is_assets_processing():
+        assets_processing[1].cancel()
     del bpy.types.Object.hge_export
     del bpy.types.Object.hge_obj_settings
+    del bpy.types.Scene.hge_budgets
     del bpy.types.Scene.hge_settings
     del bpy.types.Material.hgm_settings
     unreg_classes()
@@ -0,0 +1,56 @@
+import json
+import os
+
+# Shared by the addon, which needs it to locate BlenderExport.py, and by BlenderExport.Toolchain, which caches the rest
+# of the toolchain paths in the same file. Keep it free of bpy so both can load it before anything else.
+
+CACHE_FILENAME = "HGEToolchain.json"
+
+# the per-user directory of the game (%APPDATA%\<appid> on Windows) where the exported files are written;
+# HGE_APPDATA overrides %APPDATA% and without either (e.g. on Linux) $XDG_CONFIG_HOME or ~/.config is used
+def get_appdata_dirname(appid):
+    appdata = os.getenv("HGE_APPDATA") or os.getenv("APPDATA") or os.getenv("XDG_CONFIG_HOME")
+    if not appdata:
+        appdata = os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(appdata, appid)
+
+def get_cache_filepath(appid):
+    return os.path.join(get_appdata_dirname(appid), CACHE_FILENAME)
+
+def read_json(filepath):
+    if not filepath or not os.path.isfile(filepath):
+        return {}
+    try:
+        with open(filepath) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[HG] Ignoring unreadable toolchain file {filepath}: {e}")
+        return {}
+
+def read_cache(appid):
+    return read_json(get_cache_filepath(appid)).get("paths", {})
+
+# merges the paths into the cache, keeping the entries written by the other users of the file
+def write_cache(appid, paths):
+    filepath = get_cache_filepath(appid)
+    try:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        data = read_json(filepath)
+        data.setdefault("paths", {}).update(paths)
+        with open(filepath, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+    except OSError as e:
+        print(f"[HG] Failed to write the toolchain cache {filepath}: {e}")
+
+# the directory of the game as recorded by its last launch in the Windows registry (None elsewhere)
+def read_registry_game_dir(appid):
+    try:
+        import winreg
+    except ImportError:
+        return
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, f"SOFTWARE\\Haemimont Games\\{appid}") as key:
+            path = winreg.QueryValueEx(key, "Path")[0]
+    except OSError:
+        return
+    return os.path.dirname(path)
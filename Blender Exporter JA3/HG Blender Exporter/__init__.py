@@ -1,9 +1,10 @@
 import importlib
 import os
 import re
-import subprocess
 import sys
 
+from . import HGEToolchainCache
+
 bl_info = {
     "name": "Haemimont Games Exporter for Jagged Alliance 3",
     "author": "Haemimont Games",
@@ -23,23 +24,48 @@ SETTINGS = {
     "enable_colliders": "True",
 }
 
-def register():
+def is_exporter_dir(path):
+    return bool(path) and os.path.isfile(os.path.join(path, "BlenderExport.py"))
+
+# HGE_EXPORTER_DIR overrides the discovery; otherwise the last found directory is used while it still exists
+def find_exporter_dir():
+    script_path = os.getenv("HGE_EXPORTER_DIR")
+    if script_path:
+        return script_path
+    appid = SETTINGS["appid"]
+    script_path = HGEToolchainCache.read_cache(appid).get("exporter_dir")
+    if is_exporter_dir(script_path):
+        return script_path
+
     script_path = os.getenv('HGETrunkRoot')
     if script_path:
         script_path = os.path.join(script_path, "Tools", "BlenderExport")
 
-    registry_key = "HKEY_CURRENT_USER\\SOFTWARE\\Haemimont Games\\Jagged Alliance 3"
-    registry_cmd = f"reg query \"{registry_key}\" /v Path"
-    registry_result = subprocess.check_output(registry_cmd, stderr=subprocess.STDOUT).decode("ascii")
-    registry_result = re.search(r"REG_SZ\s*(.*)\\", registry_result)
-    reg_check = re.search(r"Bin\s*(.*)\\", registry_result.group(1))
-    if not reg_check:
-        script_path = os.path.join(registry_result.group(1), "ModTools")
+    game_dir = HGEToolchainCache.read_registry_game_dir(appid)
+    paths = {}
+    if game_dir:
+        paths["game_dir"] = game_dir
+        reg_check = re.search(r"Bin\s*(.*)\\", game_dir)
+        if not reg_check:
+            script_path = os.path.join(game_dir, "ModTools")
+
+    if not script_path:
+        raise RuntimeError("HG Blender Exporter: set HGE_EXPORTER_DIR or launch the game once to locate BlenderExport.py")
+    script_path = os.path.normpath(script_path)
+    if is_exporter_dir(script_path):
+        paths["exporter_dir"] = script_path
+    if paths:
+        HGEToolchainCache.write_cache(appid, paths)
+    return script_path
 
+def register():
+    script_path = find_exporter_dir()
     print(f"[HG] Loading implementation from '{script_path}'")
     script_path = os.path.normpath(script_path)
     sys.path.insert(0, script_path)
 
+    # BlenderExport.Toolchain uses the same cache helpers
+    sys.modules["HGEToolchainCache"] = HGEToolchainCache
     import BlenderExport
     importlib.reload(BlenderExport)
     for k,v in SETTINGS.items():